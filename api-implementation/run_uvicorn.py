@@ -1,5 +1,13 @@
 import os
+import gc
 import sys
+import glob
+import math
+import time
+import signal
+import socket
+import importlib
+import tempfile
 import yaml
 from typing import Dict, Any
 
@@ -14,6 +22,144 @@ def load_config(config_path: str) -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
+def get_available_cpu_count() -> int:
+    """
+    Number of CPUs this process can actually use: the CPUs it may run on, capped by the CPU quota of its cgroup
+    (a container CPU limit), which os.cpu_count() ignores.
+    """
+    cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    cpu_quota = get_cgroup_cpu_quota()
+    if cpu_quota is not None:
+        cpu_count = min(cpu_count, max(1, math.ceil(cpu_quota)))
+    return cpu_count
+
+
+def get_cgroup_cpu_quota() -> float | None:
+    """Return the CPU quota of the cgroup in CPUs (e.g. 1.5), or None if there is no limit."""
+    try:  # cgroup v2: "<quota> <period>", or "max <period>" without limit
+        with open('/sys/fs/cgroup/cpu.max', 'r') as f:
+            quota, period = f.read().split()
+        return None if quota == 'max' else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:  # cgroup v1: a quota of -1 means no limit
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us', 'r') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us', 'r') as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def get_worker_count(workers: int | str) -> int:
+    """
+    Return the number of worker processes for the 'workers' setting: a number, or 'auto' for one per available CPU,
+    which is enough for async workers (more only adds context switches).
+    """
+    return get_available_cpu_count() if workers == 'auto' else int(workers)
+
+
+def select_implementation(setting: str, requested: str, module_name: str, fallback: str) -> str:
+    """
+    Return the requested uvicorn implementation (e.g. loop 'uvloop'), or the fallback if the module it needs is not
+    installed (e.g. on PyPy), instead of failing at startup.
+    """
+    if requested != module_name:
+        return requested
+    try:
+        importlib.import_module(module_name)
+        return requested
+    except ImportError:
+        print(f"{setting} '{requested}' is not available, using '{fallback}'", file=sys.stderr)
+        return fallback
+
+
+def bind_reuse_port_socket(host: str, port: int) -> socket.socket:
+    """
+    Bind a socket of this worker's own to the address with SO_REUSEPORT, so that the kernel spreads incoming
+    connections evenly over the workers instead of letting them race to accept from one shared socket.
+    """
+    sock = socket.socket(family=socket.AF_INET6 if ':' in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    return sock
+
+
+def run_prefork(config: Dict[str, Any]):
+    """
+    Imports the app and builds its service once in this (master) process, freezes everything allocated so far out of
+    the garbage collector and forks the workers from it. The workers start with the app already loaded and share its
+    memory pages copy-on-write: with the GC frozen, collections in a worker no longer write to (and so copy) the pages
+    of objects inherited from the master. Workers that die are replaced; SIGTERM/SIGINT stop all of them, and
+    SIGUSR1 (perspective configuration reload) is passed on to every worker. With reuse_port, each worker binds a
+    socket of its own instead of sharing one bound here.
+    """
+    import uvicorn
+
+    gc.disable()  # no collections (and holes in the heap) while the shared objects are being built
+    app_module = importlib.import_module('main')
+    if hasattr(app_module, 'get_service'):
+        app_module.get_service()  # settings, TypeAdapters and lookup structures of the service singleton
+
+    uvicorn_config = uvicorn.Config(
+        app_module.app,
+        host=config['host'],
+        port=config['port'],
+        proxy_headers=config['proxy_headers'],
+        log_config=config['log_config'],
+        timeout_keep_alive=config['timeout_keep_alive'],
+        loop=config['loop'],
+        http=config['http'],
+    )
+    uvicorn_config.load()  # imports the protocol and lifespan implementations before forking too
+    # the master must not hold a listening socket of the SO_REUSEPORT group: connections assigned to it would hang
+    sock = None if config['reuse_port'] else uvicorn_config.bind_socket()
+    gc.freeze()
+
+    def start_worker() -> int:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGUSR1, signal.SIG_IGN)  # until the app handles it (the Coordinator reloads on it)
+            gc.enable()
+            try:
+                worker_sock = sock or bind_reuse_port_socket(config['host'], config['port'])
+                uvicorn.Server(uvicorn_config).run(sockets=[worker_sock])
+            finally:
+                os._exit(0)
+        return pid
+
+    stop_signals = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_signals.append(signum))
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_signals.append(signum))
+    worker_pids = {start_worker() for _ in range(config['workers'])}
+
+    def forward_signal(signum, frame):
+        for worker_pid in worker_pids:
+            os.kill(worker_pid, signum)
+
+    signal.signal(signal.SIGUSR1, forward_signal)
+
+    while not stop_signals:
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid in worker_pids:
+            print(f'Worker process [{pid}] died with status {status}, starting a new one', file=sys.stderr)
+            worker_pids.remove(pid)
+            worker_pids.add(start_worker())
+        else:
+            time.sleep(0.5)
+
+    for worker_pid in worker_pids:
+        os.kill(worker_pid, signal.SIGTERM)
+    for worker_pid in worker_pids:
+        os.waitpid(worker_pid, 0)
+    if sock is not None:
+        sock.close()
+
+
 def main():
     # Default config path, can be overridden by environment variable
     config_path = os.getenv('UVICORN_CONFIG_PATH', '/app/config/uvicorn_config.yaml')
@@ -28,14 +174,44 @@ def main():
     config.setdefault('log_config', '/app/config/log_config.yaml')
     config.setdefault('timeout_keep_alive', 60)
 
-    # Get a default number of workers based on cpu count
-    workers = (os.cpu_count() * 2 + 1) if os.cpu_count() else 1
-    config.setdefault('workers', workers)
+    # by default, one worker per CPU available to the container
+    config['workers'] = get_worker_count(config.get('workers', 'auto'))
+
+    # uvloop and httptools are faster than the pure-Python asyncio loop and h11 parser, but not available everywhere
+    config['loop'] = select_implementation('loop', config.get('loop', 'uvloop'), 'uvloop', 'asyncio')
+    config['http'] = select_implementation('http', config.get('http', 'httptools'), 'httptools', 'h11')
+
+    config.setdefault('reuse_port', False)
+    if config['reuse_port'] and not (config.get('prefork', False) and config['workers'] > 1):
+        print("reuse_port needs prefork with several workers, ignoring it", file=sys.stderr)
+        config['reuse_port'] = False
+
+    # with several workers, Prometheus metrics are written to a directory shared by all of them so that /metrics
+    # reports the aggregate, whichever worker serves the scrape; stale files from a previous run are removed
+    if config['workers'] > 1:
+        if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+            os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='prometheus_multiproc_')
+        os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+        for stale_file in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+            os.remove(stale_file)
+
+    # likewise, Coordinator jobs (/mpic/jobs) are written to a shared directory so that any worker can report them;
+    # jobs of a previous run are gone with the workers that ran them
+    if config['workers'] > 1:
+        if 'mpic_job_state_dir' not in os.environ:
+            os.environ['mpic_job_state_dir'] = tempfile.mkdtemp(prefix='mpic_jobs_')
+        os.makedirs(os.environ['mpic_job_state_dir'], exist_ok=True)
+        for stale_file in glob.glob(os.path.join(os.environ['mpic_job_state_dir'], '*.json')):
+            os.remove(stale_file)
 
     # set OS env variable for FastAPI app to access to output runtime configuration
     # convert to string as os environ dictionary expects a string
     os.environ['uvicorn_server_timeout_keep_alive'] = str(config['timeout_keep_alive'])
 
+    if config.get('prefork', False) and config['workers'] > 1:
+        run_prefork(config)
+        return
+
     # Start uvicorn with the configured parameters
     uvicorn.run(
         "main:app",
@@ -45,6 +221,8 @@ def main():
         log_config=config['log_config'],
         timeout_keep_alive=config['timeout_keep_alive'],
         workers=config['workers'],
+        loop=config['loop'],
+        http=config['http'],
         reload=config.get('reload', False)
     )
 
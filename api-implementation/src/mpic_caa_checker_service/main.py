@@ -1,19 +1,31 @@
 import os
-import tomllib
-import importlib.metadata
+import asyncio
 
-from fastapi import FastAPI  # type: ignore
+from contextlib import asynccontextmanager, nullcontext
+from fastapi import FastAPI, Request, Response, WebSocket  # type: ignore
 from pathlib import Path
 from dotenv import load_dotenv
+from pydantic import TypeAdapter
 
-from open_mpic_core import CaaCheckRequest
+from open_mpic_core import CaaCheckRequest, CaaCheckResponse
 from open_mpic_core import MpicCaaChecker
 from open_mpic_core import get_logger
+from mpic_service_common.check_batch import CheckBatchItem, get_check_batch_type
+from mpic_service_common.check_channel import CheckChannelRequest, serve_check_channel
+from mpic_service_common.admission import AdmissionController, AdmissionControlMiddleware, get_admission_settings
+from mpic_service_common.metrics import RequestMetricsMiddleware, EventLoopLagMonitor, TimedDnsResolver
+from mpic_service_common.metrics import build_metrics_response, mark_worker_stopped
+from mpic_service_common.tracing import TRACE_IDENTIFIER_ATTRIBUTE, TracingMiddleware, get_tracer
+from mpic_service_common.tracing import configure_tracing, create_span_exporter, shutdown_tracing, use_trace_context
+from mpic_service_common.request_body import document_request_bodies, validate_request_body
+from mpic_service_common.warm_up import send_warm_up_requests
+from mpic_service_common.project_info import get_project_versions
 
 
 # 'config' directory should be a sibling of the directory containing this file
 config_path = Path(__file__).parent / "config" / "app.conf"
 logger = get_logger(__name__)
+WARM_UP_REQUESTS = [("GET", "/healthz", b""), ("POST", "/caa", b'{"check_type":"caa"}')]
 
 
 class MpicCaaCheckerService:
@@ -29,14 +41,58 @@ class MpicCaaCheckerService:
             if "dns_resolution_lifetime_seconds" in os.environ
             else None
         )
+        self.tracing_exporter = os.environ["tracing_exporter"] if "tracing_exporter" in os.environ else None
+        self.tracing_file_path = os.environ["tracing_file_path"] if "tracing_file_path" in os.environ else None
+        self.admission_controller = AdmissionController.from_environment()
         self.caa_checker = MpicCaaChecker(
             self.default_caa_domain_list,
             dns_timeout=self.dns_timeout_seconds,
             dns_resolution_lifetime=self.dns_resolution_lifetime_seconds,
         )
 
+        self.caa_checker.resolver = TimedDnsResolver(self.caa_checker.resolver)
+        self.event_loop_lag_monitor = EventLoopLagMonitor()
+
+        # requests and responses are (de)serialized straight from/to JSON bytes, skipping intermediate dicts
+        self.caa_check_request_adapter = TypeAdapter(CaaCheckRequest)
+        self.caa_check_response_adapter = TypeAdapter(CaaCheckResponse)
+        self.caa_check_batch_adapter = TypeAdapter(get_check_batch_type(CaaCheckRequest))
+        self.caa_check_batch_response_adapter = TypeAdapter(list[CaaCheckResponse | None])
+        self.caa_check_channel_request_adapter = TypeAdapter(CheckChannelRequest[CaaCheckRequest])
+
+    def parse_caa_check_request(self, body: bytes) -> CaaCheckRequest:
+        return validate_request_body(self.caa_check_request_adapter, body)
+
+    def parse_caa_check_batch(self, body: bytes) -> list[CheckBatchItem[CaaCheckRequest]]:
+        return validate_request_body(self.caa_check_batch_adapter, body)
+
     async def check_caa(self, caa_request: CaaCheckRequest):
-        return await self.caa_checker.check_caa(caa_request)
+        with get_tracer().start_as_current_span(
+            "caa.check", attributes={TRACE_IDENTIFIER_ATTRIBUTE: caa_request.trace_identifier or ""}
+        ):
+            return await self.caa_checker.check_caa(caa_request)
+
+    async def check_caa_batch(
+        self, check_batch_items: list[CheckBatchItem[CaaCheckRequest]]
+    ) -> list[CaaCheckResponse | None]:
+        """
+        Runs the checks of a batch concurrently, each in the trace of the MPIC request it belongs to. A check that
+        raises, or that admission control rejects, is logged and reported as None, leaving the rest of the batch intact.
+        """
+        results = await asyncio.gather(
+            *[self.check_caa_batch_item(item) for item in check_batch_items], return_exceptions=True
+        )
+        for item, result in zip(check_batch_items, results):
+            if isinstance(result, Exception):
+                logger.error(f"CAA check in batch failed: {result}; trace ID: {item.request.trace_identifier}")
+        return [None if isinstance(result, Exception) else result for result in results]
+
+    async def check_caa_batch_item(self, check_batch_item: CheckBatchItem[CaaCheckRequest]) -> CaaCheckResponse:
+        # admitted on its own, as the checks of a batch run concurrently (see ADMISSION_PER_CHECK_PATHS)
+        admission = self.admission_controller.slot() if self.admission_controller is not None else nullcontext()
+        with use_trace_context(check_batch_item.trace_context):
+            async with admission:
+                return await self.check_caa(check_batch_item.request)
 
 
 # Global instance for Service
@@ -53,16 +109,67 @@ def get_service() -> MpicCaaCheckerService:
     return _service
 
 
-app = FastAPI()
+# noinspection PyUnusedLocal
+@asynccontextmanager
+async def lifespan(app_instance: FastAPI):
+    service = get_service()
+    span_exporter = create_span_exporter(service.tracing_exporter, service.tracing_file_path)
+    if span_exporter is not None:
+        configure_tracing("mpic-caa-checker", span_exporter)
+    service.event_loop_lag_monitor.start()
+    await send_warm_up_requests(app_instance, WARM_UP_REQUESTS)
+
+    yield
+
+    await service.event_loop_lag_monitor.stop()
+    if span_exporter is not None:
+        shutdown_tracing()
+    mark_worker_stopped()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(AdmissionControlMiddleware, get_admission_controller=lambda: get_service().admission_controller)
+app.add_middleware(RequestMetricsMiddleware)
+document_request_bodies(app, {"/caa": CaaCheckRequest, "/caa/batch": get_check_batch_type(CaaCheckRequest)})
 
 
 # noinspection PyUnresolvedReferences
 @app.post("/caa")
-async def handle_caa_check(request: CaaCheckRequest):
+async def handle_caa_check(request: Request):
+    service = get_service()
+    caa_check_request = service.parse_caa_check_request(await request.body())
     async with logger.trace_timing("Remote CAA check processing"):
-        result = await get_service().check_caa(request)
+        result = await service.check_caa(caa_check_request)
         logger.trace(f"CAA check result: {result}")
-        return result
+        return Response(content=service.caa_check_response_adapter.dump_json(result), media_type="application/json")
+
+
+# noinspection PyUnresolvedReferences
+@app.post("/caa/batch")
+async def handle_caa_check_batch(request: Request):
+    service = get_service()
+    check_batch_items = service.parse_caa_check_batch(await request.body())
+    async with logger.trace_timing(f"Remote CAA check batch processing ({len(check_batch_items)} checks)"):
+        results = await service.check_caa_batch(check_batch_items)
+        return Response(
+            content=service.caa_check_batch_response_adapter.dump_json(results), media_type="application/json"
+        )
+
+
+@app.websocket("/caa/ws")
+async def handle_caa_check_channel(websocket: WebSocket):
+    """
+    Check channel: many concurrent CAA checks over one WebSocket, answered out of order (see check_channel.py).
+    """
+    service = get_service()
+    await serve_check_channel(
+        websocket,
+        service.caa_check_channel_request_adapter,
+        service.check_caa,
+        service.caa_check_response_adapter,
+        service.admission_controller,
+    )
 
 
 @app.get("/healthz")
@@ -70,28 +177,26 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return build_metrics_response()
+
+
 @app.get("/configz")
 async def get_config():
-    current = Path(__file__).parent
-    for _ in range(3):  # Try up to 3 levels up (Docker flattens the file structure a fair bit)
-        path_to_project_config = current / "pyproject.toml"
-        if path_to_project_config.exists():
-            with path_to_project_config.open(mode="rb") as file:
-                pyproject = tomllib.load(file)
-                uvicorn_server_timeout_keep_alive = (
-                    int(os.environ["uvicorn_server_timeout_keep_alive"])
-                    if "uvicorn_server_timeout_keep_alive" in os.environ
-                    else None
-                )
-                return {
-                    "open_mpic_api_spec_version": pyproject["tool"]["api"]["spec_version"],
-                    "app_version": pyproject["project"]["version"],
-                    "mpic_core_version": importlib.metadata.version("open-mpic-core"),
-                    "default_caa_domains": get_service().default_caa_domain_list,
-                    "log_level": logger.getEffectiveLevel(),
-                    "uvicorn_server_timeout_keep_alive": uvicorn_server_timeout_keep_alive,
-                    "dns_timeout_seconds": get_service().dns_timeout_seconds,
-                    "dns_resolution_lifetime_seconds": get_service().dns_resolution_lifetime_seconds,
-                }
-        current = current.parent
-    raise FileNotFoundError("Could not find pyproject.toml")
+    uvicorn_server_timeout_keep_alive = (
+        int(os.environ["uvicorn_server_timeout_keep_alive"])
+        if "uvicorn_server_timeout_keep_alive" in os.environ
+        else None
+    )
+    return {
+        **get_project_versions(Path(__file__).parent),
+        "default_caa_domains": get_service().default_caa_domain_list,
+        "log_level": logger.getEffectiveLevel(),
+        "uvicorn_server_timeout_keep_alive": uvicorn_server_timeout_keep_alive,
+        "dns_timeout_seconds": get_service().dns_timeout_seconds,
+        "dns_resolution_lifetime_seconds": get_service().dns_resolution_lifetime_seconds,
+        **get_admission_settings(),
+        "tracing_exporter": get_service().tracing_exporter,
+        "tracing_file_path": get_service().tracing_file_path,
+    }
@@ -1,36 +1,115 @@
 import os
 import json
+import random
+import hashlib
+import signal
+import time
+import asyncio
 import traceback
+import re
+import uuid
 
-import tomllib
-import importlib.metadata
 import yaml
 import aiohttp
 
-from contextlib import asynccontextmanager
-from dotenv import load_dotenv
+from collections import OrderedDict, deque
+from itertools import count, cycle
+from collections.abc import AsyncIterator, Iterator
+from contextlib import AbstractContextManager, asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar, copy_context
+from dotenv import load_dotenv, dotenv_values
 from pathlib import Path
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from typing import Annotated, Any
+from yarl import URL
+from fastapi import FastAPI, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
-from pydantic import TypeAdapter, BaseModel, Field
+from opentelemetry.trace import SpanKind
+from pydantic import TypeAdapter, BaseModel, Field, ValidationError
 from open_mpic_core import MpicRequest, MpicResponse
-from open_mpic_core import MpicRequestValidationException, MpicRequestValidationMessages
+from open_mpic_core import MpicRequestValidationException, MpicRequestValidationMessages, MpicRequestValidator
 from open_mpic_core import CheckType
 from open_mpic_core import CheckRequest, CheckResponse
 from open_mpic_core import MpicCoordinator, MpicCoordinatorConfiguration
-from open_mpic_core import RemotePerspective
+from open_mpic_core import RemotePerspective, PerspectiveResponse
+from open_mpic_core import RemoteCheckException, RemoteCheckCallConfiguration
+from open_mpic_core import CohortCreationException, ErrorMessages
+from open_mpic_core import MpicCaaChecker, MpicDcvChecker
+from open_mpic_core.common_domain.enum.regional_internet_registry import RegionalInternetRegistry
 from open_mpic_core import get_logger
+from mpic_service_common.check_batch import encode_check_batch_item
+from mpic_service_common.check_channel import CheckChannelResponse, get_frame_id
+from mpic_service_common.admission import AdmissionController, AdmissionControlMiddleware, get_admission_settings
+from mpic_service_common.metrics import RequestMetricsMiddleware, EventLoopLagMonitor
+from mpic_service_common.metrics import build_metrics_response, mark_worker_stopped, create_http_client_trace_config
+from mpic_service_common.metrics import perspective_call_duration_seconds, time_request_stage, TimedDnsResolver
+from mpic_service_common.tracing import TRACE_IDENTIFIER_ATTRIBUTE, get_tracer, inject_trace_context
+from mpic_service_common.tracing import TracingMiddleware, configure_tracing, create_span_exporter, shutdown_tracing
+from mpic_service_common.request_body import document_request_bodies, validate_request_body
+from mpic_service_common.warm_up import send_warm_up_requests
+from mpic_service_common.project_info import get_project_versions
 
 
 # 'config' directory should be a sibling of the directory containing this file
 config_path = Path(__file__).parent / "config" / "app.conf"
 logger = get_logger(__name__)
+WARM_UP_REQUESTS = [("GET", "/healthz", b""), ("POST", "/mpic", b'{"check_type":"caa"}')]
+
+# request bodies are pre-serialized JSON bytes, so the content type has to be set explicitly
+CHECK_REQUEST_HEADERS = {"Content-Type": "application/json"}
+# upper bound on memoized check request encodings (see encode_check_request)
+ENCODED_CHECK_REQUEST_CACHE_SIZE = 1024
+# encodes a trace identifier exactly as it appears within an encoded check request (see CheckResponseCache.build_key)
+TRACE_IDENTIFIER_ADAPTER = TypeAdapter(str | None)
+# upper bound on memoized cohort groupings (see PerspectiveCohortIndex)
+COHORT_CACHE_SIZE = 4096
+# endpoint URL scheme of perspectives whose checks run in the coordinator process itself
+LOCAL_ENDPOINT_SCHEME = "local://"
+# perspective_transport: one HTTP request per check, or checks multiplexed over one WebSocket per checker
+PERSPECTIVE_TRANSPORT_HTTP = "http"
+PERSPECTIVE_TRANSPORT_WEBSOCKET = "websocket"
+PERSPECTIVE_TRANSPORTS = (PERSPECTIVE_TRANSPORT_HTTP, PERSPECTIVE_TRANSPORT_WEBSOCKET)
+# interval of WebSocket pings keeping check channels open through idle periods (and detecting dead ones)
+CHECK_CHANNEL_HEARTBEAT_SECONDS = 30
+# http_client_pool_mode: one connection pool for all calls to perspectives, one per check type, or one per perspective
+HTTP_CLIENT_POOL_SHARED = "shared"
+HTTP_CLIENT_POOL_PER_CHECK_TYPE = "check_type"
+HTTP_CLIENT_POOL_PER_PERSPECTIVE = "perspective"
+HTTP_CLIENT_POOL_MODES = (HTTP_CLIENT_POOL_SHARED, HTTP_CLIENT_POOL_PER_CHECK_TYPE, HTTP_CLIENT_POOL_PER_PERSPECTIVE)
+# replica_balancing: how calls to a perspective with several replicas pick one of them
+REPLICA_BALANCING_POWER_OF_TWO_CHOICES = "power_of_two_choices"
+REPLICA_BALANCING_LEAST_OUTSTANDING = "least_outstanding"
+REPLICA_BALANCING_STRATEGIES = (REPLICA_BALANCING_POWER_OF_TWO_CHOICES, REPLICA_BALANCING_LEAST_OUTSTANDING)
+# settings making up the perspective configuration, which can be reloaded without restarting the service
+RELOADABLE_PERSPECTIVE_SETTINGS = ("perspectives", "default_perspective_count")
+# number of recent call latencies kept per perspective and check type, and how many are needed before they are used
+LATENCY_WINDOW_SIZE = 200
+LATENCY_MIN_SAMPLES = 20
+
+# queue receiving each perspective response of the MPIC coordination running in the current context, if streamed
+perspective_response_listener: ContextVar[asyncio.Queue | None] = ContextVar(
+    "perspective_response_listener", default=None
+)
+
+
+# perspective configuration snapshot that the MPIC coordination running in the current context started with
+active_perspective_configuration: ContextVar["PerspectiveConfiguration | None"] = ContextVar(
+    "active_perspective_configuration", default=None
+)
 
 
 class PerspectiveEndpointInfo(BaseModel):
     url: str
     headers: dict[str, str] | None = Field(default_factory=dict)
+    # further checkers serving the same perspective and check type; calls are balanced across url and these
+    replica_urls: list[str] = Field(default_factory=list)
+
+    def is_local(self) -> bool:
+        return self.url.startswith(LOCAL_ENDPOINT_SCHEME)
+
+    def get_urls(self) -> list[str]:
+        return [self.url, *self.replica_urls]
 
 
 class PerspectiveEndpoints(BaseModel):
@@ -38,18 +117,1074 @@ class PerspectiveEndpoints(BaseModel):
     caa_endpoint_info: PerspectiveEndpointInfo
 
 
+class HttpClientPoolSettings(BaseModel):
+    """
+    Settings of one HTTP client connection pool; unset fields take the service-wide http_client_* values.
+    """
+
+    limit_per_host: int | None = None
+    keepalive_timeout_seconds: float | None = None
+    dns_cache_ttl_seconds: float | None = None
+    timeout_seconds: float | None = None
+
+
+class PerspectiveConfiguration:
+    """
+    Snapshot of the perspectives the coordinator fans out to, together with the MPIC coordinator built for them.
+    Reloading the configuration builds a new snapshot and swaps it in as a whole; MPIC requests already in flight keep
+    the snapshot they started with.
+    """
+
+    def __init__(
+        self,
+        remotes_per_perspective_per_check_type: dict[CheckType, dict[str, PerspectiveEndpointInfo]],
+        target_perspectives: list[RemotePerspective],
+        default_perspective_count: int,
+        mpic_coordinator_configuration: MpicCoordinatorConfiguration,
+        mpic_coordinator: "ServiceMpicCoordinator",
+    ):
+        self.remotes_per_perspective_per_check_type = remotes_per_perspective_per_check_type
+        self.target_perspectives = target_perspectives
+        self.default_perspective_count = default_perspective_count
+        self.mpic_coordinator_configuration = mpic_coordinator_configuration
+        self.mpic_coordinator = mpic_coordinator
+
+
+class MpicBatchItemResult(BaseModel):
+    """
+    Outcome of one MPIC request within a batch; status_code is what /mpic would have returned for the request alone.
+    """
+
+    index: int
+    status_code: int
+    response: MpicResponse | None = None
+    error: str | None = None
+    validation_issues: list | None = None
+
+
+class MpicJob(BaseModel):
+    """
+    State of an MPIC request submitted to /mpic/jobs; once completed, status_code is what /mpic would have returned.
+    """
+
+    job_id: str
+    status: str
+    status_code: int | None = None
+    response: MpicResponse | None = None
+    error: str | None = None
+    validation_issues: list | None = None
+
+
+class StoredMpicJob(BaseModel):
+    """
+    An MPIC job as written to the state directory of an MpicJobQueue, with the process id of the worker running it.
+    """
+
+    owner_pid: int
+    job: MpicJob
+
+
+class MpicJobQueueFullException(Exception):
+    pass
+
+
+MPIC_JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")  # uuid4().hex
+MPIC_JOB_WORKER_STOPPED_ERROR = "The worker running the MPIC job stopped before completing it."
+
+
+class MpicJobQueue:
+    """
+    Bounded queue of MPIC jobs drained by a fixed number of worker tasks. Completed jobs are kept for a time-to-live
+    counted from their completion, then forgotten.
+
+    With a state directory, every change of a job's state is also written to a file there, so that the other Uvicorn
+    workers sharing the directory can report jobs queued by this one. Jobs are still run by the worker that accepted
+    them; a job not completed by the time that worker is gone (e.g. crashed) is reported as completed with a 500.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+    def __init__(
+        self,
+        max_depth: int,
+        worker_count: int,
+        result_ttl_seconds: float,
+        perform_mpic,
+        state_dir: str | None = None,
+    ):
+        """
+        :param perform_mpic: async function coordinating an MpicRequest and returning its MpicResponse
+        :param state_dir: directory shared with the other workers, or None to keep jobs in this process only
+        """
+        self.max_depth = max_depth
+        self.worker_count = worker_count
+        self.result_ttl_seconds = result_ttl_seconds
+        self.perform_mpic = perform_mpic
+        self.state_dir = state_dir
+        self.stored_job_adapter = TypeAdapter(StoredMpicJob)
+        self._queue: asyncio.Queue[tuple[MpicJob, MpicRequest]] = asyncio.Queue(maxsize=max_depth)
+        self._jobs: dict[str, MpicJob] = {}
+        # job id -> expiry time of completed jobs; all share one TTL, so completion order is expiry order
+        self._completed_job_expiry: OrderedDict[str, float] = OrderedDict()
+        self._workers: list[asyncio.Task] = []
+        self.running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.expired = 0
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.worker_count)]
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # jobs that were not completed are lost with this worker; other workers report them as unknown from now on
+        for job_id, job in self._jobs.items():
+            if job.status != MpicJobQueue.COMPLETED:
+                self._remove_job(job_id)
+
+    def submit(self, mpic_request: MpicRequest) -> MpicJob:
+        self._expire_jobs()
+        if self._queue.full():
+            self.rejected += 1
+            raise MpicJobQueueFullException(f"MPIC job queue is full ({self.max_depth} jobs waiting)")
+        job = MpicJob(job_id=uuid.uuid4().hex, status=MpicJobQueue.QUEUED)
+        self._queue.put_nowait((job, mpic_request))
+        self._jobs[job.job_id] = job
+        self._store_job(job)
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> MpicJob | None:
+        self._expire_jobs()
+        job = self._jobs.get(job_id)
+        if job is None and self.state_dir is not None:
+            job = self._load_job(job_id)  # accepted by another worker
+        return job
+
+    def _get_job_path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def _store_job(self, job: MpicJob):
+        if self.state_dir is None:
+            return
+        # written aside and renamed, so that other workers never read a partially written file
+        job_path = self._get_job_path(job.job_id)
+        temporary_path = f"{job_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(self.stored_job_adapter.dump_json(StoredMpicJob(owner_pid=os.getpid(), job=job), exclude_none=True))
+        os.replace(temporary_path, job_path)
+
+    def _load_job(self, job_id: str) -> MpicJob | None:
+        if not MPIC_JOB_ID_PATTERN.fullmatch(job_id):  # never a path outside the state directory
+            return None
+        job_path = self._get_job_path(job_id)
+        try:
+            with open(job_path, "rb") as f:
+                stored_job = self.stored_job_adapter.validate_json(f.read())
+            job = stored_job.job
+            if job.status != MpicJobQueue.COMPLETED and not MpicJobQueue.is_process_alive(stored_job.owner_pid):
+                # its worker is gone without completing it; stored as failed, so that the TTL applies from now on
+                job = MpicJob(
+                    job_id=job_id,
+                    status=MpicJobQueue.COMPLETED,
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    error=MPIC_JOB_WORKER_STOPPED_ERROR,
+                )
+                self._store_job(job)
+            # the file of a completed job is last written on completion; the accepting worker deletes it on expiry,
+            # but may not have run since, or be gone
+            elif (
+                job.status == MpicJobQueue.COMPLETED
+                and os.path.getmtime(job_path) + self.result_ttl_seconds < time.time()
+            ):
+                self._remove_job(job_id)
+                return None
+            return job
+        except (OSError, ValidationError):
+            return None
+
+    @staticmethod
+    def is_process_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)  # signal 0 only checks that the process exists
+        except ProcessLookupError:
+            return False
+        except PermissionError:  # exists, but runs as another user
+            pass
+        return True
+
+    def _remove_job(self, job_id: str):
+        if self.state_dir is None:
+            return
+        try:
+            os.remove(self._get_job_path(job_id))
+        except OSError:
+            pass
+
+    def _expire_jobs(self):
+        now = time.monotonic()
+        while self._completed_job_expiry:
+            job_id, expires_at = next(iter(self._completed_job_expiry.items()))
+            if expires_at > now:
+                break
+            del self._completed_job_expiry[job_id]
+            del self._jobs[job_id]
+            self._remove_job(job_id)
+            self.expired += 1
+
+    async def _work(self):
+        while True:
+            job, mpic_request = await self._queue.get()
+            job.status = MpicJobQueue.RUNNING
+            self._store_job(job)
+            self.running += 1
+            try:
+                job.response = await self.perform_mpic(mpic_request)
+                job.status_code = status.HTTP_200_OK
+            except MpicRequestValidationException as e:
+                job.status_code = status.HTTP_400_BAD_REQUEST
+                job.error = MpicRequestValidationMessages.REQUEST_VALIDATION_FAILED.key
+                job.validation_issues = json.loads(e.__notes__[0])
+            except Exception as e:
+                logger.error(traceback.format_exc())
+                job.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+                job.error = str(e)
+            finally:
+                self.running -= 1
+                job.status = MpicJobQueue.COMPLETED
+                self._store_job(job)
+                self._completed_job_expiry[job.job_id] = time.monotonic() + self.result_ttl_seconds
+                self._queue.task_done()
+
+    def get_stats(self) -> dict:
+        self._expire_jobs()
+        return {
+            "max_depth": self.max_depth,
+            "workers": self.worker_count,
+            "queued": self._queue.qsize(),
+            "running": self.running,
+            "completed_stored": len(self._completed_job_expiry),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "expired": self.expired,
+        }
+
+
+class CheckResponseCache:
+    """
+    Size-bounded LRU cache of recent successful check responses with a short time-to-live.
+
+    Entries are keyed per perspective, so a response is only ever served again for the perspective that produced it.
+    Serving it to a later MPIC request at all is a choice left to the operator (the cache is off by default), who must
+    check it against their own compliance requirements.
+    Only completed, passing, error-free responses are cached, so a transient failure is never pinned.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, CheckType, bytes], tuple[float, CheckResponse]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def build_key(
+        perspective_code: str, check_type: CheckType, check_request: CheckRequest, encoded_check_request: bytes
+    ) -> tuple[str, CheckType, bytes]:
+        """
+        :param encoded_check_request: the check request as encoded once for the fan-out (see encode_check_request)
+        """
+        # the trace identifier differs between otherwise identical requests and does not affect the check outcome, so
+        # its member is cut out of the encoded request; a JSON key cannot occur unescaped within a string value
+        trace_identifier_member = b'"trace_identifier":' + TRACE_IDENTIFIER_ADAPTER.dump_json(
+            check_request.trace_identifier
+        )
+        return perspective_code, check_type, encoded_check_request.replace(trace_identifier_member, b"", 1)
+
+    @staticmethod
+    def is_cacheable(check_response: CheckResponse) -> bool:
+        return check_response.check_completed and check_response.check_passed and not check_response.errors
+
+    def get(self, key: tuple[str, CheckType, bytes]) -> CheckResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, check_response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return check_response
+
+    def put(self, key: tuple[str, CheckType, bytes], check_response: CheckResponse):
+        if not CheckResponseCache.is_cacheable(check_response):
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, check_response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class PerspectiveRequestBatcher:
+    """
+    Gathers check requests headed to the same perspective within a short time window and sends them as one batch call.
+    A batch is sent when the window (started by its first request) elapses or when it reaches the maximum size.
+    Each check keeps the trace context of the MPIC request that submitted it, as a batch mixes checks of several.
+    """
+
+    def __init__(self, window_seconds: float, max_batch_size: int, send_batch):
+        """
+        :param window_seconds: how long to wait for more requests after the first request of a batch arrives
+        :param max_batch_size: number of requests at which a batch is sent without waiting for the window to elapse
+        :param send_batch: async function taking (check type, perspective code, list of (check request, trace
+               context) pairs) and returning the check responses in the same order (None for checks that failed at
+               the remote perspective)
+        """
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.send_batch = send_batch
+        self._pending: dict[tuple[CheckType, str], list[tuple[CheckRequest, dict[str, str], asyncio.Future]]] = {}
+        self._flush_timers: dict[tuple[CheckType, str], asyncio.TimerHandle] = {}
+        self._batch_tasks: set[asyncio.Task] = set()
+        self.batches_sent = 0
+        self.checks_sent = 0
+
+    async def submit(self, check_type: CheckType, perspective_code: str, check_request: CheckRequest) -> CheckResponse:
+        loop = asyncio.get_running_loop()
+        batch_key = (check_type, perspective_code)
+        response_future = loop.create_future()
+        pending_checks = self._pending.setdefault(batch_key, [])
+        pending_checks.append((check_request, inject_trace_context({}), response_future))
+
+        if len(pending_checks) >= self.max_batch_size:
+            self._flush(batch_key)
+        elif len(pending_checks) == 1:
+            self._flush_timers[batch_key] = loop.call_later(self.window_seconds, self._flush, batch_key)
+
+        return await response_future
+
+    def _flush(self, batch_key: tuple[CheckType, str]):
+        flush_timer = self._flush_timers.pop(batch_key, None)
+        if flush_timer is not None:
+            flush_timer.cancel()
+        pending_checks = self._pending.pop(batch_key, None)
+        if pending_checks:
+            batch_task = asyncio.create_task(self._send(batch_key, pending_checks))
+            self._batch_tasks.add(batch_task)  # keep a reference until done so the task is not garbage collected
+            batch_task.add_done_callback(self._batch_tasks.discard)
+
+    async def _send(
+        self,
+        batch_key: tuple[CheckType, str],
+        pending_checks: list[tuple[CheckRequest, dict[str, str], asyncio.Future]],
+    ):
+        check_type, perspective_code = batch_key
+        self.batches_sent += 1
+        self.checks_sent += len(pending_checks)
+        try:
+            check_responses = await self.send_batch(
+                check_type,
+                perspective_code,
+                [(check_request, trace_context) for check_request, trace_context, _ in pending_checks],
+            )
+            if len(check_responses) != len(pending_checks):
+                raise ValueError(f"Expected {len(pending_checks)} responses in batch but got {len(check_responses)}")
+        except Exception as e:
+            for _, _, response_future in pending_checks:
+                if not response_future.done():
+                    response_future.set_exception(e)
+            return
+
+        for (_, _, response_future), check_response in zip(pending_checks, check_responses):
+            if response_future.done():  # the caller is no longer waiting
+                continue
+            if check_response is None:
+                response_future.set_exception(RuntimeError("Check failed at remote perspective"))
+            else:
+                response_future.set_result(check_response)
+
+    async def close(self):
+        for flush_timer in self._flush_timers.values():
+            flush_timer.cancel()
+        for pending_checks in self._pending.values():
+            for _, _, response_future in pending_checks:
+                response_future.cancel()
+        self._flush_timers.clear()
+        self._pending.clear()
+        for batch_task in list(self._batch_tasks):
+            batch_task.cancel()
+        await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "window_seconds": self.window_seconds,
+            "max_batch_size": self.max_batch_size,
+            "batches_sent": self.batches_sent,
+            "checks_sent": self.checks_sent,
+        }
+
+
+class PerspectiveCheckChannel:
+    """
+    WebSocket to the check channel of one checker (e.g. /caa/ws), carrying any number of concurrent checks over one
+    connection. Each request frame gets an id and responses are matched to their requests by id, in whatever order
+    they arrive. Connects on first use and again after the connection is lost; checks outstanding on a lost connection
+    fail.
+    """
+
+    def __init__(self, url: str, headers: dict[str, str] | None, http_client: aiohttp.ClientSession):
+        self.url = url
+        self.headers = headers
+        self.http_client = http_client
+        self._websocket: aiohttp.ClientWebSocketResponse | None = None
+        self._connect_lock = asyncio.Lock()
+        self._reader_task: asyncio.Task | None = None
+        self._frame_ids = count(1)
+        self._pending_responses: dict[int, asyncio.Future] = {}
+        self._response_adapter = TypeAdapter(CheckChannelResponse[CheckResponse])
+        self.connections = 0
+
+    async def connect(self) -> aiohttp.ClientWebSocketResponse:
+        async with self._connect_lock:
+            if self._websocket is None or self._websocket.closed:
+                self._websocket = await self.http_client.ws_connect(
+                    self.url, headers=self.headers, heartbeat=CHECK_CHANNEL_HEARTBEAT_SECONDS
+                )
+                self._reader_task = asyncio.create_task(self._read_responses(self._websocket))
+                self.connections += 1
+            return self._websocket
+
+    async def send(
+        self, encoded_check_request: bytes, trace_context: dict[str, str], timeout_seconds: float
+    ) -> CheckResponse:
+        """
+        :raises asyncio.TimeoutError: if no response arrives within the timeout
+        :raises RuntimeError: if the check failed at the checker
+        :raises ConnectionError: if the connection was lost before the response arrived
+        """
+        websocket = await self.connect()
+        frame_id = next(self._frame_ids)
+        response_future = asyncio.get_running_loop().create_future()
+        self._pending_responses[frame_id] = response_future
+        try:
+            # the request is spliced in as already encoded (once per fan-out, see encode_check_request)
+            await websocket.send_bytes(
+                b'{"id":%d,"trace_context":%b,"request":%b}'
+                % (frame_id, json.dumps(trace_context).encode(), encoded_check_request)
+            )
+            channel_response = await asyncio.wait_for(response_future, timeout_seconds)
+        finally:
+            self._pending_responses.pop(frame_id, None)
+        if channel_response.error is not None:
+            raise RuntimeError(f"Check failed at remote perspective: {channel_response.error}")
+        return channel_response.response
+
+    async def _read_responses(self, websocket: aiohttp.ClientWebSocketResponse):
+        try:
+            async for message in websocket:
+                if message.type not in (aiohttp.WSMsgType.BINARY, aiohttp.WSMsgType.TEXT):
+                    continue
+                try:
+                    channel_response = self._response_adapter.validate_json(message.data)
+                except ValidationError as e:  # fails that check only, just as an invalid HTTP response body would
+                    response_future = self._pending_responses.get(get_frame_id(message.data))
+                    if response_future is not None and not response_future.done():
+                        response_future.set_exception(e)
+                    continue
+                response_future = self._pending_responses.get(channel_response.id)
+                if response_future is not None and not response_future.done():
+                    response_future.set_result(channel_response)
+        except Exception as e:
+            logger.warning(f"Check channel to {self.url} failed: {e}")
+        finally:
+            for response_future in self._pending_responses.values():
+                if not response_future.done():
+                    response_future.set_exception(ConnectionError(f"Check channel to {self.url} closed"))
+            if not websocket.closed:
+                await websocket.close()
+
+    async def close(self):
+        if self._websocket is not None:
+            await self._websocket.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "connected": self._websocket is not None and not self._websocket.closed,
+            "connections": self.connections,
+            "outstanding_checks": len(self._pending_responses),
+        }
+
+
+class PerspectiveReplica:
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding_calls = 0
+        self.consecutive_failures = 0
+        self.ejected_until: float | None = None
+        self.latency_seconds: float | None = None  # exponentially weighted moving average of successful calls
+        self.successes = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until is not None and now < self.ejected_until
+
+    def get_stats(self) -> dict:
+        return {
+            "ejected": self.is_ejected(time.monotonic()),
+            "outstanding_calls": self.outstanding_calls,
+            "latency_seconds": round(self.latency_seconds, 6) if self.latency_seconds is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "ejections": self.ejections,
+        }
+
+
+class PerspectiveReplicaBalancer:
+    """
+    Spreads the calls to one perspective endpoint over its replicas. With power-of-two-choices, each call samples two
+    replicas at random and goes to the one with fewer calls outstanding; with least-outstanding, it goes to the
+    replica with the fewest of all. Ties go to the replica with the lower recent latency.
+    A replica failing ejection_failure_threshold calls in a row is left out for ejection_seconds, after which it gets
+    calls again (and is ejected again by its next failure unless it succeeds). If every replica is ejected, all of
+    them are used: a perspective is never taken out by its balancer, only by its circuit breaker.
+    """
+
+    LATENCY_WEIGHT = 0.2  # weight of the latest call in the moving-average latency
+
+    def __init__(self, urls: list[str], strategy: str, ejection_failure_threshold: int, ejection_seconds: float):
+        self.replicas = [PerspectiveReplica(url) for url in urls]
+        self.strategy = strategy
+        self.ejection_failure_threshold = ejection_failure_threshold
+        self.ejection_seconds = ejection_seconds
+
+    def choose_replica(self) -> PerspectiveReplica:
+        now = time.monotonic()
+        candidates = [replica for replica in self.replicas if not replica.is_ejected(now)] or self.replicas
+        if self.strategy == REPLICA_BALANCING_POWER_OF_TWO_CHOICES and len(candidates) > 2:
+            candidates = random.sample(candidates, 2)
+        return min(
+            candidates,
+            key=lambda replica: (
+                replica.outstanding_calls,
+                replica.latency_seconds if replica.latency_seconds is not None else 0.0,
+            ),
+        )
+
+    @contextmanager
+    def track_call(self) -> Iterator[str]:
+        """
+        Chooses a replica for a call made within the context, yielding its URL, and records the call's outcome.
+        """
+        replica = self.choose_replica()
+        replica.outstanding_calls += 1
+        start = time.perf_counter()
+        try:
+            yield replica.url
+        except Exception:  # cancellations (e.g. of a losing hedge) say nothing about the replica
+            self.record_failure(replica)
+            raise
+        else:
+            self.record_success(replica, time.perf_counter() - start)
+        finally:
+            replica.outstanding_calls -= 1
+
+    def record_success(self, replica: PerspectiveReplica, latency_seconds: float):
+        replica.successes += 1
+        replica.consecutive_failures = 0
+        replica.ejected_until = None
+        if replica.latency_seconds is None:
+            replica.latency_seconds = latency_seconds
+        else:
+            weight = PerspectiveReplicaBalancer.LATENCY_WEIGHT
+            replica.latency_seconds = (1 - weight) * replica.latency_seconds + weight * latency_seconds
+
+    def record_failure(self, replica: PerspectiveReplica):
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if 0 < self.ejection_failure_threshold <= replica.consecutive_failures:
+            now = time.monotonic()
+            if not replica.is_ejected(now):  # failures while every replica is ejected only extend the ejection
+                replica.ejections += 1
+                logger.warning(f"Ejected perspective replica {replica.url} for {self.ejection_seconds} seconds")
+            replica.ejected_until = now + self.ejection_seconds
+
+    def get_stats(self) -> dict:
+        return {replica.url: replica.get_stats() for replica in self.replicas}
+
+
+class PerspectiveLatencyTracker:
+    """
+    Rolling window of recent successful remote call latencies per perspective and check type.
+    """
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE, min_samples: int = LATENCY_MIN_SAMPLES):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self._samples: dict[tuple[str, CheckType], deque[float]] = {}
+        self._sorted_samples: dict[tuple[str, CheckType], list[float]] = {}  # computed lazily, reset on every record
+
+    def record(self, perspective_code: str, check_type: CheckType, latency_seconds: float):
+        key = (perspective_code, check_type)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window_size)
+        samples.append(latency_seconds)
+        self._sorted_samples.pop(key, None)
+
+    def get_tracked_keys(self) -> list[tuple[str, CheckType]]:
+        return list(self._samples.keys())
+
+    def get_percentile(self, perspective_code: str, check_type: CheckType, percentile: float) -> float | None:
+        """
+        :return: the given percentile (0-100) of recent latencies in seconds, or None if there are too few samples
+        """
+        key = (perspective_code, check_type)
+        samples = self._samples.get(key)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        sorted_samples = self._sorted_samples.get(key)
+        if sorted_samples is None:
+            sorted_samples = self._sorted_samples[key] = sorted(samples)
+        index = min(len(sorted_samples) - 1, int(len(sorted_samples) * percentile / 100))
+        return sorted_samples[index]
+
+
+class HedgingPolicy:
+    """
+    Decides when a speculative duplicate (hedge) of a slow remote call may be sent, within a load budget.
+    Every call earns budget_percent/100 of a token and every hedge spends a whole one, so hedges add at most
+    budget_percent extra calls over time (with small bursts allowed by the token cap).
+    """
+
+    MAX_TOKENS = 10
+
+    def __init__(self, hedge_after_percentile: float, budget_percent: float):
+        self.hedge_after_percentile = hedge_after_percentile
+        self.budget_percent = budget_percent
+        self._tokens = 0.0
+        self.calls = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.hedges_denied_by_budget = 0
+
+    def record_call(self):
+        self.calls += 1
+        self._tokens = min(HedgingPolicy.MAX_TOKENS, self._tokens + self.budget_percent / 100)
+
+    def try_acquire_hedge(self) -> bool:
+        if self._tokens < 1:
+            self.hedges_denied_by_budget += 1
+            return False
+        self._tokens -= 1
+        self.hedges_sent += 1
+        return True
+
+    def get_stats(self) -> dict:
+        return {
+            "hedge_after_percentile": self.hedge_after_percentile,
+            "budget_percent": self.budget_percent,
+            "calls": self.calls,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "hedges_denied_by_budget": self.hedges_denied_by_budget,
+        }
+
+
+class PerspectiveCircuitOpenException(Exception):
+    pass
+
+
+class PerspectiveCircuitBreaker:
+    """
+    Circuit breaker and health score for calls to one perspective for one check type.
+    After failure_threshold consecutive failed calls the circuit opens and calls fail fast. Once open_seconds have
+    passed it goes half-open, and a background health probe decides whether it closes again or stays open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    HEALTH_SCORE_WEIGHT = 0.1  # weight of the latest outcome in the moving-average health score
+
+    def __init__(self, failure_threshold: int, open_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = PerspectiveCircuitBreaker.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.health_score = 1.0  # exponentially weighted success rate, from 0 (always failing) to 1 (always succeeding)
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejections = 0
+
+    def allow_call(self) -> bool:
+        if self.state == PerspectiveCircuitBreaker.CLOSED:
+            return True
+        self.rejections += 1
+        return False
+
+    def record_success(self):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._update_health_score(1.0)
+
+    def record_failure(self, is_timeout: bool = False) -> bool:
+        """
+        :return: True if this failure opened the circuit
+        """
+        self.failures += 1
+        if is_timeout:
+            self.timeouts += 1
+        self.consecutive_failures += 1
+        self._update_health_score(0.0)
+        if self.state == PerspectiveCircuitBreaker.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self.open()
+            return True
+        return False
+
+    def open(self):
+        self.state = PerspectiveCircuitBreaker.OPEN
+        self.opened_at = time.monotonic()
+
+    def half_open(self):
+        self.state = PerspectiveCircuitBreaker.HALF_OPEN
+
+    def close(self):
+        self.state = PerspectiveCircuitBreaker.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def _update_health_score(self, outcome: float):
+        weight = PerspectiveCircuitBreaker.HEALTH_SCORE_WEIGHT
+        self.health_score = (1 - weight) * self.health_score + weight * outcome
+
+    def get_stats(self) -> dict:
+        return {
+            "state": self.state,
+            "health_score": round(self.health_score, 4),
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejections": self.rejections,
+        }
+
+
+class PerspectiveCohortIndex:
+    """
+    Groups the target perspectives into cohorts for a domain exactly as CohortCreator does, with the work that does not
+    depend on the domain done once when the configuration is loaded: perspectives are sorted up front and referred to
+    by position, "too close" relations become bitmasks, and the groupings of recently seen domains are memoized.
+    CohortCreator rebuilds and rescans its perspective lists on every step, which grows quadratically with the number
+    of perspectives.
+    """
+
+    def __init__(self, target_perspectives: list[RemotePerspective], hash_secret: str):
+        self.perspectives = sorted(target_perspectives, key=lambda perspective: perspective.code)
+        self.hash_secret = hash_secret
+        self._rirs = [perspective.rir for perspective in self.perspectives]
+        position_mask_per_code = {}
+        for position, perspective in enumerate(self.perspectives):
+            position_mask_per_code[perspective.code] = position_mask_per_code.get(perspective.code, 0) | 1 << position
+        # bit i of the mask of a perspective is set if the perspective at position i is too close to it
+        self._too_close_masks = [
+            sum(position_mask_per_code.get(code, 0) for code in set(perspective.too_close_codes or []))
+            for perspective in self.perspectives
+        ]
+        self._cohorts_by_target: OrderedDict[tuple[int, str], list[list[int]]] = OrderedDict()
+
+    def create_cohorts(self, cohort_size: int, domain_or_ip_target: str) -> list[list[RemotePerspective]]:
+        if cohort_size > len(self.perspectives):
+            raise CohortCreationException(ErrorMessages.COHORT_CREATION_ERROR.message.format(cohort_size))
+
+        cache_key = (cohort_size, domain_or_ip_target.lower())
+        cohorts = self._cohorts_by_target.get(cache_key)
+        if cohorts is None:
+            random_seed = hashlib.sha256((self.hash_secret + domain_or_ip_target.lower()).encode("utf-8")).digest()
+            cohorts = self.group_positions(self.shuffle_positions_per_rir(random_seed), cohort_size)
+            self._cohorts_by_target[cache_key] = cohorts
+            if len(self._cohorts_by_target) > COHORT_CACHE_SIZE:
+                self._cohorts_by_target.popitem(last=False)
+        else:
+            self._cohorts_by_target.move_to_end(cache_key)
+        return [[self.perspectives[position] for position in cohort] for cohort in cohorts]
+
+    def shuffle_positions_per_rir(self, random_seed: bytes) -> dict[RegionalInternetRegistry, deque[int]]:
+        # shuffling positions permutes them exactly as CohortCreator permutes the (equally long) sorted perspective list
+        positions = list(range(len(self.perspectives)))
+        random.Random(random_seed).shuffle(positions)
+        positions_per_rir = {}
+        for position in positions:
+            positions_per_rir.setdefault(self._rirs[position], deque()).append(position)
+        return positions_per_rir
+
+    def group_positions(
+        self, positions_per_rir: dict[RegionalInternetRegistry, deque[int]], cohort_size: int
+    ) -> list[list[int]]:
+        """
+        Same steps as CohortCreator.create_perspective_cohorts, on perspective positions, keeping a running count of
+        the perspectives left instead of recounting them.
+        """
+        available_count = sum(len(positions) for positions in positions_per_rir.values())
+        if cohort_size == 1:
+            raise ValueError("Cohort size must be greater than 1")
+        elif cohort_size == 2:  # no RIR diversity required; pairs are still spread over RIRs where possible
+            cohorts = []
+            rirs_cycle = cycle(positions_per_rir.keys())
+            for _ in range(available_count // 2):
+                next_cohort = []
+                while len(next_cohort) < 2 and available_count > 0:
+                    current_rir = next(rirs_cycle)
+                    if positions_per_rir[current_rir]:
+                        next_cohort.append(positions_per_rir[current_rir].popleft())
+                        available_count -= 1
+                cohorts.append(next_cohort)
+            return cohorts
+        elif len(positions_per_rir) < 2:
+            return []
+
+        def put_back(positions: list[int]):
+            nonlocal available_count
+            for position in positions:
+                positions_per_rir[self._rirs[position]].append(position)
+            available_count += len(positions)
+
+        # first, try to start each potential cohort with perspectives from 2 distinct RIRs
+        new_cohorts = [[] for _ in range(available_count // cohort_size)]
+        cohorts_with_two_rirs, full_cohorts = [], []
+        cohort_index = 0
+        for current_rir in positions_per_rir.keys():
+            while cohort_index < len(new_cohorts):
+                cohort = new_cohorts[cohort_index]
+                if not positions_per_rir[current_rir] or any(
+                    self._rirs[position] == current_rir for position in cohort
+                ):
+                    break
+                cohort.append(positions_per_rir[current_rir].popleft())
+                available_count -= 1
+                if len(cohort) == 2:
+                    cohorts_with_two_rirs.append(new_cohorts.pop(cohort_index))
+                else:
+                    cohort_index += 1
+                if cohort_index >= len(new_cohorts):
+                    cohort_index = 0
+        for cohort in new_cohorts:
+            put_back(cohort)
+
+        # then fill up one cohort at a time, skipping perspectives too close to one already in the cohort
+        rirs_cycle = cycle(positions_per_rir.keys())
+        for cohort in cohorts_with_two_rirs:
+            too_close_positions = []
+            cohort_mask = sum(1 << position for position in cohort)
+            while len(cohort) < cohort_size and cohort_size - len(cohort) <= available_count:
+                current_rir = next(rirs_cycle)
+                while positions_per_rir[current_rir]:
+                    candidate = positions_per_rir[current_rir].popleft()
+                    available_count -= 1
+                    if not self._too_close_masks[candidate] & cohort_mask:
+                        cohort.append(candidate)
+                        cohort_mask |= 1 << candidate
+                        break
+                    too_close_positions.append(candidate)
+
+            if len(cohort) == cohort_size:
+                full_cohorts.append(cohort)
+            else:  # ran out of perspectives to add to this cohort; scrap it
+                put_back(cohort)
+            put_back(too_close_positions)
+        return full_cohorts
+
+
+class ServiceMpicCoordinator(MpicCoordinator):
+    """
+    MpicCoordinator recording each fan-out to a cohort of perspectives as a span and, in early quorum mode, returning
+    from a fan-out as soon as its outcome is decided.
+    """
+
+    def __init__(
+        self,
+        call_remote_perspective_function,
+        mpic_coordinator_configuration: MpicCoordinatorConfiguration,
+        early_quorum_return: bool = False,
+    ):
+        super().__init__(call_remote_perspective_function, mpic_coordinator_configuration)
+        self.early_quorum_return = early_quorum_return
+        self.perspective_cohort_index = PerspectiveCohortIndex(self.target_perspectives, self.hash_secret)
+        self.early_decisions = 0
+        self.cancelled_perspective_calls = 0
+
+    def shuffle_and_group_perspectives(self, target_perspectives, cohort_size, domain_or_ip_target):
+        return self.perspective_cohort_index.create_cohorts(cohort_size, domain_or_ip_target)
+
+    async def call_remote_perspective(
+        self, call_remote_perspective_function, call_config: RemoteCheckCallConfiguration
+    ) -> PerspectiveResponse:
+        """
+        Also hands each perspective response (or the error response standing in for a failed call) to the listener of a
+        streamed coordination as soon as it is available.
+        """
+        listener = perspective_response_listener.get()
+        try:
+            perspective_response = await super().call_remote_perspective(call_remote_perspective_function, call_config)
+        except RemoteCheckException as e:
+            if listener is not None:
+                listener.put_nowait(MpicCoordinator.build_error_perspective_response_from_exception(e))
+            raise
+        if listener is not None:
+            listener.put_nowait(perspective_response)
+        return perspective_response
+
+    async def call_checkers_and_collect_responses(self, mpic_request, perspectives_to_use, async_calls_to_issue):
+        with get_tracer().start_as_current_span(
+            "mpic.fan_out",
+            attributes={
+                TRACE_IDENTIFIER_ATTRIBUTE: mpic_request.trace_identifier or "",
+                "mpic.perspective_codes": [perspective.code for perspective in perspectives_to_use],
+            },
+        ):
+            if not self.early_quorum_return:
+                return await super().call_checkers_and_collect_responses(
+                    mpic_request, perspectives_to_use, async_calls_to_issue
+                )
+            return await self.call_checkers_until_outcome_decided(
+                mpic_request, perspectives_to_use, async_calls_to_issue
+            )
+
+    async def call_checkers_until_outcome_decided(
+        self, mpic_request, perspectives_to_use, async_calls_to_issue: list[RemoteCheckCallConfiguration]
+    ) -> list[PerspectiveResponse]:
+        """
+        Collects perspective responses until the quorum is reached or can no longer be reached, then cancels the calls
+        still outstanding (releasing their connections) and reports them as errors. The outcome of the attempt is the
+        same as if every call had been awaited; only perspectives that were cancelled show as not completed.
+        """
+        quorum_count = self.determine_required_quorum_count(
+            mpic_request.orchestration_parameters, len(perspectives_to_use)
+        )
+        call_configs_by_task = {
+            asyncio.create_task(self.call_remote_perspective(self.call_remote_perspective_function, call_config)): (
+                call_config
+            )
+            for call_config in async_calls_to_issue
+        }
+        responses_by_perspective_code: dict[str, PerspectiveResponse] = {}
+        outstanding = set(call_configs_by_task.keys())
+        try:
+            while outstanding:
+                done, outstanding = await asyncio.wait(outstanding, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    call_config = call_configs_by_task[task]
+                    if isinstance(task.exception(), RemoteCheckException):
+                        logger.warning(f"{task.exception()} - trace ID: {mpic_request.trace_identifier}")
+                        response = MpicCoordinator.build_error_perspective_response_from_exception(task.exception())
+                    else:
+                        response = task.result()
+                    responses_by_perspective_code[call_config.perspective.code] = response
+                passed_perspectives = [
+                    perspective
+                    for perspective in perspectives_to_use
+                    if perspective.code in responses_by_perspective_code
+                    and responses_by_perspective_code[perspective.code].check_response.check_passed
+                ]
+                outstanding_perspectives = [call_configs_by_task[task].perspective for task in outstanding]
+                if outstanding and self.is_outcome_decided(
+                    passed_perspectives, outstanding_perspectives, len(perspectives_to_use), quorum_count
+                ):
+                    break
+        finally:
+            for task in outstanding:
+                task.cancel()
+            await asyncio.gather(*outstanding, return_exceptions=True)
+
+        if outstanding:
+            self.early_decisions += 1
+            self.cancelled_perspective_calls += len(outstanding)
+            # noinspection PyUnresolvedReferences
+            logger.trace(
+                f"MPIC outcome decided with {len(outstanding)} perspective calls outstanding; "
+                f"trace ID: {mpic_request.trace_identifier}"
+            )
+        for task in outstanding:
+            call_config = call_configs_by_task[task]
+            cancellation = RemoteCheckException(
+                f"Check cancelled for perspective {call_config.perspective.code}: MPIC outcome already decided; "
+                f"trace ID: {mpic_request.trace_identifier}",
+                call_config=call_config,
+            )
+            responses_by_perspective_code[call_config.perspective.code] = (
+                MpicCoordinator.build_error_perspective_response_from_exception(cancellation)
+            )
+        return [responses_by_perspective_code[call_config.perspective.code] for call_config in async_calls_to_issue]
+
+    @staticmethod
+    def is_outcome_decided(
+        passed_perspectives: list[RemotePerspective],
+        outstanding_perspectives: list[RemotePerspective],
+        cohort_size: int,
+        quorum_count: int,
+    ) -> bool:
+        """
+        Mirrors the verdict of MpicCoordinator.coordinate_mpic: enough passing perspectives and, for cohorts of more
+        than two, passing perspectives from at least two RIRs.
+        :return: True if the verdict can no longer change, whatever the outstanding perspectives answer
+        """
+        is_quorum_reached = len(passed_perspectives) >= quorum_count
+        is_quorum_reachable = len(passed_perspectives) + len(outstanding_perspectives) >= quorum_count
+        if cohort_size > 2:
+            passed_rirs = {perspective.rir for perspective in passed_perspectives}
+            is_quorum_reached = is_quorum_reached and len(passed_rirs) >= 2
+            reachable_rirs = passed_rirs | {perspective.rir for perspective in outstanding_perspectives}
+            is_quorum_reachable = is_quorum_reachable and len(reachable_rirs) >= 2
+        return is_quorum_reached or not is_quorum_reachable
+
+    def get_early_quorum_stats(self) -> dict:
+        return {
+            "early_decisions": self.early_decisions,
+            "cancelled_perspective_calls": self.cancelled_perspective_calls,
+        }
+
+
 class MpicCoordinatorService:
     def __init__(self):
+        # reloads take these from app.conf, unless they were set in the environment (which load_dotenv leaves as is)
+        self._environment_perspective_settings = {
+            key: os.environ[key] for key in RELOADABLE_PERSPECTIVE_SETTINGS if key in os.environ
+        }
         load_dotenv(config_path)
 
         # load environment variables
-        perspectives_json = os.environ["perspectives"]
-        perspectives = {
-            code: PerspectiveEndpoints.model_validate(endpoints)
-            for code, endpoints in json.loads(perspectives_json).items()
-        }
-        self.all_target_perspective_codes = list(perspectives.keys())
-        self.default_perspective_count = int(os.environ["default_perspective_count"])
         self.global_max_attempts = (
             int(os.environ["absolute_max_attempts"]) if "absolute_max_attempts" in os.environ else None
         )
@@ -62,8 +1197,429 @@ class MpicCoordinatorService:
             if "http_client_keepalive_timeout_seconds" in os.environ
             else 60
         )
+        self.check_response_cache_ttl_seconds = (
+            float(os.environ["check_response_cache_ttl_seconds"])
+            if "check_response_cache_ttl_seconds" in os.environ
+            else 0
+        )
+        self.check_response_cache_max_entries = (
+            int(os.environ["check_response_cache_max_entries"])
+            if "check_response_cache_max_entries" in os.environ
+            else 10000
+        )
+        self.adaptive_timeout_factor = (
+            float(os.environ["adaptive_timeout_factor"]) if "adaptive_timeout_factor" in os.environ else 0
+        )
+        self.adaptive_timeout_percentile = (
+            float(os.environ["adaptive_timeout_percentile"]) if "adaptive_timeout_percentile" in os.environ else 99
+        )
+        self.adaptive_timeout_min_seconds = (
+            float(os.environ["adaptive_timeout_min_seconds"]) if "adaptive_timeout_min_seconds" in os.environ else 1
+        )
+        self.adaptive_timeout_max_seconds = (
+            float(os.environ["adaptive_timeout_max_seconds"])
+            if "adaptive_timeout_max_seconds" in os.environ
+            else self.http_client_timeout_seconds
+        )
+        self.hedge_after_percentile = (
+            float(os.environ["hedge_after_percentile"]) if "hedge_after_percentile" in os.environ else 0
+        )
+        self.hedge_budget_percent = (
+            float(os.environ["hedge_budget_percent"]) if "hedge_budget_percent" in os.environ else 5
+        )
+        self.circuit_breaker_failure_threshold = (
+            int(os.environ["circuit_breaker_failure_threshold"])
+            if "circuit_breaker_failure_threshold" in os.environ
+            else 0
+        )
+        self.circuit_breaker_open_seconds = (
+            float(os.environ["circuit_breaker_open_seconds"]) if "circuit_breaker_open_seconds" in os.environ else 30
+        )
+        self.perspective_batching_window_ms = (
+            float(os.environ["perspective_batching_window_ms"]) if "perspective_batching_window_ms" in os.environ else 0
+        )
+        self.perspective_batch_max_size = (
+            int(os.environ["perspective_batch_max_size"]) if "perspective_batch_max_size" in os.environ else 50
+        )
+        self.mpic_batch_max_size = (
+            int(os.environ["mpic_batch_max_size"]) if "mpic_batch_max_size" in os.environ else 1000
+        )
+        self.mpic_batch_max_concurrency = (
+            int(os.environ["mpic_batch_max_concurrency"]) if "mpic_batch_max_concurrency" in os.environ else 10
+        )
+        self.perspective_transport = (
+            os.environ["perspective_transport"] if "perspective_transport" in os.environ else PERSPECTIVE_TRANSPORT_HTTP
+        )
+        if self.perspective_transport not in PERSPECTIVE_TRANSPORTS:
+            raise ValueError(f"perspective_transport must be one of {PERSPECTIVE_TRANSPORTS}")
+        self.replica_balancing = (
+            os.environ["replica_balancing"]
+            if "replica_balancing" in os.environ
+            else REPLICA_BALANCING_POWER_OF_TWO_CHOICES
+        )
+        if self.replica_balancing not in REPLICA_BALANCING_STRATEGIES:
+            raise ValueError(f"replica_balancing must be one of {REPLICA_BALANCING_STRATEGIES}")
+        self.replica_ejection_failure_threshold = (
+            int(os.environ["replica_ejection_failure_threshold"])
+            if "replica_ejection_failure_threshold" in os.environ
+            else 3
+        )
+        self.replica_ejection_seconds = (
+            float(os.environ["replica_ejection_seconds"]) if "replica_ejection_seconds" in os.environ else 30
+        )
+        self.http_client_pool_mode = (
+            os.environ["http_client_pool_mode"] if "http_client_pool_mode" in os.environ else HTTP_CLIENT_POOL_SHARED
+        )
+        if self.http_client_pool_mode not in HTTP_CLIENT_POOL_MODES:
+            raise ValueError(f"http_client_pool_mode must be one of {HTTP_CLIENT_POOL_MODES}")
+        self.http_client_limit_per_host = (
+            int(os.environ["http_client_limit_per_host"]) if "http_client_limit_per_host" in os.environ else 0
+        )
+        self.http_client_dns_cache_ttl_seconds = (
+            float(os.environ["http_client_dns_cache_ttl_seconds"])
+            if "http_client_dns_cache_ttl_seconds" in os.environ
+            else 10
+        )
+        self.http_client_pool_settings = (
+            TypeAdapter(dict[str, HttpClientPoolSettings]).validate_json(os.environ["http_client_pool_settings"])
+            if "http_client_pool_settings" in os.environ
+            else {}
+        )
+        self.local_checker_default_caa_domains = (
+            os.environ["local_checker_default_caa_domains"].split("|")
+            if "local_checker_default_caa_domains" in os.environ
+            else None
+        )
+        self.local_checker_dns_timeout_seconds = (
+            float(os.environ["local_checker_dns_timeout_seconds"])
+            if "local_checker_dns_timeout_seconds" in os.environ
+            else None
+        )
+        self.local_checker_dns_resolution_lifetime_seconds = (
+            float(os.environ["local_checker_dns_resolution_lifetime_seconds"])
+            if "local_checker_dns_resolution_lifetime_seconds" in os.environ
+            else None
+        )
+        self.local_checker_http_client_timeout_seconds = (
+            float(os.environ["local_checker_http_client_timeout_seconds"])
+            if "local_checker_http_client_timeout_seconds" in os.environ
+            else 30
+        )
+        self.local_checker_verify_ssl = (
+            "local_checker_verify_ssl" not in os.environ or os.environ["local_checker_verify_ssl"] == "True"
+        )
+        self.http_client_warm_connections_per_endpoint = (
+            int(os.environ["http_client_warm_connections_per_endpoint"])
+            if "http_client_warm_connections_per_endpoint" in os.environ
+            else 0
+        )
+        self.tracing_exporter = os.environ["tracing_exporter"] if "tracing_exporter" in os.environ else None
+        self.tracing_file_path = os.environ["tracing_file_path"] if "tracing_file_path" in os.environ else None
+        self.admission_controller = AdmissionController.from_environment()
+        self.early_quorum_return = "early_quorum_return" in os.environ and os.environ["early_quorum_return"] == "True"
+        self.mpic_job_queue_depth = (
+            int(os.environ["mpic_job_queue_depth"]) if "mpic_job_queue_depth" in os.environ else 1000
+        )
+        self.mpic_job_workers = int(os.environ["mpic_job_workers"]) if "mpic_job_workers" in os.environ else 10
+        self.mpic_job_result_ttl_seconds = (
+            float(os.environ["mpic_job_result_ttl_seconds"]) if "mpic_job_result_ttl_seconds" in os.environ else 300
+        )
+        self.mpic_job_retry_after_seconds = (
+            int(os.environ["mpic_job_retry_after_seconds"]) if "mpic_job_retry_after_seconds" in os.environ else 1
+        )
+        # set by run_uvicorn.py when several workers run, so that any of them can report any job
+        self.mpic_job_state_dir = os.environ.get("mpic_job_state_dir") or None
+        self.coalesce_identical_mpic_requests = (
+            "coalesce_identical_mpic_requests" in os.environ
+            and os.environ["coalesce_identical_mpic_requests"] == "True"
+        )
+        self.perspective_config_reload_interval_seconds = (
+            float(os.environ["perspective_config_reload_interval_seconds"])
+            if "perspective_config_reload_interval_seconds" in os.environ
+            else 0
+        )
+
+        # checkers for perspectives with local:// endpoints, created when first needed
+        self._local_caa_checker = None
+        self._local_dcv_checker = None
+
+        self.perspective_configuration = self.build_perspective_configuration(
+            os.environ["perspectives"], int(os.environ["default_perspective_count"])
+        )
+        self.perspective_configuration_reloads = 0
+        self.failed_perspective_configuration_reloads = 0
+        self._perspective_config_watch_task = None
+
+        self._async_http_client = (
+            None  # pool of the "shared" mode, also standing for whether the service is initialized
+        )
+        self._http_client_pools: dict[str, aiohttp.ClientSession] = {}
+        self._check_channels: dict[tuple[str, str], PerspectiveCheckChannel] = {}
+        # balancers of endpoints with replicas, keyed by their URLs so that their state survives configuration reloads
+        self._replica_balancers: dict[tuple[str, ...], PerspectiveReplicaBalancer] = {}
+        self._keep_warm_task = None
+        self.connection_warmups = 0
+        self.failed_warming_requests = 0
+        self.event_loop_lag_monitor = EventLoopLagMonitor()
+
+        # a TTL of 0 (the default) disables caching of check responses
+        self.check_response_cache = (
+            CheckResponseCache(self.check_response_cache_ttl_seconds, self.check_response_cache_max_entries)
+            if self.check_response_cache_ttl_seconds > 0
+            else None
+        )
+
+        self.perspective_latency_tracker = PerspectiveLatencyTracker()
+        # a percentile of 0 (the default) disables hedging
+        self.hedging_policy = (
+            HedgingPolicy(self.hedge_after_percentile, self.hedge_budget_percent)
+            if self.hedge_after_percentile > 0
+            else None
+        )
+
+        # a failure threshold of 0 (the default) disables circuit breaking
+        self.circuit_breakers: dict[tuple[str, CheckType], PerspectiveCircuitBreaker] = {}
+        self._circuit_probe_tasks: set[asyncio.Task] = set()
+
+        # a window of 0 (the default) sends every check request to its perspective in its own call
+        self.perspective_request_batcher = (
+            PerspectiveRequestBatcher(
+                self.perspective_batching_window_ms / 1000, self.perspective_batch_max_size, self.send_check_batch
+            )
+            if self.perspective_batching_window_ms > 0
+            else None
+        )
+
+        # identical MPIC requests currently being coordinated, keyed by their trace-independent JSON representation
+        self._in_flight_mpic_requests: dict[str, asyncio.Task] = {}
+        self.coalesced_mpic_request_count = 0
+
+        self.mpic_job_queue = MpicJobQueue(
+            self.mpic_job_queue_depth,
+            self.mpic_job_workers,
+            self.mpic_job_result_ttl_seconds,
+            self.perform_mpic,
+            self.mpic_job_state_dir,
+        )
+
+        # for correct deserialization of responses based on discriminator field (check type)
+        self.mpic_request_adapter = TypeAdapter(MpicRequest)
+        self.mpic_response_adapter = TypeAdapter(MpicResponse)
+        self.check_request_adapter = TypeAdapter(CheckRequest)
+        self.check_response_adapter = TypeAdapter(CheckResponse)
+        self.check_batch_response_adapter = TypeAdapter(list[CheckResponse | None])
+        # batch items are validated one by one so that an invalid item does not fail the whole batch
+        self.mpic_batch_adapter = TypeAdapter(Annotated[list[Any], Field(max_length=self.mpic_batch_max_size)])
+        self.mpic_batch_item_result_adapter = TypeAdapter(MpicBatchItemResult)
+        self.mpic_batch_result_adapter = TypeAdapter(list[MpicBatchItemResult])
+        self.mpic_job_adapter = TypeAdapter(MpicJob)
+        self._encoded_check_requests: OrderedDict[int, tuple[CheckRequest, bytes]] = OrderedDict()
+
+    async def initialize(self):
+        if self._async_http_client is None:
+            self._async_http_client = self.create_http_client(HTTP_CLIENT_POOL_SHARED)
+        self.event_loop_lag_monitor.start()
+        self.mpic_job_queue.start()
+        # a count of 0 (the default) opens connections to the perspectives on demand only
+        if self.http_client_warm_connections_per_endpoint > 0 and self._keep_warm_task is None:
+            await self.warm_connections()  # before the worker starts taking requests
+            self._keep_warm_task = asyncio.create_task(self.keep_connections_warm())
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.reload_perspective_configuration)
+        except (ValueError, RuntimeError, NotImplementedError, AttributeError):
+            logger.debug("SIGUSR1 handler not installed: signals are only handled on the main thread of the process")
+        # an interval of 0 (the default) reloads the perspective configuration on SIGUSR1 only
+        if self.perspective_config_reload_interval_seconds > 0 and self._perspective_config_watch_task is None:
+            self._perspective_config_watch_task = asyncio.create_task(self.watch_perspective_configuration_files())
+
+    async def shutdown(self):
+        if self._keep_warm_task is not None:
+            self._keep_warm_task.cancel()
+            await asyncio.gather(self._keep_warm_task, return_exceptions=True)
+            self._keep_warm_task = None
+        await asyncio.gather(*[check_channel.close() for check_channel in self._check_channels.values()])
+        self._check_channels.clear()
+        try:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+        except (ValueError, RuntimeError, NotImplementedError, AttributeError):
+            pass
+        if self._perspective_config_watch_task is not None:
+            self._perspective_config_watch_task.cancel()
+            await asyncio.gather(self._perspective_config_watch_task, return_exceptions=True)
+            self._perspective_config_watch_task = None
+        await self.event_loop_lag_monitor.stop()
+        await self.mpic_job_queue.close()
+        for probe_task in list(self._circuit_probe_tasks):
+            probe_task.cancel()
+        await asyncio.gather(*self._circuit_probe_tasks, return_exceptions=True)
+        if self.perspective_request_batcher is not None:
+            await self.perspective_request_batcher.close()
+        for http_client in self._http_client_pools.values():
+            await http_client.close()
+        self._http_client_pools.clear()
+        if self._async_http_client:
+            await self._async_http_client.close()
+            self._async_http_client = None
+
+    async def warm_connections(self):
+        """
+        Sends http_client_warm_connections_per_endpoint concurrent health checks to the checkers of every perspective,
+        leaving that many keep-alive connections (including any TLS session) open to each. The requests have to be
+        concurrent: aiohttp hands out the most recently released idle connection, so sequential requests would keep
+        only one connection alive.
+        """
+        if self.perspective_transport == PERSPECTIVE_TRANSPORT_WEBSOCKET:
+            # a check channel needs a single connection, which its heartbeat then keeps open
+            await self.warm_check_channels()
+            return
+
+        # connections are warmed in the pool that the check requests to the endpoint will use
+        warming_targets = {}
+        for check_type, endpoints_per_perspective in self.remotes_per_perspective_per_check_type.items():
+            for perspective_code, endpoint_info in endpoints_per_perspective.items():
+                if endpoint_info.is_local():
+                    continue
+                pool = self.get_http_client_pool(perspective_code, check_type)
+                for url in endpoint_info.get_urls():
+                    health_url = MpicCoordinatorService.get_health_url(url)
+                    warming_targets[(pool, health_url)] = (self.get_http_client(pool), endpoint_info.headers)
+
+        warming_requests = [
+            self.send_warming_request(http_client, health_url, headers)
+            for (_, health_url), (http_client, headers) in warming_targets.items()
+            for _ in range(self.http_client_warm_connections_per_endpoint)
+        ]
+        results = await asyncio.gather(*warming_requests)
+        self.connection_warmups += 1
+        self.failed_warming_requests += results.count(False)
+
+    async def warm_check_channels(self):
+        check_channels = [
+            self.get_check_channel(perspective_code, check_type, url, endpoint_info.headers)
+            for check_type, endpoints_per_perspective in self.remotes_per_perspective_per_check_type.items()
+            for perspective_code, endpoint_info in endpoints_per_perspective.items()
+            if not endpoint_info.is_local()
+            for url in endpoint_info.get_urls()
+        ]
+        results = await asyncio.gather(
+            *[check_channel.connect() for check_channel in check_channels], return_exceptions=True
+        )
+        self.connection_warmups += 1
+        for check_channel, result in zip(check_channels, results):
+            if isinstance(result, Exception):
+                self.failed_warming_requests += 1
+                logger.debug(f"Opening check channel to {check_channel.url} failed: {result}")
+
+    @staticmethod
+    async def send_warming_request(
+        http_client: aiohttp.ClientSession, health_url: str, headers: dict[str, str] | None
+    ) -> bool:
+        try:
+            async with http_client.get(url=health_url, headers=headers) as response:
+                await response.read()  # the connection goes back to the pool once the body is consumed
+            return True
+        except Exception as e:
+            logger.debug(f"Warming request to {health_url} failed: {e}")
+            return False
+
+    def get_http_client_pool(self, perspective_code: str, check_type: CheckType) -> str:
+        """
+        :return: name of the connection pool for calls to the perspective for the check type, per http_client_pool_mode
+        """
+        if self.http_client_pool_mode == HTTP_CLIENT_POOL_PER_CHECK_TYPE:
+            return str(check_type)
+        if self.http_client_pool_mode == HTTP_CLIENT_POOL_PER_PERSPECTIVE:
+            return perspective_code
+        return HTTP_CLIENT_POOL_SHARED
+
+    def get_http_client(self, pool: str) -> aiohttp.ClientSession:
+        """
+        :return: the client session of the connection pool, created on first use (perspectives may come and go with
+                 configuration reloads)
+        """
+        if self._async_http_client is None:
+            raise RuntimeError("Service not initialized - call initialize() first")
+        if pool == HTTP_CLIENT_POOL_SHARED:
+            return self._async_http_client
+        http_client = self._http_client_pools.get(pool)
+        if http_client is None:
+            http_client = self.create_http_client(pool)
+            self._http_client_pools[pool] = http_client
+        return http_client
+
+    def create_http_client(self, pool: str) -> aiohttp.ClientSession:
+        pool_settings = self.http_client_pool_settings.get(pool, HttpClientPoolSettings())
+
+        def setting_or_default(value, default):
+            return default if value is None else value
+
+        timeout_seconds = setting_or_default(pool_settings.timeout_seconds, self.http_client_timeout_seconds)
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=setting_or_default(pool_settings.limit_per_host, self.http_client_limit_per_host),
+            keepalive_timeout=setting_or_default(
+                pool_settings.keepalive_timeout_seconds, self.http_client_keepalive_timeout_seconds
+            ),
+            ttl_dns_cache=setting_or_default(
+                pool_settings.dns_cache_ttl_seconds, self.http_client_dns_cache_ttl_seconds
+            ),
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=timeout_seconds, sock_read=timeout_seconds),
+            trust_env=True,
+            trace_configs=[create_http_client_trace_config(pool)],
+        )
+
+    async def keep_connections_warm(self):
+        """
+        Repeats the warming requests well within the keep-alive timeout, so idle connections are never closed by it.
+        Perspectives added by a configuration reload are picked up on the next round.
+        """
+        while True:
+            await asyncio.sleep(self.http_client_keepalive_timeout_seconds / 2)
+            await self.warm_connections()
+
+    def get_connection_warming_stats(self) -> dict:
+        return {
+            "connections_per_endpoint": self.http_client_warm_connections_per_endpoint,
+            "warmups": self.connection_warmups,
+            "failed_requests": self.failed_warming_requests,
+        }
+
+    # The current perspective configuration, as seen by requests starting now.
+    @property
+    def remotes_per_perspective_per_check_type(self) -> dict[CheckType, dict[str, PerspectiveEndpointInfo]]:
+        return self.perspective_configuration.remotes_per_perspective_per_check_type
+
+    @property
+    def target_perspectives(self) -> list[RemotePerspective]:
+        return self.perspective_configuration.target_perspectives
+
+    @property
+    def all_target_perspective_codes(self) -> list[str]:
+        return list(self.perspective_configuration.remotes_per_perspective_per_check_type[CheckType.DCV].keys())
+
+    @property
+    def default_perspective_count(self) -> int:
+        return self.perspective_configuration.default_perspective_count
 
-        self.remotes_per_perspective_per_check_type = {
+    @property
+    def mpic_coordinator_configuration(self) -> MpicCoordinatorConfiguration:
+        return self.perspective_configuration.mpic_coordinator_configuration
+
+    @property
+    def mpic_coordinator(self) -> "ServiceMpicCoordinator":
+        return self.perspective_configuration.mpic_coordinator
+
+    def build_perspective_configuration(
+        self, perspectives_json: str, default_perspective_count: int
+    ) -> PerspectiveConfiguration:
+        perspectives = {
+            code: PerspectiveEndpoints.model_validate(endpoints)
+            for code, endpoints in json.loads(perspectives_json).items()
+        }
+        remotes_per_perspective_per_check_type = {
             CheckType.DCV: {
                 perspective_code: perspective_config.dcv_endpoint_info
                 for perspective_code, perspective_config in perspectives.items()
@@ -74,40 +1630,106 @@ class MpicCoordinatorService:
             },
         }
 
+        has_local_caa_endpoint = any(
+            endpoint.is_local() for endpoint in remotes_per_perspective_per_check_type[CheckType.CAA].values()
+        )
+        if has_local_caa_endpoint and not self.local_checker_default_caa_domains:
+            raise ValueError("local_checker_default_caa_domains must be set for perspectives with local CAA endpoints")
+
         all_possible_perspectives_by_code = MpicCoordinatorService.load_available_perspectives_config()
-        self.target_perspectives = MpicCoordinatorService.convert_codes_to_remote_perspectives(
-            self.all_target_perspective_codes, all_possible_perspectives_by_code
+        target_perspectives = MpicCoordinatorService.convert_codes_to_remote_perspectives(
+            list(perspectives.keys()), all_possible_perspectives_by_code
         )
 
-        self.mpic_coordinator_configuration = MpicCoordinatorConfiguration(
-            self.target_perspectives, self.default_perspective_count, self.global_max_attempts, self.hash_secret
+        mpic_coordinator_configuration = MpicCoordinatorConfiguration(
+            target_perspectives, default_perspective_count, self.global_max_attempts, self.hash_secret
+        )
+        mpic_coordinator = ServiceMpicCoordinator(
+            call_remote_perspective_function=self.call_remote_perspective,
+            mpic_coordinator_configuration=mpic_coordinator_configuration,
+            early_quorum_return=self.early_quorum_return,
+        )
+        return PerspectiveConfiguration(
+            remotes_per_perspective_per_check_type,
+            target_perspectives,
+            default_perspective_count,
+            mpic_coordinator_configuration,
+            mpic_coordinator,
         )
 
-        self._async_http_client = None
+    def reload_perspective_configuration(self) -> bool:
+        """
+        Rebuilds the perspective configuration from app.conf and available_perspectives.yaml and swaps it in.
+        Requests in flight finish on the previous configuration; the HTTP client (and its warm connections) is kept.
+        :return: True if the configuration was reloaded, False if it was invalid (the current one then stays in place)
+        """
+        file_settings = dotenv_values(config_path)
+        settings = {
+            key: self._environment_perspective_settings.get(key, file_settings.get(key, os.environ.get(key)))
+            for key in RELOADABLE_PERSPECTIVE_SETTINGS
+        }
+        try:
+            perspective_configuration = self.build_perspective_configuration(
+                settings["perspectives"], int(settings["default_perspective_count"])
+            )
+        except Exception as e:
+            self.failed_perspective_configuration_reloads += 1
+            logger.error(f"Perspective configuration not reloaded, keeping the current one: {e}")
+            return False
 
-        self.mpic_coordinator = MpicCoordinator(
-            call_remote_perspective_function=self.call_remote_perspective,
-            mpic_coordinator_configuration=self.mpic_coordinator_configuration,
+        previous_mpic_coordinator = self.perspective_configuration.mpic_coordinator
+        perspective_configuration.mpic_coordinator.early_decisions = previous_mpic_coordinator.early_decisions
+        perspective_configuration.mpic_coordinator.cancelled_perspective_calls = (
+            previous_mpic_coordinator.cancelled_perspective_calls
         )
+        self.perspective_configuration = perspective_configuration
+        self.perspective_configuration_reloads += 1
+        logger.info(f"Reloaded perspective configuration: {self.all_target_perspective_codes}")
+        return True
 
-        # for correct deserialization of responses based on discriminator field (check type)
-        self.mpic_request_adapter = TypeAdapter(MpicRequest)
-        self.check_response_adapter = TypeAdapter(CheckResponse)
+    async def watch_perspective_configuration_files(self):
+        """
+        Reloads the perspective configuration whenever app.conf or available_perspectives.yaml is modified.
+        """
+        watched_paths = [config_path, MpicCoordinatorService.get_available_perspectives_config_path()]
 
-    async def initialize(self):
-        if self._async_http_client is None:
-            session_timeout = aiohttp.ClientTimeout(
-                total=None, sock_connect=self.http_client_timeout_seconds, sock_read=self.http_client_timeout_seconds
-            )
-            connector = aiohttp.TCPConnector(limit=0, keepalive_timeout=self.http_client_keepalive_timeout_seconds)
-            self._async_http_client = aiohttp.ClientSession(
-                connector=connector, timeout=session_timeout, trust_env=True
-            )
+        def get_modification_times():
+            return [path.stat().st_mtime_ns if path.exists() else None for path in watched_paths]
 
-    async def shutdown(self):
-        if self._async_http_client:
-            await self._async_http_client.close()
-            self._async_http_client = None
+        last_modification_times = get_modification_times()
+        while True:
+            await asyncio.sleep(self.perspective_config_reload_interval_seconds)
+            modification_times = get_modification_times()
+            if modification_times != last_modification_times:
+                last_modification_times = modification_times
+                self.reload_perspective_configuration()
+
+    def get_perspective_configuration_stats(self) -> dict:
+        return {
+            "target_perspective_codes": self.all_target_perspective_codes,
+            "default_perspective_count": self.default_perspective_count,
+            "reloads": self.perspective_configuration_reloads,
+            "failed_reloads": self.failed_perspective_configuration_reloads,
+        }
+
+    def get_endpoint_info(self, check_type: CheckType, perspective_code: str) -> PerspectiveEndpointInfo:
+        """
+        :return: the endpoint of the perspective in the configuration the current MPIC request started with
+        """
+        perspective_configuration = active_perspective_configuration.get() or self.perspective_configuration
+        return perspective_configuration.remotes_per_perspective_per_check_type[check_type][perspective_code]
+
+    async def coordinate_mpic(self, mpic_request: MpicRequest) -> MpicResponse:
+        perspective_configuration = self.perspective_configuration  # kept for the whole request, even across a reload
+        token = active_perspective_configuration.set(perspective_configuration)
+        try:
+            return await perspective_configuration.mpic_coordinator.coordinate_mpic(mpic_request)
+        finally:
+            active_perspective_configuration.reset(token)
+
+    @staticmethod
+    def get_available_perspectives_config_path() -> Path:
+        return Path(__file__).parent / "resources" / "available_perspectives.yaml"
 
     @staticmethod
     def load_available_perspectives_config() -> dict[str, RemotePerspective]:
@@ -116,7 +1738,7 @@ class MpicCoordinatorService:
         Expects the yaml to be in the resources folder, next to the app folder containing this file.
         :return: dict of available perspectives with region code as key
         """
-        resource_path = Path(__file__).parent / "resources" / "available_perspectives.yaml"
+        resource_path = MpicCoordinatorService.get_available_perspectives_config_path()
 
         with resource_path.open() as file:
             region_config_yaml = yaml.safe_load(file)
@@ -140,26 +1762,480 @@ class MpicCoordinatorService:
 
         return remote_perspectives
 
+    def encode_check_request(self, check_request: CheckRequest) -> bytes:
+        """
+        Serializes a check request to JSON bytes, encoding it only once per fan-out.
+        MpicCoordinator hands the same CheckRequest instance to every perspective in a cohort, so encodings are memoized
+        by object identity. The cache holds a reference to the request, so its id cannot be reused while it is cached.
+        :param check_request: the check request to send to a remote perspective
+        :return: JSON encoding of the check request
+        """
+        cached = self._encoded_check_requests.get(id(check_request))
+        if cached is not None and cached[0] is check_request:
+            return cached[1]
+
+        encoded_check_request = self.check_request_adapter.dump_json(check_request)
+        self._encoded_check_requests[id(check_request)] = (check_request, encoded_check_request)
+        if len(self._encoded_check_requests) > ENCODED_CHECK_REQUEST_CACHE_SIZE:
+            self._encoded_check_requests.popitem(last=False)
+        return encoded_check_request
+
     # This function MUST validate its response and return a proper open_mpic_core object type.
     async def call_remote_perspective(
         self, perspective: RemotePerspective, check_type: CheckType, check_request: CheckRequest
     ) -> CheckResponse:
-        if self._async_http_client is None:
-            raise RuntimeError("Service not initialized - call initialize() first")
+        with get_tracer().start_as_current_span(
+            "mpic.perspective_call",
+            kind=SpanKind.CLIENT,
+            attributes={
+                TRACE_IDENTIFIER_ATTRIBUTE: check_request.trace_identifier or "",
+                "mpic.perspective_code": perspective.code,
+                "mpic.check_type": check_type,
+            },
+        ):
+            if self.check_response_cache is None:
+                return await self.send_guarded_check_request(perspective, check_type, check_request)
+
+            cache_key = CheckResponseCache.build_key(
+                perspective.code, check_type, check_request, self.encode_check_request(check_request)
+            )
+            check_response = self.check_response_cache.get(cache_key)
+            if check_response is None:
+                check_response = await self.send_guarded_check_request(perspective, check_type, check_request)
+                self.check_response_cache.put(cache_key, check_response)
+            return check_response
+
+    async def send_guarded_check_request(
+        self, perspective: RemotePerspective, check_type: CheckType, check_request: CheckRequest
+    ) -> CheckResponse:
+        """
+        Sends the check request through the circuit breaker of the perspective, failing fast while the circuit is open.
+        """
+        if self.circuit_breaker_failure_threshold <= 0:
+            return await self.send_hedged_check_request(perspective, check_type, check_request)
+
+        circuit_breaker = self.get_circuit_breaker(perspective.code, check_type)
+        if not circuit_breaker.allow_call():
+            raise PerspectiveCircuitOpenException(
+                f"Circuit {circuit_breaker.state} for perspective {perspective.code} ({check_type})"
+            )
+
+        try:
+            check_response = await self.send_hedged_check_request(perspective, check_type, check_request)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if circuit_breaker.record_failure(is_timeout=isinstance(e, asyncio.TimeoutError)):
+                logger.warning(f"Opened circuit for perspective {perspective.code} ({check_type}) after failures")
+                self.schedule_circuit_probe(perspective.code, check_type, circuit_breaker)
+            raise
+        circuit_breaker.record_success()
+        return check_response
+
+    def get_circuit_breaker(self, perspective_code: str, check_type: CheckType) -> PerspectiveCircuitBreaker:
+        circuit_breaker = self.circuit_breakers.get((perspective_code, check_type))
+        if circuit_breaker is None:
+            circuit_breaker = PerspectiveCircuitBreaker(
+                self.circuit_breaker_failure_threshold, self.circuit_breaker_open_seconds
+            )
+            self.circuit_breakers[(perspective_code, check_type)] = circuit_breaker
+        return circuit_breaker
+
+    def schedule_circuit_probe(
+        self, perspective_code: str, check_type: CheckType, circuit_breaker: PerspectiveCircuitBreaker
+    ):
+        probe_task = asyncio.create_task(self.probe_open_circuit(perspective_code, check_type, circuit_breaker))
+        self._circuit_probe_tasks.add(probe_task)
+        probe_task.add_done_callback(self._circuit_probe_tasks.discard)
+
+    async def probe_open_circuit(
+        self, perspective_code: str, check_type: CheckType, circuit_breaker: PerspectiveCircuitBreaker
+    ):
+        """
+        Waits out the open period, then probes the health endpoint of the checker (a sibling of its check endpoint)
+        until it answers, closing the circuit once it does.
+        """
+        while circuit_breaker.state != PerspectiveCircuitBreaker.CLOSED:
+            await asyncio.sleep(circuit_breaker.open_seconds)
+            circuit_breaker.half_open()
+            endpoint_info = self.remotes_per_perspective_per_check_type[check_type].get(perspective_code)
+            if endpoint_info is None or endpoint_info.is_local():  # removed by a reload, or nothing to probe
+                circuit_breaker.close()
+                return
+            http_client = self.get_http_client(self.get_http_client_pool(perspective_code, check_type))
+            is_healthy = False
+            for url in endpoint_info.get_urls():  # one healthy replica is enough to take calls again
+                health_url = MpicCoordinatorService.get_health_url(url)
+                try:
+                    async with http_client.get(url=health_url, headers=endpoint_info.headers) as response:
+                        is_healthy = response.status == status.HTTP_200_OK
+                except Exception as e:
+                    logger.debug(f"Health probe of perspective {perspective_code} ({check_type}) failed: {e}")
+                if is_healthy:
+                    break
+
+            if is_healthy:
+                circuit_breaker.close()
+                logger.info(f"Closed circuit for perspective {perspective_code} ({check_type}) after health probe")
+            else:
+                circuit_breaker.open()
+
+    def get_circuit_breaker_stats(self) -> dict:
+        circuit_breaker_stats = {}
+        for (perspective_code, check_type), circuit_breaker in self.circuit_breakers.items():
+            circuit_breaker_stats.setdefault(perspective_code, {})[check_type] = circuit_breaker.get_stats()
+        return circuit_breaker_stats
 
+    async def send_hedged_check_request(
+        self, perspective: RemotePerspective, check_type: CheckType, check_request: CheckRequest
+    ) -> CheckResponse:
+        """
+        Sends the check request and, if it is still outstanding after the configured percentile of the perspective's
+        recent latency, sends a duplicate (which gets its own connection) and returns whichever succeeds first.
+        Duplicates go to the same perspective: open_mpic_core attributes each response to the perspective it asked,
+        so substituting a different perspective would misreport the cohort.
+        """
+        if self.hedging_policy is None:
+            return await self.send_timed_check_request(perspective, check_type, check_request)
+
+        self.hedging_policy.record_call()
+        hedge_delay = self.perspective_latency_tracker.get_percentile(
+            perspective.code, check_type, self.hedging_policy.hedge_after_percentile
+        )
+        if hedge_delay is None:
+            return await self.send_timed_check_request(perspective, check_type, check_request)
+
+        primary = asyncio.create_task(self.send_timed_check_request(perspective, check_type, check_request))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+            if done or not self.hedging_policy.try_acquire_hedge():
+                return await primary
+
+            # noinspection PyUnresolvedReferences
+            logger.trace(
+                f"Hedging call to perspective {perspective.code} after {hedge_delay:.4f} seconds; "
+                f"trace ID: {check_request.trace_identifier}"
+            )
+            hedge = asyncio.create_task(self.send_timed_check_request(perspective, check_type, check_request))
+            outstanding = {primary, hedge}
+            while outstanding:
+                done, outstanding = await asyncio.wait(outstanding, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is hedge:
+                            self.hedging_policy.hedges_won += 1
+                        return attempt.result()
+            return await primary  # both attempts failed; surface the error of the original call
+        finally:
+            for attempt in (primary, hedge):
+                if attempt is not None and not attempt.done():
+                    attempt.cancel()
+
+    async def send_timed_check_request(
+        self, perspective: RemotePerspective, check_type: CheckType, check_request: CheckRequest
+    ) -> CheckResponse:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            check_response = await self.send_check_request(perspective, check_type, check_request)
+            outcome = "success"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            # timed out calls count at their elapsed time, so that adaptive timeouts grow back for a perspective
+            # that has slowed down instead of cutting off every call to it
+            self.perspective_latency_tracker.record(perspective.code, check_type, time.perf_counter() - start)
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"  # e.g. the losing attempt of a hedged call
+            raise
+        finally:
+            perspective_call_duration_seconds.labels(perspective.code, check_type, outcome).observe(
+                time.perf_counter() - start
+            )
+        self.perspective_latency_tracker.record(perspective.code, check_type, time.perf_counter() - start)
+        return check_response
+
+    async def send_check_request(
+        self, perspective: RemotePerspective, check_type: CheckType, check_request: CheckRequest
+    ) -> CheckResponse:
         # Get the remote info from the data structure.
-        endpoint_info: PerspectiveEndpointInfo = self.remotes_per_perspective_per_check_type[check_type][
-            perspective.code
-        ]
+        endpoint_info = self.get_endpoint_info(check_type, perspective.code)
+        if endpoint_info.is_local():
+            return await self.perform_local_check(check_type, check_request)
+
+        if self.perspective_transport == PERSPECTIVE_TRANSPORT_WEBSOCKET:
+            timeout_seconds = self.get_adaptive_timeout_seconds(perspective.code, check_type)
+            with self.track_replica_call(endpoint_info) as url:
+                check_channel = self.get_check_channel(perspective.code, check_type, url, endpoint_info.headers)
+                return await check_channel.send(
+                    self.encode_check_request(check_request),
+                    inject_trace_context({}),
+                    timeout_seconds if timeout_seconds is not None else check_channel.http_client.timeout.sock_read,
+                )
+
+        http_client = self.get_http_client(self.get_http_client_pool(perspective.code, check_type))
+
+        if self.perspective_request_batcher is not None:
+            return await self.perspective_request_batcher.submit(check_type, perspective.code, check_request)
+
+        with self.track_replica_call(endpoint_info) as url:
+            async with http_client.post(
+                url=url,
+                headers=inject_trace_context(MpicCoordinatorService.build_request_headers(endpoint_info)),
+                data=self.encode_check_request(check_request),
+                **self.get_request_options(perspective.code, check_type),
+            ) as response:
+                # validate the raw bytes directly; decoding to text first only adds charset detection and a copy
+                body = await response.read()
+                return self.check_response_adapter.validate_json(body)
+
+    def track_replica_call(self, endpoint_info: PerspectiveEndpointInfo) -> AbstractContextManager[str]:
+        """
+        :return: a context for one call to the endpoint, yielding the URL to call (chosen among the replicas, if any)
+        """
+        if not endpoint_info.replica_urls:
+            return nullcontext(endpoint_info.url)
+        urls = tuple(endpoint_info.get_urls())
+        replica_balancer = self._replica_balancers.get(urls)
+        if replica_balancer is None:
+            replica_balancer = PerspectiveReplicaBalancer(
+                list(urls),
+                self.replica_balancing,
+                self.replica_ejection_failure_threshold,
+                self.replica_ejection_seconds,
+            )
+            self._replica_balancers[urls] = replica_balancer
+        return replica_balancer.track_call()
+
+    def get_replica_balancer_stats(self) -> dict:
+        return {urls[0]: replica_balancer.get_stats() for urls, replica_balancer in self._replica_balancers.items()}
+
+    def get_check_channel(
+        self, perspective_code: str, check_type: CheckType, url: str, headers: dict[str, str] | None
+    ) -> PerspectiveCheckChannel:
+        """
+        :return: the check channel to the checker at the URL, shared by all calls using the same connection pool
+        """
+        pool = self.get_http_client_pool(perspective_code, check_type)
+        # the check channel of a checker lives under its single-check endpoint (e.g. /caa/ws)
+        channel_url = url.rstrip("/") + "/ws"
+        check_channel = self._check_channels.get((pool, channel_url))
+        if check_channel is None:
+            check_channel = PerspectiveCheckChannel(channel_url, headers, self.get_http_client(pool))
+            self._check_channels[(pool, channel_url)] = check_channel
+        return check_channel
 
-        async with self._async_http_client.post(
-            url=endpoint_info.url, headers=endpoint_info.headers, json=check_request.model_dump()
-        ) as response:
-            text = await response.text()
-            return self.check_response_adapter.validate_json(text)
+    def get_check_channel_stats(self) -> dict:
+        return {
+            channel_url: check_channel.get_stats() for (_, channel_url), check_channel in self._check_channels.items()
+        }
+
+    async def perform_local_check(self, check_type: CheckType, check_request: CheckRequest) -> CheckResponse:
+        """
+        Runs the check in this process, handing the request and response objects over as they are: no serialization,
+        HTTP parsing or loopback connection. The checks run from wherever the coordinator runs, so local endpoints
+        are only correct for a perspective in the coordinator's own region.
+        The checkers prepare the target of the request in place (e.g. dropping the "*." of a wildcard domain), so they
+        get a copy: the request is shared with the other perspectives of the cohort, which must still see the original.
+        """
+        check_request = check_request.model_copy(deep=True)
+        if check_type == CheckType.CAA:
+            if self._local_caa_checker is None:
+                self._local_caa_checker = MpicCaaChecker(
+                    self.local_checker_default_caa_domains,
+                    dns_timeout=self.local_checker_dns_timeout_seconds,
+                    dns_resolution_lifetime=self.local_checker_dns_resolution_lifetime_seconds,
+                )
+                self._local_caa_checker.resolver = TimedDnsResolver(self._local_caa_checker.resolver)
+            return await self._local_caa_checker.check_caa(check_request)
+
+        if self._local_dcv_checker is None:
+            self._local_dcv_checker = MpicDcvChecker(
+                http_client_timeout=self.local_checker_http_client_timeout_seconds,
+                verify_ssl=self.local_checker_verify_ssl,
+                dns_timeout=self.local_checker_dns_timeout_seconds,
+                dns_resolution_lifetime=self.local_checker_dns_resolution_lifetime_seconds,
+            )
+            self._local_dcv_checker.resolver = TimedDnsResolver(self._local_dcv_checker.resolver)
+        return await self._local_dcv_checker.check_dcv(check_request)
+
+    async def send_check_batch(
+        self, check_type: CheckType, perspective_code: str, checks: list[tuple[CheckRequest, dict[str, str]]]
+    ) -> list[CheckResponse | None]:
+        endpoint_info = self.get_endpoint_info(check_type, perspective_code)
+
+        # the batch endpoint of a checker lives under its single-check endpoint (e.g. /caa/batch); each check carries
+        # the trace context of its own MPIC request, so the batch call itself continues none of their traces
+        batch_body = (
+            b"["
+            + b",".join(
+                encode_check_batch_item(trace_context, self.encode_check_request(check_request))
+                for check_request, trace_context in checks
+            )
+            + b"]"
+        )
+        http_client = self.get_http_client(self.get_http_client_pool(perspective_code, check_type))
+        with self.track_replica_call(endpoint_info) as url:
+            async with http_client.post(
+                url=url.rstrip("/") + "/batch",
+                headers=MpicCoordinatorService.build_request_headers(endpoint_info),
+                data=batch_body,
+                **self.get_request_options(perspective_code, check_type),
+            ) as response:
+                body = await response.read()
+                return self.check_batch_response_adapter.validate_json(body)
+
+    def get_adaptive_timeout_seconds(self, perspective_code: str, check_type: CheckType) -> float | None:
+        """
+        :return: the timeout derived from recent latencies of the perspective for the check type (percentile times
+                 factor, clamped to the configured bounds), or None if adaptive timeouts are off or samples are too few
+        """
+        if self.adaptive_timeout_factor <= 0:
+            return None
+        latency_percentile = self.perspective_latency_tracker.get_percentile(
+            perspective_code, check_type, self.adaptive_timeout_percentile
+        )
+        if latency_percentile is None:
+            return None
+        return min(
+            max(latency_percentile * self.adaptive_timeout_factor, self.adaptive_timeout_min_seconds),
+            self.adaptive_timeout_max_seconds,
+        )
+
+    def get_request_options(self, perspective_code: str, check_type: CheckType) -> dict:
+        timeout_seconds = self.get_adaptive_timeout_seconds(perspective_code, check_type)
+        if timeout_seconds is None:
+            return {}  # use the session-wide timeouts
+        return {"timeout": aiohttp.ClientTimeout(total=None, sock_connect=timeout_seconds, sock_read=timeout_seconds)}
+
+    def get_adaptive_timeout_stats(self) -> dict:
+        adaptive_timeout_stats = {}
+        for perspective_code, check_type in self.perspective_latency_tracker.get_tracked_keys():
+            adaptive_timeout_stats.setdefault(perspective_code, {})[check_type] = self.get_adaptive_timeout_seconds(
+                perspective_code, check_type
+            )
+        return adaptive_timeout_stats
+
+    @staticmethod
+    def get_health_url(url: str) -> str:
+        # the health endpoint of a checker is a sibling of its check endpoint (e.g. /caa -> /healthz, / -> /healthz)
+        parent_path = URL(url).path.rstrip("/").rsplit("/", 1)[0]
+        return str(URL(url).with_path(parent_path + "/healthz"))
+
+    @staticmethod
+    def build_request_headers(endpoint_info: PerspectiveEndpointInfo) -> dict[str, str]:
+        if not endpoint_info.headers:
+            return CHECK_REQUEST_HEADERS
+        return {**CHECK_REQUEST_HEADERS, **endpoint_info.headers}
 
     async def perform_mpic(self, mpic_request: MpicRequest) -> MpicResponse:
-        return await self.mpic_coordinator.coordinate_mpic(mpic_request)
+        if not self.coalesce_identical_mpic_requests:
+            return await self.coordinate_mpic(mpic_request)
+
+        # requests identical except for their trace identifier share a single coordination (single-flight)
+        request_key = mpic_request.model_dump_json(exclude={"trace_identifier"})
+        coordination_task = self._in_flight_mpic_requests.get(request_key)
+        if coordination_task is None:
+            coordination_task = asyncio.create_task(self.coordinate_mpic(mpic_request))
+            self._in_flight_mpic_requests[request_key] = coordination_task
+            coordination_task.add_done_callback(lambda task: self._forget_in_flight_mpic_request(request_key, task))
+        else:
+            self.coalesced_mpic_request_count += 1
+            # noinspection PyUnresolvedReferences
+            logger.trace(
+                f"Coalescing MPIC request with trace ID {mpic_request.trace_identifier} onto in-flight request"
+            )
+
+        # shielded so that one caller going away does not cancel the coordination for the others
+        mpic_response = await asyncio.shield(coordination_task)
+        if mpic_response.trace_identifier != mpic_request.trace_identifier:
+            mpic_response = mpic_response.model_copy(update={"trace_identifier": mpic_request.trace_identifier})
+        return mpic_response
+
+    def validate_mpic_request(self, mpic_request: MpicRequest):
+        """
+        Raises the same exception MpicCoordinator.coordinate_mpic raises for a logically invalid request.
+        """
+        is_request_valid, validation_issues = MpicRequestValidator.is_request_valid(
+            mpic_request, self.target_perspectives
+        )
+        if not is_request_valid:
+            error = MpicRequestValidationException(MpicRequestValidationMessages.REQUEST_VALIDATION_FAILED.key)
+            error.add_note(json.dumps([vars(issue) for issue in validation_issues]))
+            raise error
+
+    async def stream_mpic(self, mpic_request: MpicRequest) -> AsyncIterator[PerspectiveResponse | MpicResponse]:
+        """
+        Coordinates the MPIC request, yielding each perspective response as it arrives and then the MPIC response.
+        Streamed requests are never coalesced, since the perspective responses of a shared coordination would reach
+        only the caller that started it.
+        """
+        perspective_responses = asyncio.Queue()
+        coordination_context = copy_context()
+        coordination_context.run(perspective_response_listener.set, perspective_responses)
+        coordination_task = asyncio.create_task(self.coordinate_mpic(mpic_request), context=coordination_context)
+        next_response = None
+        try:
+            while not coordination_task.done():
+                next_response = asyncio.ensure_future(perspective_responses.get())
+                await asyncio.wait({next_response, coordination_task}, return_when=asyncio.FIRST_COMPLETED)
+                if next_response.done():
+                    yield next_response.result()
+            while not perspective_responses.empty():
+                yield perspective_responses.get_nowait()
+            yield coordination_task.result()
+        finally:
+            # no-ops once completed; otherwise the client went away
+            if next_response is not None:
+                next_response.cancel()
+            coordination_task.cancel()
+
+    def parse_mpic_request(self, body: bytes) -> MpicRequest:
+        return validate_request_body(self.mpic_request_adapter, body)
+
+    def parse_mpic_batch(self, body: bytes) -> list[Any]:
+        try:
+            return self.mpic_batch_adapter.validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False), body=body)
+
+    async def perform_mpic_batch_item(
+        self, index: int, raw_mpic_request: Any, concurrency_limiter: asyncio.Semaphore
+    ) -> MpicBatchItemResult:
+        try:
+            mpic_request = self.mpic_request_adapter.validate_python(raw_mpic_request)
+        except ValidationError as e:
+            return MpicBatchItemResult(
+                index=index,
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error=MpicRequestValidationMessages.REQUEST_VALIDATION_FAILED.key,
+                validation_issues=jsonable_encoder(e.errors(include_url=False)),
+            )
+
+        try:
+            async with concurrency_limiter:
+                mpic_response = await self.perform_mpic(mpic_request)
+            return MpicBatchItemResult(index=index, status_code=status.HTTP_200_OK, response=mpic_response)
+        except MpicRequestValidationException as e:
+            return MpicBatchItemResult(
+                index=index,
+                status_code=status.HTTP_400_BAD_REQUEST,
+                error=MpicRequestValidationMessages.REQUEST_VALIDATION_FAILED.key,
+                validation_issues=json.loads(e.__notes__[0]),
+            )
+        except Exception as e:
+            logger.error(traceback.format_exc())
+            return MpicBatchItemResult(index=index, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, error=str(e))
+
+    def get_mpic_request_coalescing_stats(self) -> dict:
+        return {"in_flight": len(self._in_flight_mpic_requests), "coalesced": self.coalesced_mpic_request_count}
+
+    def _forget_in_flight_mpic_request(self, request_key: str, coordination_task: asyncio.Task):
+        if self._in_flight_mpic_requests.get(request_key) is coordination_task:
+            del self._in_flight_mpic_requests[request_key]
+        if not coordination_task.cancelled():
+            coordination_task.exception()  # mark as retrieved in case every waiting caller has gone away
 
 
 # Global instance for Service
@@ -181,15 +2257,61 @@ def get_service() -> MpicCoordinatorService:
 async def lifespan(app_instance: FastAPI):
     # Initialize services
     service = get_service()
+    span_exporter = create_span_exporter(service.tracing_exporter, service.tracing_file_path)
+    if span_exporter is not None:
+        configure_tracing("mpic-coordinator", span_exporter)
     await service.initialize()
+    await send_warm_up_requests(app_instance, WARM_UP_REQUESTS)
 
     yield
 
     # Cleanup
     await service.shutdown()
+    if span_exporter is not None:
+        shutdown_tracing()
+    mark_worker_stopped()
+
+
+class ExceptionHandlingMiddleware:
+    """
+    ASGI middleware catching exceptions that no exception handler dealt with and answering 500 with the error message.
+    Pure ASGI rather than @app.middleware("http"), which would run every request through an extra task and response
+    stream. Once a response has started (e.g. a stream failing midway) a 500 can no longer be sent, so the exception
+    is passed on for the server to close the connection.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception as e:
+            if response_started:
+                raise
+            logger.error(traceback.format_exc())
+            response = JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"error": str(e)})
+            await response(scope, receive, send)
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(AdmissionControlMiddleware, get_admission_controller=lambda: get_service().admission_controller)
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(ExceptionHandlingMiddleware)  # outermost, as the decorator it replaces was
+document_request_bodies(app, {"/mpic": MpicRequest})
 
 
 # noinspection PyUnusedLocal
@@ -201,6 +2323,16 @@ async def validation_exception_handler(request: Request, e: RequestValidationErr
     )
 
 
+# noinspection PyUnusedLocal
+@app.exception_handler(MpicJobQueueFullException)
+async def mpic_job_queue_full_exception_handler(request: Request, e: MpicJobQueueFullException):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"error": "job-queue-full"},
+        headers={"Retry-After": str(get_service().mpic_job_retry_after_seconds)},
+    )
+
+
 # noinspection PyUnusedLocal
 @app.exception_handler(MpicRequestValidationException)
 async def mpic_validation_exception_handler(request: Request, e: MpicRequestValidationException):
@@ -213,20 +2345,123 @@ async def mpic_validation_exception_handler(request: Request, e: MpicRequestVali
     )
 
 
-@app.middleware("http")  # This is a middleware that catches general exceptions and returns a 500 response
-async def exception_handling_middleware(request: Request, call_next):
+@app.post("/mpic")
+async def handle_mpic(request: Request):
+    # the stages are run (and timed) here rather than by FastAPI, which would parse the body into an MpicRequest and
+    # serialize the response through jsonable_encoder before and after this function
+    service = get_service()
+    with time_request_stage("body_read"):
+        body = await request.body()
+    with time_request_stage("validation"):
+        mpic_request = service.parse_mpic_request(body)
+    with get_tracer().start_as_current_span(
+        "mpic",
+        attributes={
+            TRACE_IDENTIFIER_ATTRIBUTE: mpic_request.trace_identifier or "",
+            "mpic.check_type": mpic_request.check_type,
+        },
+    ):
+        # noinspection PyUnresolvedReferences
+        async with logger.trace_timing("MPIC request processing"):
+            with time_request_stage("coordination"):
+                mpic_response = await service.perform_mpic(mpic_request)
+    with time_request_stage("serialization"):
+        content = service.mpic_response_adapter.dump_json(mpic_response)
+    return Response(content=content, media_type="application/json")
+
+
+@app.post("/mpic/batch")
+async def handle_mpic_batch(request: Request):
+    service = get_service()
+    raw_mpic_requests = service.parse_mpic_batch(await request.body())
+    concurrency_limiter = asyncio.Semaphore(service.mpic_batch_max_concurrency)
+    batch_item_tasks = [
+        asyncio.create_task(service.perform_mpic_batch_item(index, raw_mpic_request, concurrency_limiter))
+        for index, raw_mpic_request in enumerate(raw_mpic_requests)
+    ]
+
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(stream_mpic_batch_results(batch_item_tasks), media_type="application/x-ndjson")
+
+    # noinspection PyUnresolvedReferences
+    async with logger.trace_timing(f"MPIC batch processing ({len(batch_item_tasks)} requests)"):
+        try:
+            batch_item_results = await asyncio.gather(*batch_item_tasks)
+        finally:
+            for task in batch_item_tasks:
+                task.cancel()
+    return Response(
+        content=service.mpic_batch_result_adapter.dump_json(batch_item_results, exclude_none=True),
+        media_type="application/json",
+    )
+
+
+async def stream_mpic_batch_results(batch_item_tasks: list[asyncio.Task]):
+    """
+    Yields batch item results as NDJSON lines in completion order (each result carries its index in the batch).
+    """
+    try:
+        for next_completed in asyncio.as_completed(batch_item_tasks):
+            batch_item_result = await next_completed
+            yield get_service().mpic_batch_item_result_adapter.dump_json(batch_item_result, exclude_none=True) + b"\n"
+    finally:
+        for task in batch_item_tasks:  # client went away or the stream completed; nothing left should keep running
+            task.cancel()
+
+
+@app.post("/mpic/stream")
+async def handle_mpic_stream(request: MpicRequest, http_request: Request):
+    service = get_service()
+    service.validate_mpic_request(request)  # fail with 400 before the stream starts
+    if "application/x-ndjson" in http_request.headers.get("accept", ""):
+        return StreamingResponse(stream_mpic_events(request, as_ndjson=True), media_type="application/x-ndjson")
+    return StreamingResponse(stream_mpic_events(request, as_ndjson=False), media_type="text/event-stream")
+
+
+async def stream_mpic_events(mpic_request: MpicRequest, as_ndjson: bool):
+    """
+    Yields a "perspective" event per perspective response and a final "result" event with the MPIC response, as
+    server-sent events or NDJSON lines ({"event": ..., "data": ...}). An unexpected failure ends the stream with an
+    "error" event carrying the body /mpic would have returned.
+    """
+    service = get_service()
+
+    def encode_event(event: str, data: bytes) -> bytes:
+        if as_ndjson:
+            return b'{"event":"' + event.encode() + b'","data":' + data + b"}\n"
+        return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
     try:
-        return await call_next(request)
+        async for streamed_response in service.stream_mpic(mpic_request):
+            if isinstance(streamed_response, PerspectiveResponse):
+                yield encode_event("perspective", streamed_response.model_dump_json().encode())
+            else:
+                yield encode_event("result", service.mpic_response_adapter.dump_json(streamed_response))
     except Exception as e:
         logger.error(traceback.format_exc())
-        return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"error": str(e)})
+        yield encode_event("error", json.dumps({"error": str(e)}).encode())
 
 
-@app.post("/mpic")
-async def handle_mpic(request: MpicRequest):
-    # noinspection PyUnresolvedReferences
-    async with logger.trace_timing("MPIC request processing"):
-        return await get_service().perform_mpic(request)
+@app.post("/mpic/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def handle_mpic_job_submission(request: MpicRequest):
+    service = get_service()
+    service.validate_mpic_request(request)  # reject invalid requests up front rather than in the job result
+    job = service.mpic_job_queue.submit(request)
+    return Response(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=service.mpic_job_adapter.dump_json(job, exclude_none=True),
+        media_type="application/json",
+        headers={"Location": f"/mpic/jobs/{job.job_id}"},
+    )
+
+
+@app.get("/mpic/jobs/{job_id}")
+async def handle_mpic_job_status(job_id: str):
+    service = get_service()
+    job = service.mpic_job_queue.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"error": "job-not-found"})
+    return Response(content=service.mpic_job_adapter.dump_json(job, exclude_none=True), media_type="application/json")
 
 
 @app.get("/healthz")
@@ -234,29 +2469,96 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return build_metrics_response()
+
+
+@app.get("/statsz")
+async def get_stats():
+    service = get_service()
+    return {
+        "check_response_cache": service.check_response_cache.get_stats() if service.check_response_cache else None,
+        "mpic_request_coalescing": service.get_mpic_request_coalescing_stats(),
+        "perspective_configuration": service.get_perspective_configuration_stats(),
+        "mpic_jobs": service.mpic_job_queue.get_stats(),
+        "admission_control": service.admission_controller.get_stats() if service.admission_controller else None,
+        "check_channels": (
+            service.get_check_channel_stats()
+            if service.perspective_transport == PERSPECTIVE_TRANSPORT_WEBSOCKET
+            else None
+        ),
+        "connection_warming": (
+            service.get_connection_warming_stats() if service.http_client_warm_connections_per_endpoint > 0 else None
+        ),
+        "early_quorum": (service.mpic_coordinator.get_early_quorum_stats() if service.early_quorum_return else None),
+        "hedging": service.hedging_policy.get_stats() if service.hedging_policy else None,
+        "circuit_breakers": service.get_circuit_breaker_stats(),
+        "replicas": service.get_replica_balancer_stats(),
+        "adaptive_timeout_seconds": (
+            service.get_adaptive_timeout_stats() if service.adaptive_timeout_factor > 0 else None
+        ),
+        "perspective_request_batching": (
+            service.perspective_request_batcher.get_stats() if service.perspective_request_batcher else None
+        ),
+    }
+
+
 @app.get("/configz")
 async def get_config():
-    current = Path(__file__).parent
-    for _ in range(3):  # Try up to 3 levels up (Docker flattens the file structure a fair bit)
-        path_to_project_config = current / "pyproject.toml"
-        if path_to_project_config.exists():
-            with path_to_project_config.open(mode="rb") as file:
-                pyproject = tomllib.load(file)
-                uvicorn_server_timeout_keep_alive = (
-                    int(os.environ["uvicorn_server_timeout_keep_alive"])
-                    if "uvicorn_server_timeout_keep_alive" in os.environ
-                    else None
-                )
-                return {
-                    "open_mpic_api_spec_version": pyproject["tool"]["api"]["spec_version"],
-                    "app_version": pyproject["project"]["version"],
-                    "mpic_core_version": importlib.metadata.version("open-mpic-core"),
-                    "absolute_max_attempts": get_service().global_max_attempts,
-                    "default_perspective_count": get_service().default_perspective_count,
-                    "http_client_timeout_seconds": get_service().http_client_timeout_seconds,
-                    "http_client_keepalive_timeout_seconds": get_service().http_client_keepalive_timeout_seconds,
-                    "log_level": logger.getEffectiveLevel(),
-                    "uvicorn_server_timeout_keep_alive": uvicorn_server_timeout_keep_alive,
-                }
-        current = current.parent
-    raise FileNotFoundError("Could not find pyproject.toml")
+    uvicorn_server_timeout_keep_alive = (
+        int(os.environ["uvicorn_server_timeout_keep_alive"])
+        if "uvicorn_server_timeout_keep_alive" in os.environ
+        else None
+    )
+    return {
+        **get_project_versions(Path(__file__).parent),
+        "absolute_max_attempts": get_service().global_max_attempts,
+        "default_perspective_count": get_service().default_perspective_count,
+        "http_client_timeout_seconds": get_service().http_client_timeout_seconds,
+        "http_client_keepalive_timeout_seconds": get_service().http_client_keepalive_timeout_seconds,
+        "perspective_transport": get_service().perspective_transport,
+        "replica_balancing": get_service().replica_balancing,
+        "replica_ejection_failure_threshold": get_service().replica_ejection_failure_threshold,
+        "replica_ejection_seconds": get_service().replica_ejection_seconds,
+        "http_client_pool_mode": get_service().http_client_pool_mode,
+        "http_client_limit_per_host": get_service().http_client_limit_per_host,
+        "http_client_dns_cache_ttl_seconds": get_service().http_client_dns_cache_ttl_seconds,
+        "http_client_pool_settings": {
+            pool: pool_settings.model_dump(exclude_none=True)
+            for pool, pool_settings in get_service().http_client_pool_settings.items()
+        },
+        "local_checker_default_caa_domains": get_service().local_checker_default_caa_domains,
+        "local_checker_dns_timeout_seconds": get_service().local_checker_dns_timeout_seconds,
+        "local_checker_dns_resolution_lifetime_seconds": (get_service().local_checker_dns_resolution_lifetime_seconds),
+        "local_checker_http_client_timeout_seconds": get_service().local_checker_http_client_timeout_seconds,
+        "local_checker_verify_ssl": get_service().local_checker_verify_ssl,
+        "http_client_warm_connections_per_endpoint": (get_service().http_client_warm_connections_per_endpoint),
+        "check_response_cache_ttl_seconds": get_service().check_response_cache_ttl_seconds,
+        "check_response_cache_max_entries": get_service().check_response_cache_max_entries,
+        "coalesce_identical_mpic_requests": get_service().coalesce_identical_mpic_requests,
+        "early_quorum_return": get_service().early_quorum_return,
+        "perspective_config_reload_interval_seconds": (get_service().perspective_config_reload_interval_seconds),
+        "adaptive_timeout_factor": get_service().adaptive_timeout_factor,
+        "adaptive_timeout_percentile": get_service().adaptive_timeout_percentile,
+        "adaptive_timeout_min_seconds": get_service().adaptive_timeout_min_seconds,
+        "adaptive_timeout_max_seconds": get_service().adaptive_timeout_max_seconds,
+        "hedge_after_percentile": get_service().hedge_after_percentile,
+        "hedge_budget_percent": get_service().hedge_budget_percent,
+        "circuit_breaker_failure_threshold": get_service().circuit_breaker_failure_threshold,
+        "circuit_breaker_open_seconds": get_service().circuit_breaker_open_seconds,
+        "perspective_batching_window_ms": get_service().perspective_batching_window_ms,
+        "perspective_batch_max_size": get_service().perspective_batch_max_size,
+        "mpic_batch_max_size": get_service().mpic_batch_max_size,
+        "mpic_batch_max_concurrency": get_service().mpic_batch_max_concurrency,
+        "mpic_job_queue_depth": get_service().mpic_job_queue_depth,
+        "mpic_job_workers": get_service().mpic_job_workers,
+        "mpic_job_result_ttl_seconds": get_service().mpic_job_result_ttl_seconds,
+        "mpic_job_retry_after_seconds": get_service().mpic_job_retry_after_seconds,
+        "mpic_job_state_dir": get_service().mpic_job_state_dir,
+        **get_admission_settings(),
+        "tracing_exporter": get_service().tracing_exporter,
+        "tracing_file_path": get_service().tracing_file_path,
+        "log_level": logger.getEffectiveLevel(),
+        "uvicorn_server_timeout_keep_alive": uvicorn_server_timeout_keep_alive,
+    }
@@ -1,19 +1,45 @@
 import os
-import tomllib
-import importlib.metadata
+import asyncio
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 from pathlib import Path
 from dotenv import load_dotenv
-from fastapi import FastAPI, status
-from fastapi.responses import JSONResponse
-from open_mpic_core import DcvCheckRequest
+from fastapi import FastAPI, Request, Response, WebSocket, status
+from opentelemetry.trace import SpanKind
+from pydantic import TypeAdapter
+from open_mpic_core import DcvCheckRequest, DcvCheckResponse
 from open_mpic_core import MpicDcvChecker
 from open_mpic_core import get_logger
+from mpic_service_common.check_batch import CheckBatchItem, get_check_batch_type
+from mpic_service_common.check_channel import CheckChannelRequest, serve_check_channel
+from mpic_service_common.admission import AdmissionController, AdmissionControlMiddleware, get_admission_settings
+from mpic_service_common.metrics import RequestMetricsMiddleware, EventLoopLagMonitor, TimedDnsResolver
+from mpic_service_common.metrics import build_metrics_response, mark_worker_stopped
+from mpic_service_common.tracing import TRACE_IDENTIFIER_ATTRIBUTE, TracingMiddleware, get_tracer
+from mpic_service_common.tracing import configure_tracing, create_span_exporter, shutdown_tracing, use_trace_context
+from mpic_service_common.request_body import document_request_bodies, validate_request_body
+from mpic_service_common.warm_up import send_warm_up_requests
+from mpic_service_common.project_info import get_project_versions
 
 # 'config' directory should be a sibling of the directory containing this file
 config_path = Path(__file__).parent / "config" / "app.conf"
 logger = get_logger(__name__)
+WARM_UP_REQUESTS = [("GET", "/healthz", b""), ("POST", "/dcv", b'{"check_type":"dcv"}')]
+
+
+class InstrumentedMpicDcvChecker(MpicDcvChecker):
+    """
+    MpicDcvChecker recording the HTTP lookup of HTTP based validations as a span (DNS lookups are traced by the
+    resolver wrapper).
+    """
+
+    async def perform_http_based_validation(self, request: DcvCheckRequest) -> DcvCheckResponse:
+        with get_tracer().start_as_current_span(
+            "dcv.http_lookup",
+            kind=SpanKind.CLIENT,
+            attributes={TRACE_IDENTIFIER_ATTRIBUTE: request.trace_identifier or ""},
+        ):
+            return await super().perform_http_based_validation(request)
 
 
 class MpicDcvCheckerService:
@@ -33,17 +59,65 @@ class MpicDcvCheckerService:
             if "dns_resolution_lifetime_seconds" in os.environ
             else None
         )
+        self.tracing_exporter = os.environ["tracing_exporter"] if "tracing_exporter" in os.environ else None
+        self.tracing_file_path = os.environ["tracing_file_path"] if "tracing_file_path" in os.environ else None
+        self.admission_controller = AdmissionController.from_environment()
 
-        self.dcv_checker = MpicDcvChecker(
+        self.dcv_checker = InstrumentedMpicDcvChecker(
             http_client_timeout=self.http_client_timeout_seconds,
             verify_ssl=self.verify_ssl,
             dns_timeout=self.dns_timeout_seconds,
             dns_resolution_lifetime=self.dns_resolution_lifetime_seconds,
         )
 
+        self.dcv_checker.resolver = TimedDnsResolver(self.dcv_checker.resolver)
+        self.event_loop_lag_monitor = EventLoopLagMonitor()
+
+        # requests and responses are (de)serialized straight from/to JSON bytes, skipping intermediate dicts
+        self.dcv_check_request_adapter = TypeAdapter(DcvCheckRequest)
+        self.dcv_check_response_adapter = TypeAdapter(DcvCheckResponse)
+        self.dcv_check_batch_adapter = TypeAdapter(get_check_batch_type(DcvCheckRequest))
+        self.dcv_check_batch_response_adapter = TypeAdapter(list[DcvCheckResponse | None])
+        self.dcv_check_channel_request_adapter = TypeAdapter(CheckChannelRequest[DcvCheckRequest])
+
+    def parse_dcv_check_request(self, body: bytes) -> DcvCheckRequest:
+        return validate_request_body(self.dcv_check_request_adapter, body)
+
+    def parse_dcv_check_batch(self, body: bytes) -> list[CheckBatchItem[DcvCheckRequest]]:
+        return validate_request_body(self.dcv_check_batch_adapter, body)
+
     async def check_dcv(self, dcv_request: DcvCheckRequest):
-        result = await self.dcv_checker.check_dcv(dcv_request)
-        return result
+        with get_tracer().start_as_current_span(
+            "dcv.check",
+            attributes={
+                TRACE_IDENTIFIER_ATTRIBUTE: dcv_request.trace_identifier or "",
+                "mpic.validation_method": dcv_request.dcv_check_parameters.validation_method,
+            },
+        ):
+            result = await self.dcv_checker.check_dcv(dcv_request)
+            return result
+
+    async def check_dcv_batch(
+        self, check_batch_items: list[CheckBatchItem[DcvCheckRequest]]
+    ) -> list[DcvCheckResponse | None]:
+        """
+        Runs the checks of a batch concurrently, each in the trace of the MPIC request it belongs to. A check that
+        raises, or that admission control rejects, is logged and reported as None, leaving the rest of the batch intact.
+        """
+        results = await asyncio.gather(
+            *[self.check_dcv_batch_item(item) for item in check_batch_items], return_exceptions=True
+        )
+        for item, result in zip(check_batch_items, results):
+            if isinstance(result, Exception):
+                logger.error(f"DCV check in batch failed: {result}; trace ID: {item.request.trace_identifier}")
+        return [None if isinstance(result, Exception) else result for result in results]
+
+    async def check_dcv_batch_item(self, check_batch_item: CheckBatchItem[DcvCheckRequest]) -> DcvCheckResponse:
+        # admitted on its own, as the checks of a batch run concurrently (see ADMISSION_PER_CHECK_PATHS)
+        admission = self.admission_controller.slot() if self.admission_controller is not None else nullcontext()
+        with use_trace_context(check_batch_item.trace_context):
+            async with admission:
+                return await self.check_dcv(check_batch_item.request)
 
 
 # Global instance for Service
@@ -60,26 +134,84 @@ def get_service() -> MpicDcvCheckerService:
     return _service
 
 
-app = FastAPI()
+# noinspection PyUnusedLocal
+@asynccontextmanager
+async def lifespan(app_instance: FastAPI):
+    service = get_service()
+    span_exporter = create_span_exporter(service.tracing_exporter, service.tracing_file_path)
+    if span_exporter is not None:
+        configure_tracing("mpic-dcv-checker", span_exporter)
+    service.event_loop_lag_monitor.start()
+    await send_warm_up_requests(app_instance, WARM_UP_REQUESTS)
+
+    yield
+
+    await service.event_loop_lag_monitor.stop()
+    if span_exporter is not None:
+        shutdown_tracing()
+    mark_worker_stopped()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(AdmissionControlMiddleware, get_admission_controller=lambda: get_service().admission_controller)
+app.add_middleware(RequestMetricsMiddleware)
+document_request_bodies(app, {"/dcv": DcvCheckRequest, "/dcv/batch": get_check_batch_type(DcvCheckRequest)})
+
+
+def get_dcv_check_status_code(result: DcvCheckResponse) -> int:
+    # Check if there are errors and return appropriate status code
+    status_code = status.HTTP_200_OK
+    if result.errors is not None and len(result.errors) > 0:
+        if result.errors[0].error_type == "404":
+            status_code = status.HTTP_404_NOT_FOUND
+        else:
+            status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    return status_code
 
 
 # noinspection PyUnresolvedReferences
 @app.post("/dcv")
-async def perform_mpic(request: DcvCheckRequest):
+async def perform_mpic(request: Request):
+    service = get_service()
+    dcv_check_request = service.parse_dcv_check_request(await request.body())
     async with logger.trace_timing("Remote DCV check processing"):
-        result = await get_service().check_dcv(request)
+        result = await service.check_dcv(dcv_check_request)
         logger.trace(f"DCV check result: {result}")
 
-        # Check if there are errors and return appropriate status code
-        if result.errors is not None and len(result.errors) > 0:
-            if result.errors[0].error_type == "404":
-                status_code = status.HTTP_404_NOT_FOUND
-            else:
-                status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        return Response(
+            status_code=get_dcv_check_status_code(result),
+            content=service.dcv_check_response_adapter.dump_json(result),
+            media_type="application/json",
+        )
 
-            return JSONResponse(status_code=status_code, content=result.model_dump())
 
-        return result
+# noinspection PyUnresolvedReferences
+@app.post("/dcv/batch")
+async def handle_dcv_check_batch(request: Request):
+    service = get_service()
+    check_batch_items = service.parse_dcv_check_batch(await request.body())
+    async with logger.trace_timing(f"Remote DCV check batch processing ({len(check_batch_items)} checks)"):
+        results = await service.check_dcv_batch(check_batch_items)
+        return Response(
+            content=service.dcv_check_batch_response_adapter.dump_json(results), media_type="application/json"
+        )
+
+
+@app.websocket("/dcv/ws")
+async def handle_dcv_check_channel(websocket: WebSocket):
+    """
+    Check channel: many concurrent DCV checks over one WebSocket, answered out of order (see check_channel.py).
+    """
+    service = get_service()
+    await serve_check_channel(
+        websocket,
+        service.dcv_check_channel_request_adapter,
+        service.check_dcv,
+        service.dcv_check_response_adapter,
+        service.admission_controller,
+        get_dcv_check_status_code,
+    )
 
 
 @app.get("/healthz")
@@ -87,29 +219,27 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return build_metrics_response()
+
+
 @app.get("/configz")
 async def get_config():
-    current = Path(__file__).parent
-    for _ in range(3):  # Try up to 3 levels up (Docker flattens the file structure a fair bit)
-        path_to_project_config = current / "pyproject.toml"
-        if path_to_project_config.exists():
-            with path_to_project_config.open(mode="rb") as file:
-                pyproject = tomllib.load(file)
-                uvicorn_server_timeout_keep_alive = (
-                    int(os.environ["uvicorn_server_timeout_keep_alive"])
-                    if "uvicorn_server_timeout_keep_alive" in os.environ
-                    else None
-                )
-                return {
-                    "open_mpic_api_spec_version": pyproject["tool"]["api"]["spec_version"],
-                    "app_version": pyproject["project"]["version"],
-                    "mpic_core_version": importlib.metadata.version("open-mpic-core"),
-                    "verify_ssl": get_service().verify_ssl,
-                    "http_client_timeout_seconds": get_service().http_client_timeout_seconds,
-                    "log_level": logger.getEffectiveLevel(),
-                    "uvicorn_server_timeout_keep_alive": uvicorn_server_timeout_keep_alive,
-                    "dns_timeout_seconds": get_service().dns_timeout_seconds,
-                    "dns_resolution_lifetime_seconds": get_service().dns_resolution_lifetime_seconds,
-                }
-        current = current.parent
-    raise FileNotFoundError("Could not find pyproject.toml")
+    uvicorn_server_timeout_keep_alive = (
+        int(os.environ["uvicorn_server_timeout_keep_alive"])
+        if "uvicorn_server_timeout_keep_alive" in os.environ
+        else None
+    )
+    return {
+        **get_project_versions(Path(__file__).parent),
+        "verify_ssl": get_service().verify_ssl,
+        "http_client_timeout_seconds": get_service().http_client_timeout_seconds,
+        "log_level": logger.getEffectiveLevel(),
+        "uvicorn_server_timeout_keep_alive": uvicorn_server_timeout_keep_alive,
+        "dns_timeout_seconds": get_service().dns_timeout_seconds,
+        "dns_resolution_lifetime_seconds": get_service().dns_resolution_lifetime_seconds,
+        **get_admission_settings(),
+        "tracing_exporter": get_service().tracing_exporter,
+        "tracing_file_path": get_service().tracing_file_path,
+    }
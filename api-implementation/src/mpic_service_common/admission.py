@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import asyncio
+
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from mpic_service_common.metrics import admission_requests_in_flight, admission_requests_queued
+from mpic_service_common.metrics import admission_queue_wait_seconds, admission_rejections_total
+
+# operational endpoints stay reachable however loaded the service is
+ADMISSION_EXEMPT_PATHS = frozenset({"/healthz", "/metrics", "/statsz", "/configz"})
+# check batches run their checks concurrently, so the checker services admit each check of a batch on its own
+ADMISSION_PER_CHECK_PATHS = frozenset({"/caa/batch", "/dcv/batch"})
+
+
+def get_admission_settings() -> dict[str, int | float]:
+    """
+    The admission_* settings of the service (see README), read from the environment, with their defaults.
+    """
+    return {
+        "admission_max_concurrent_requests": (
+            int(os.environ["admission_max_concurrent_requests"])
+            if "admission_max_concurrent_requests" in os.environ
+            else 0
+        ),
+        "admission_max_queue_length": (
+            int(os.environ["admission_max_queue_length"]) if "admission_max_queue_length" in os.environ else 100
+        ),
+        "admission_max_queue_wait_seconds": (
+            float(os.environ["admission_max_queue_wait_seconds"])
+            if "admission_max_queue_wait_seconds" in os.environ
+            else 1
+        ),
+        "admission_retry_after_seconds": (
+            int(os.environ["admission_retry_after_seconds"]) if "admission_retry_after_seconds" in os.environ else 1
+        ),
+    }
+
+
+class AdmissionRejectedException(Exception):
+    def __init__(self, status_code: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        # what the client is told
+        self.error = "too-many-requests" if status_code == 429 else "service-overloaded"
+
+
+class AdmissionController:
+    """
+    Caps the number of requests handled concurrently. Requests beyond the cap wait in a FIFO queue, which is itself
+    bounded in length (excess requests are rejected at once with 429) and in wait time (requests not admitted in time
+    are rejected with 503). Rejecting a few requests early keeps latency bounded for the admitted ones, where accepting
+    everything would slow every request down until all of them time out.
+    """
+
+    QUEUE_FULL = "queue_full"
+    QUEUE_TIMEOUT = "queue_timeout"
+
+    def __init__(
+        self, max_concurrency: int, max_queue_length: int, max_queue_wait_seconds: float, retry_after_seconds: int
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue_length = max_queue_length
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_queue_timeout = 0
+
+    @classmethod
+    def from_environment(cls) -> "AdmissionController | None":
+        """
+        :return: the controller configured by the admission_* settings, or None if admission control is off (a limit
+                 of 0 concurrent requests, the default)
+        """
+        settings = get_admission_settings()
+        if settings["admission_max_concurrent_requests"] <= 0:
+            return None
+        return cls(
+            settings["admission_max_concurrent_requests"],
+            settings["admission_max_queue_length"],
+            settings["admission_max_queue_wait_seconds"],
+            settings["admission_retry_after_seconds"],
+        )
+
+    async def acquire(self):
+        """
+        Waits for a slot; every successful acquire() must be paired with a release().
+        :raises AdmissionRejectedException: if the queue is full or no slot frees up within the maximum queue wait
+        """
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self._admit()
+            return
+        if len(self._waiters) >= self.max_queue_length:
+            self.rejected_queue_full += 1
+            admission_rejections_total.labels(AdmissionController.QUEUE_FULL).inc()
+            raise AdmissionRejectedException(429, AdmissionController.QUEUE_FULL)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        admission_requests_queued.inc()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait({waiter}, timeout=self.max_queue_wait_seconds)
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release()  # a slot was handed over just as the caller went away; pass it on
+            raise
+        finally:
+            admission_requests_queued.dec()
+            admission_queue_wait_seconds.observe(time.perf_counter() - start)
+            if not waiter.done():  # timed out or the caller went away
+                waiter.cancel()
+                self._waiters.remove(waiter)
+
+        if waiter.cancelled():
+            self.rejected_queue_timeout += 1
+            admission_rejections_total.labels(AdmissionController.QUEUE_TIMEOUT).inc()
+            raise AdmissionRejectedException(503, AdmissionController.QUEUE_TIMEOUT)
+        self.admitted += 1  # the slot was handed over by release(), so in_flight already counts it
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Holds a slot for the duration of the block.
+        :raises AdmissionRejectedException: as acquire()
+        """
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # hand the slot over directly, keeping FIFO order
+                return
+        self.in_flight -= 1
+        admission_requests_in_flight.dec()
+
+    def _admit(self):
+        self.in_flight += 1
+        self.admitted += 1
+        admission_requests_in_flight.inc()
+
+    def get_stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue_length": self.max_queue_length,
+            "max_queue_wait_seconds": self.max_queue_wait_seconds,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_queue_timeout": self.rejected_queue_timeout,
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware passing HTTP requests through the admission controller of the service, answering rejected ones
+    with 429 or 503 and a Retry-After header.
+    """
+
+    def __init__(self, app, get_admission_controller: Callable[[], AdmissionController | None]):
+        """
+        :param get_admission_controller: returns the service's admission controller, or None if admission control is off
+        """
+        self.app = app
+        self.get_admission_controller = get_admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"] in ADMISSION_EXEMPT_PATHS
+            or scope["path"] in ADMISSION_PER_CHECK_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+        admission_controller = self.get_admission_controller()
+        if admission_controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await admission_controller.acquire()
+        except AdmissionRejectedException as e:
+            body = json.dumps({"error": e.error}).encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": e.status_code,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", str(admission_controller.retry_after_seconds).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_controller.release()
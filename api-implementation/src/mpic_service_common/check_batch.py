@@ -0,0 +1,52 @@
+import json
+
+from typing import Annotated, Any, Generic, TypeVar, Union
+
+from pydantic import AfterValidator, BaseModel, Discriminator, Field, Tag
+
+# A check batch (POST /caa/batch, /dcv/batch) is a JSON array of checks. The coordinator gathers checks of several
+# MPIC requests into one batch, so it sends each as {"trace_context": {...}, "request": <check request>}, carrying the
+# trace of the MPIC request the check belongs to; a bare check request continues the trace of the batch call itself.
+
+# upper bound on the checks in a batch; larger batches are rejected with 422 (see perspective_batch_max_size)
+CHECK_BATCH_MAX_SIZE = 1000
+
+CheckRequestT = TypeVar("CheckRequestT")
+
+
+class CheckBatchItem(BaseModel, Generic[CheckRequestT]):
+    trace_context: dict[str, str] = {}
+    request: CheckRequestT
+
+
+def encode_check_batch_item(trace_context: dict[str, str], payload: bytes) -> bytes:
+    """
+    Wraps an already encoded check request in a batch item, without decoding and re-encoding it.
+    """
+    return b'{"trace_context":' + json.dumps(trace_context).encode() + b',"request":' + payload + b"}"
+
+
+def get_check_batch_item_kind(value: Any) -> str:
+    return "item" if isinstance(value, dict) and "request" in value else "request"
+
+
+def get_check_batch_type(check_request_type: type) -> Any:
+    """
+    :return: the type of a check batch of the check request type, validating every element to a CheckBatchItem
+    """
+    return Annotated[
+        list[
+            Annotated[
+                Union[
+                    Annotated[CheckBatchItem[check_request_type], Tag("item")],
+                    Annotated[
+                        check_request_type,
+                        AfterValidator(lambda check_request: CheckBatchItem[check_request_type](request=check_request)),
+                        Tag("request"),
+                    ],
+                ],
+                Discriminator(get_check_batch_item_kind),
+            ]
+        ],
+        Field(max_length=CHECK_BATCH_MAX_SIZE),
+    ]
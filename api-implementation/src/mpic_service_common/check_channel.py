@@ -0,0 +1,138 @@
+import json
+import time
+import asyncio
+
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from fastapi import WebSocket, WebSocketDisconnect
+from opentelemetry import context
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from open_mpic_core import get_logger
+from mpic_service_common.admission import AdmissionController, AdmissionRejectedException
+from mpic_service_common.metrics import http_request_duration_seconds, http_requests_in_flight
+from mpic_service_common.tracing import extract_trace_context
+
+# A check channel is a WebSocket between the coordinator and a checker carrying many concurrent checks.
+# The coordinator sends {"id": ..., "trace_context": {...}, "request": <check request>} frames; the checker answers
+# each with {"id": ..., "response": <check response>} or {"id": ..., "error": "..."} as soon as the check completes,
+# so responses arrive in any order and are matched to their requests by id.
+# Each check is admitted and recorded in the request metrics as an HTTP check request would be, with method WEBSOCKET
+# and the status code that request would have had.
+
+CHECK_CHANNEL_METHOD = "WEBSOCKET"
+
+logger = get_logger(__name__)
+
+CheckRequestT = TypeVar("CheckRequestT")
+CheckResponseT = TypeVar("CheckResponseT")
+
+
+class CheckChannelRequest(BaseModel, Generic[CheckRequestT]):
+    id: int
+    trace_context: dict[str, str] = {}
+    request: CheckRequestT
+
+
+class CheckChannelResponse(BaseModel, Generic[CheckResponseT]):
+    id: int | None
+    response: CheckResponseT | None = None
+    error: str | None = None
+
+
+def encode_check_channel_frame(frame_id: int | None, key: str, payload: bytes) -> bytes:
+    """
+    Wraps an already encoded JSON payload in a frame, without decoding and re-encoding it.
+    """
+    return b'{"id":' + json.dumps(frame_id).encode() + b',"' + key.encode() + b'":' + payload + b"}"
+
+
+async def serve_check_channel(
+    websocket: WebSocket,
+    check_channel_request_adapter: TypeAdapter,
+    perform_check: Callable[[object], Awaitable[object]],
+    check_response_adapter: TypeAdapter,
+    admission_controller: AdmissionController | None = None,
+    get_status_code: Callable[[object], int] | None = None,
+):
+    """
+    Runs the checks requested over the WebSocket concurrently, sending each response as soon as it is ready.
+    A frame that is not a valid check request is answered with an error frame; the channel stays open.
+    :param admission_controller: the service's admission controller, or None if admission control is off; a check it
+           rejects is answered with an error frame
+    :param get_status_code: returns the status code the HTTP check endpoint answers a check response with, or None if
+           it always answers 200
+    """
+    await websocket.accept()
+    route_path = websocket.scope["path"]
+    send_lock = asyncio.Lock()
+    check_tasks: set[asyncio.Task] = set()
+
+    async def send_frame(frame: bytes):
+        async with send_lock:
+            await websocket.send_bytes(frame)
+
+    async def perform_admitted_check(check_request):
+        if admission_controller is None:
+            return await perform_check(check_request)
+        async with admission_controller.slot():
+            return await perform_check(check_request)
+
+    async def handle_check(channel_request: CheckChannelRequest):
+        # the check spans join the trace of the coordinator's call, as they would over HTTP
+        token = context.attach(extract_trace_context(channel_request.trace_context))
+        status_code = 500  # reported if the check is cancelled
+        in_flight = http_requests_in_flight.labels(CHECK_CHANNEL_METHOD)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            check_response = await perform_admitted_check(channel_request.request)
+            status_code = 200 if get_status_code is None else get_status_code(check_response)
+            frame = encode_check_channel_frame(
+                channel_request.id, "response", check_response_adapter.dump_json(check_response)
+            )
+        except AdmissionRejectedException as e:
+            status_code = e.status_code
+            frame = encode_check_channel_frame(channel_request.id, "error", json.dumps(e.error).encode())
+        except Exception as e:
+            logger.error(f"Check on channel failed: {e}; trace ID: {channel_request.request.trace_identifier}")
+            frame = encode_check_channel_frame(channel_request.id, "error", json.dumps(str(e)).encode())
+        finally:
+            context.detach(token)
+            in_flight.dec()
+            http_request_duration_seconds.labels(CHECK_CHANNEL_METHOD, route_path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+        try:
+            await send_frame(frame)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # the coordinator went away; it fails its outstanding checks itself
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data = message["bytes"] if message.get("bytes") is not None else message["text"].encode()
+            try:
+                channel_request = check_channel_request_adapter.validate_json(data)
+            except ValidationError as e:
+                await send_frame(encode_check_channel_frame(get_frame_id(data), "error", json.dumps(str(e)).encode()))
+                continue
+            check_task = asyncio.create_task(handle_check(channel_request))
+            check_tasks.add(check_task)
+            check_task.add_done_callback(check_tasks.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for check_task in list(check_tasks):
+            check_task.cancel()
+
+
+def get_frame_id(data: bytes) -> int | None:
+    try:
+        frame_id = json.loads(data).get("id")
+        return frame_id if isinstance(frame_id, int) else None
+    except (ValueError, AttributeError):
+        return None
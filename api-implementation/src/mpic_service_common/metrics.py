@@ -0,0 +1,300 @@
+import os
+import time
+import asyncio
+import aiohttp
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client import generate_latest, multiprocess
+
+from mpic_service_common.tracing import get_tracer
+from mpic_service_common.warm_up import WARM_UP_SCOPE_KEY
+
+# Metrics shared by the coordinator and the checker services.
+# When run_uvicorn.py starts several workers it sets PROMETHEUS_MULTIPROC_DIR, in which case every worker writes its
+# samples to files in that directory and /metrics aggregates them, so a scrape of any worker covers all of them.
+
+REQUEST_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+EVENT_LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+# how often the event loop lag monitor wakes up
+EVENT_LOOP_LAG_INTERVAL_SECONDS = 0.5
+
+http_request_duration_seconds = Histogram(
+    "mpic_http_request_duration_seconds",
+    "Time spent handling HTTP requests, by route template and status code",
+    ["method", "route", "status_code"],
+    buckets=REQUEST_LATENCY_BUCKETS,
+)
+http_requests_in_flight = Gauge(
+    "mpic_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+http_request_stage_duration_seconds = Histogram(
+    "mpic_http_request_stage_duration_seconds",
+    "Time spent in each stage of handling HTTP requests (e.g. body_read, validation, coordination, serialization), "
+    "by route template and stage",
+    ["route", "stage"],
+    buckets=REQUEST_LATENCY_BUCKETS,
+)
+perspective_call_duration_seconds = Histogram(
+    "mpic_perspective_call_duration_seconds",
+    "Duration of coordinator calls to remote perspectives, by perspective, check type and outcome",
+    ["perspective", "check_type", "outcome"],
+    buckets=REQUEST_LATENCY_BUCKETS,
+)
+http_client_requests_in_flight = Gauge(
+    "mpic_http_client_requests_in_flight",
+    "Outgoing HTTP client requests currently holding a pooled connection or waiting for one, by connection pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+http_client_connections_total = Counter(
+    "mpic_http_client_connections",
+    "Connections handed out by HTTP client connection pools, by pool and whether they were newly created or reused",
+    ["pool", "kind"],
+)
+http_client_connection_queued_seconds = Histogram(
+    "mpic_http_client_connection_queued_seconds",
+    "Time outgoing requests waited for a free connection because the connection pool was at its limit",
+    ["pool"],
+    buckets=EVENT_LOOP_LAG_BUCKETS,
+)
+http_client_connection_acquire_seconds = Histogram(
+    "mpic_http_client_connection_acquire_seconds",
+    "Time from the start of an outgoing request until it held a connection: any wait for a free connection, plus "
+    "DNS resolution and TCP and TLS handshakes if a new connection had to be opened",
+    ["pool"],
+    buckets=EVENT_LOOP_LAG_BUCKETS,
+)
+dns_lookup_duration_seconds = Histogram(
+    "mpic_dns_lookup_duration_seconds",
+    "Duration of DNS lookups made by the checkers, by record type and outcome",
+    ["record_type", "outcome"],
+    buckets=REQUEST_LATENCY_BUCKETS,
+)
+event_loop_lag_seconds = Histogram(
+    "mpic_event_loop_lag_seconds",
+    "How late the event loop woke up a periodic timer, a measure of how long callbacks block the loop",
+    buckets=EVENT_LOOP_LAG_BUCKETS,
+)
+
+admission_requests_in_flight = Gauge(
+    "mpic_admission_requests_in_flight",
+    "Requests admitted by admission control and still being handled",
+    multiprocess_mode="livesum",
+)
+admission_requests_queued = Gauge(
+    "mpic_admission_requests_queued",
+    "Requests waiting for admission",
+    multiprocess_mode="livesum",
+)
+admission_queue_wait_seconds = Histogram(
+    "mpic_admission_queue_wait_seconds",
+    "Time requests waited for admission, whether they were admitted or not",
+    buckets=EVENT_LOOP_LAG_BUCKETS,
+)
+admission_rejections_total = Counter(
+    "mpic_admission_rejections",
+    "Requests rejected by admission control, by reason (queue_full answered with 429, queue_timeout with 503)",
+    ["reason"],
+)
+
+
+# durations in seconds of the stages of the HTTP request handled in the current context, by stage name
+request_stage_durations: ContextVar[dict[str, float] | None] = ContextVar("request_stage_durations", default=None)
+
+
+@contextmanager
+def time_request_stage(stage: str):
+    """
+    Times the enclosed code as a stage of the current request, reported by RequestMetricsMiddleware.
+    """
+    stage_durations = request_stage_durations.get()
+    if stage_durations is None:  # not within a request (e.g. called directly in a test)
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_durations[stage] = stage_durations.get(stage, 0.0) + time.perf_counter() - start
+
+
+def build_metrics_response() -> Response:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_stopped():
+    """
+    Drops the live gauges of this worker from the aggregate once it stops (multiprocess mode only).
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording latency and in-flight counts of HTTP requests.
+    Requests are labelled with their route template (e.g. /mpic) rather than the raw path, keeping cardinality bounded;
+    requests that match no route are labelled "unmatched".
+    Stages timed by the handler (see time_request_stage) are recorded too, and reported to the client in a
+    Server-Timing header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get(WARM_UP_SCOPE_KEY):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500  # reported if the app fails before sending a response
+        stage_durations = {}
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if stage_durations:  # stages timed after the response started (e.g. streaming) are only recorded
+                    server_timing = ", ".join(
+                        f"{stage};dur={duration * 1000:.3f}" for stage, duration in stage_durations.items()
+                    )
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", server_timing.encode())]
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method)
+        in_flight.inc()
+        stage_durations_token = request_stage_durations.set(stage_durations)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_stage_durations.reset(stage_durations_token)
+            in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            http_request_duration_seconds.labels(method, route_path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+            for stage, duration in stage_durations.items():
+                http_request_stage_duration_seconds.labels(route_path, stage).observe(duration)
+
+
+class TimedDnsResolver:
+    """
+    Wraps a dnspython async resolver, recording every lookup as a duration metric and a span; everything else is
+    delegated.
+    """
+
+    def __init__(self, resolver):
+        self._resolver = resolver
+
+    def __getattr__(self, name):
+        return getattr(self._resolver, name)
+
+    def __setattr__(self, name, value):
+        if name == "_resolver":
+            super().__setattr__(name, value)
+        else:
+            setattr(self._resolver, name, value)
+
+    async def resolve(self, *args, **kwargs):
+        rdtype = kwargs["rdtype"] if "rdtype" in kwargs else args[1] if len(args) > 1 else "A"
+        record_type = getattr(rdtype, "name", str(rdtype))
+        qname = kwargs["qname"] if "qname" in kwargs else args[0]
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            with get_tracer().start_as_current_span(
+                "dns.resolve", attributes={"dns.question.name": str(qname), "dns.question.type": record_type}
+            ):
+                answer = await self._resolver.resolve(*args, **kwargs)
+            outcome = "success"
+            return answer
+        finally:
+            dns_lookup_duration_seconds.labels(record_type, outcome).observe(time.perf_counter() - start)
+
+
+def create_http_client_trace_config(pool: str = "shared") -> aiohttp.TraceConfig:
+    """
+    :param pool: name of the connection pool (client session) the trace config is attached to, used as metric label
+    :return: aiohttp trace config reporting connection pool usage of the client session it is attached to
+    """
+    requests_in_flight = http_client_requests_in_flight.labels(pool)
+    connection_queued_seconds = http_client_connection_queued_seconds.labels(pool)
+    connection_acquire_seconds = http_client_connection_acquire_seconds.labels(pool)
+
+    # noinspection PyUnusedLocal
+    async def on_request_start(session, context, params):
+        context.started_at = time.perf_counter()
+        requests_in_flight.inc()
+
+    # noinspection PyUnusedLocal
+    async def on_request_done(session, context, params):
+        requests_in_flight.dec()
+
+    # noinspection PyUnusedLocal
+    async def on_connection_queued_start(session, context, params):
+        context.queued_at = time.perf_counter()
+
+    # noinspection PyUnusedLocal
+    async def on_connection_queued_end(session, context, params):
+        connection_queued_seconds.observe(time.perf_counter() - context.queued_at)
+
+    # noinspection PyUnusedLocal
+    async def on_connection_create_end(session, context, params):
+        http_client_connections_total.labels(pool, "created").inc()
+        connection_acquire_seconds.observe(time.perf_counter() - context.started_at)
+
+    # noinspection PyUnusedLocal
+    async def on_connection_reuseconn(session, context, params):
+        http_client_connections_total.labels(pool, "reused").inc()
+        connection_acquire_seconds.observe(time.perf_counter() - context.started_at)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_done)
+    trace_config.on_request_exception.append(on_request_done)
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(on_connection_queued_end)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace_config
+
+
+class EventLoopLagMonitor:
+    """
+    Periodically measures how much later than scheduled the event loop gets around to a sleeping task.
+    """
+
+    def __init__(self, interval_seconds: float = EVENT_LOOP_LAG_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            scheduled_at = time.perf_counter()
+            await asyncio.sleep(self.interval_seconds)
+            event_loop_lag_seconds.observe(max(time.perf_counter() - scheduled_at - self.interval_seconds, 0))
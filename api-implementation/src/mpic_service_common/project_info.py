@@ -0,0 +1,26 @@
+from pathlib import Path
+
+
+def get_project_versions(service_path: Path) -> dict[str, str]:
+    """
+    Versions reported by the /configz endpoint of each service, read from pyproject.toml.
+    :param service_path: directory of the service's main module; pyproject.toml is looked up from there
+    :raises FileNotFoundError: if pyproject.toml is not found
+    """
+    # imported here rather than at startup, since only /configz needs them
+    import tomllib
+    import importlib.metadata
+
+    current = service_path
+    for _ in range(3):  # Try up to 3 levels up (Docker flattens the file structure a fair bit)
+        path_to_project_config = current / "pyproject.toml"
+        if path_to_project_config.exists():
+            with path_to_project_config.open(mode="rb") as file:
+                pyproject = tomllib.load(file)
+            return {
+                "open_mpic_api_spec_version": pyproject["tool"]["api"]["spec_version"],
+                "app_version": pyproject["project"]["version"],
+                "mpic_core_version": importlib.metadata.version("open-mpic-core"),
+            }
+        current = current.parent
+    raise FileNotFoundError("Could not find pyproject.toml")
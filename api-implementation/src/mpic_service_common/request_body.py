@@ -0,0 +1,51 @@
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+# Routes on hot paths read their JSON body and validate it straight from bytes (TypeAdapter.validate_json) rather
+# than declaring a typed body parameter, which FastAPI would parse into a dict, validate and re-encode. The helpers
+# here keep what FastAPI would otherwise provide for such routes: validation errors located in the body, and the
+# request body in the OpenAPI schema.
+
+OPENAPI_SCHEMA_REF_TEMPLATE = "#/components/schemas/{model}"
+
+
+def validate_request_body(adapter: TypeAdapter, body: bytes) -> Any:
+    """
+    Validates the JSON body with the adapter. On failure, raises RequestValidationError with each issue located in
+    the body (e.g. ["body", "domain_or_ip_target"]), as FastAPI reports issues of typed body parameters.
+    """
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        validation_issues = [{**issue, "loc": ("body", *issue["loc"])} for issue in e.errors(include_url=False)]
+        raise RequestValidationError(validation_issues, body=body)
+
+
+def document_request_bodies(app: FastAPI, request_body_types: dict[str, Any]):
+    """
+    Adds the JSON request body of each POST route in request_body_types (path -> body type) to the app's OpenAPI
+    schema, with the models it refers to as components, as FastAPI does for a typed body parameter.
+    """
+    generate_openapi = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema is None:
+            openapi_schema = generate_openapi()  # cached in app.openapi_schema, so amended only once
+            component_schemas = openapi_schema.setdefault("components", {}).setdefault("schemas", {})
+            for path, body_type in request_body_types.items():
+                body_schema = TypeAdapter(body_type).json_schema(ref_template=OPENAPI_SCHEMA_REF_TEMPLATE)
+                for name, definition in body_schema.pop("$defs", {}).items():
+                    component_schemas.setdefault(name, definition)
+                if "properties" in body_schema:  # a model: referenced, as FastAPI does
+                    component_schemas.setdefault(body_schema["title"], body_schema)
+                    body_schema = {"$ref": OPENAPI_SCHEMA_REF_TEMPLATE.format(model=body_schema["title"])}
+                openapi_schema["paths"][path]["post"]["requestBody"] = {
+                    "content": {"application/json": {"schema": body_schema}},
+                    "required": True,
+                }
+        return app.openapi_schema
+
+    app.openapi = openapi
@@ -0,0 +1,155 @@
+import importlib
+
+from collections.abc import Mapping
+from contextlib import contextmanager
+from opentelemetry import context, trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor, SpanExporter
+from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+from mpic_service_common.warm_up import WARM_UP_SCOPE_KEY
+
+# Tracing shared by the coordinator and the checker services.
+# Spans are only recorded once configure_tracing() has been given an exporter; until then the tracer is a no-op, so
+# instrumented code costs next to nothing when tracing is off.
+
+TRACER_NAME = "open-mpic"
+# span attribute tying spans of all services to the MPIC request they serve
+TRACE_IDENTIFIER_ATTRIBUTE = "mpic.trace_identifier"
+
+_tracer_provider: TracerProvider | None = None
+_propagator = TraceContextTextMapPropagator()
+
+
+class JsonLinesFileSpanExporter(ConsoleSpanExporter):
+    """
+    Appends finished spans to a file, one JSON object per line.
+    """
+
+    def __init__(self, file_path: str):
+        self._file = open(file_path, "a")
+        super().__init__(out=self._file, formatter=lambda span: span.to_json(indent=None) + "\n")
+
+    def shutdown(self):
+        self._file.close()
+
+
+def create_span_exporter(exporter_name: str | None, file_path: str | None = None) -> SpanExporter | None:
+    """
+    :param exporter_name: "console", "file" (JSON lines appended to file_path), "memory", or the import path of a
+                          callable returning a SpanExporter (e.g. "my_package.exporters:create_exporter")
+    :return: the span exporter, or None if exporter_name is empty or "none"
+    """
+    if not exporter_name or exporter_name == "none":
+        return None
+    if exporter_name == "console":
+        return ConsoleSpanExporter()
+    if exporter_name == "file":
+        return JsonLinesFileSpanExporter(file_path or "traces.jsonl")
+    if exporter_name == "memory":
+        return InMemorySpanExporter()
+    module_name, _, factory_name = exporter_name.partition(":")
+    if not factory_name:
+        raise ValueError(f"Unknown tracing exporter: {exporter_name}")
+    return getattr(importlib.import_module(module_name), factory_name)()
+
+
+def configure_tracing(service_name: str, span_exporter: SpanExporter):
+    """
+    Starts recording spans of this process and handing them to the exporter.
+    In-memory, console and file exporters get each span as it ends; any other exporter gets spans in batches.
+    """
+    global _tracer_provider
+    shutdown_tracing()
+    _tracer_provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    if isinstance(span_exporter, (InMemorySpanExporter, ConsoleSpanExporter)):
+        _tracer_provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    else:
+        _tracer_provider.add_span_processor(BatchSpanProcessor(span_exporter))
+
+
+def shutdown_tracing():
+    """
+    Flushes pending spans and stops recording.
+    """
+    global _tracer_provider
+    if _tracer_provider is not None:
+        _tracer_provider.shutdown()
+        _tracer_provider = None
+
+
+def get_tracer() -> trace.Tracer:
+    if _tracer_provider is None:
+        return trace.NoOpTracer()
+    return _tracer_provider.get_tracer(TRACER_NAME)
+
+
+def inject_trace_context(headers: dict[str, str]) -> dict[str, str]:
+    """
+    :return: the headers plus a W3C traceparent for the current span, or the headers unchanged if nothing is recorded
+    """
+    if not trace.get_current_span().is_recording():
+        return headers
+    headers_with_trace_context = dict(headers)
+    _propagator.inject(headers_with_trace_context)
+    return headers_with_trace_context
+
+
+def extract_trace_context(headers: Mapping[str, str]) -> Context:
+    """
+    :return: the context of the caller's span if the headers carry a traceparent (empty context otherwise)
+    """
+    return _propagator.extract(headers)
+
+
+@contextmanager
+def use_trace_context(trace_context: Mapping[str, str]):
+    """
+    Makes the caller's span carried in trace_context (a traceparent, as in headers) the current span while inside;
+    without a trace context, the current span stays as it is.
+    """
+    if not trace_context:
+        yield
+        return
+    token = context.attach(extract_trace_context(trace_context))
+    try:
+        yield
+    finally:
+        context.detach(token)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware recording every HTTP request as a server span, continuing the caller's trace if the request
+    carries a traceparent header (as the coordinator's calls to the checkers do).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _tracer_provider is None or scope.get(WARM_UP_SCOPE_KEY):
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        with get_tracer().start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=extract_trace_context(headers),
+            kind=trace.SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+            route = scope.get("route")
+            if route is not None:
+                span.update_name(f"{scope['method']} {route.path}")
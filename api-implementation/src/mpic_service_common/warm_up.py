@@ -0,0 +1,58 @@
+import asyncio
+
+from open_mpic_core import get_logger
+
+# ASGI scope key marking requests sent by send_warm_up_requests, which the metrics and tracing middleware skip
+WARM_UP_SCOPE_KEY = "mpic.warm_up"
+
+logger = get_logger(__name__)
+
+
+async def send_warm_up_requests(app, warm_up_requests: list[tuple[str, str, bytes]]):
+    """
+    Sends each (method, path, body) request through the app in-process, during startup and so before the server
+    accepts connections. What is set up lazily on the first request of a route (FastAPI's dependency resolution and
+    body parsing, the first use of validators and serializers, exception handlers, ...) is then no longer paid by
+    the first real request. Responses are discarded; a request that fails is logged and does not hold up startup.
+    Each service sends its WARM_UP_REQUESTS: a health check, and an API request failing validation (so that nothing
+    is checked), which runs the request parsing, validation and error response paths once.
+    """
+    for method, path, body in warm_up_requests:
+        try:
+            status = await send_in_process_request(app, method, path, body)
+            logger.debug(f"Warm-up request {method} {path} answered {status}")
+        except Exception as e:
+            logger.warning(f"Warm-up request {method} {path} failed: {e}")
+
+
+async def send_in_process_request(app, method: str, path: str, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 0),
+        WARM_UP_SCOPE_KEY: True,
+    }
+    request_messages = [{"type": "http.request", "body": body, "more_body": False}]
+    response_status = None
+
+    async def receive():
+        if request_messages:
+            return request_messages.pop()
+        await asyncio.Event().wait()  # no disconnect: the response is always read in full
+
+    async def send(message):
+        nonlocal response_status
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+
+    await app(scope, receive, send)
+    return response_status
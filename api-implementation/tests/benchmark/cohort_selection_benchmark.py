@@ -0,0 +1,77 @@
+"""
+Compares per-request cohort selection by CohortCreator with the precomputed PerspectiveCohortIndex, as the number of
+configured perspectives grows.
+
+Per MPIC request (cohort grouping for one domain):
+  - creator: sort and shuffle the perspectives, then CohortCreator.create_perspective_cohorts()
+  - index (cold): PerspectiveCohortIndex on a domain not seen before (shuffle positions, bitmask "too close" checks)
+  - index (warm): PerspectiveCohortIndex on a recently seen domain (memoized grouping)
+
+Usage: PYTHONPATH=src python tests/benchmark/cohort_selection_benchmark.py [--cohort-size N] [--iterations N]
+"""
+
+import argparse
+import hashlib
+import itertools
+import timeit
+
+from open_mpic_core import CohortCreator, RemotePerspective
+from open_mpic_core.common_domain.enum.regional_internet_registry import RegionalInternetRegistry
+
+from mpic_coordinator_service.main import PerspectiveCohortIndex
+
+HASH_SECRET = "benchmark_secret"
+
+
+def create_perspectives(perspective_count: int) -> list[RemotePerspective]:
+    # spread over all RIRs, with every fourth perspective too close to its neighbours (as for regions in one metro)
+    rirs = list(RegionalInternetRegistry)
+    return [
+        RemotePerspective(
+            code=f"region-{i:03d}",
+            rir=rirs[i % len(rirs)],
+            too_close_codes=[f"region-{j:03d}" for j in (i - 1, i + 1) if i % 4 == 0 and 0 <= j < perspective_count],
+        )
+        for i in range(perspective_count)
+    ]
+
+
+def select_with_creator(perspectives: list[RemotePerspective], cohort_size: int, domain: str):
+    random_seed = hashlib.sha256((HASH_SECRET + domain.lower()).encode("utf-8")).digest()
+    perspectives_per_rir = CohortCreator.shuffle_available_perspectives_per_rir(perspectives, random_seed)
+    return CohortCreator.create_perspective_cohorts(perspectives_per_rir, cohort_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cohort-size", type=int, default=6, help="perspectives per cohort (default: 6)")
+    parser.add_argument("--iterations", type=int, default=2000, help="iterations per measurement (default: 2000)")
+    args = parser.parse_args()
+
+    for perspective_count in [10, 20, 30, 60, 120]:
+        perspectives = create_perspectives(perspective_count)
+        cohort_index = PerspectiveCohortIndex(perspectives, HASH_SECRET)
+        domains = (f"domain-{number}.example.com" for number in itertools.count())
+
+        creator_seconds = timeit.timeit(
+            lambda: select_with_creator(perspectives, args.cohort_size, next(domains)), number=args.iterations
+        )
+        cold_seconds = timeit.timeit(
+            lambda: cohort_index.create_cohorts(args.cohort_size, next(domains)), number=args.iterations
+        )
+        warm_seconds = timeit.timeit(
+            lambda: cohort_index.create_cohorts(args.cohort_size, "example.com"), number=args.iterations
+        )
+
+        creator_us, cold_us, warm_us = (
+            seconds / args.iterations * 1e6 for seconds in (creator_seconds, cold_seconds, warm_seconds)
+        )
+        print(
+            f"{perspective_count:>4} perspectives   creator {creator_us:8.1f} us   "
+            f"index (cold) {cold_us:8.1f} us ({creator_us / cold_us:5.2f}x)   "
+            f"index (warm) {warm_us:6.1f} us ({creator_us / warm_us:6.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares the per-request overhead of the coordinator's exception handling middleware, before and after it became
+pure ASGI.
+
+Per request to a minimal FastAPI app (one POST route echoing a small JSON body), sent in-process:
+  - none: no middleware, as a baseline
+  - http middleware: @app.middleware("http") calling call_next(), as exception_handling_middleware did
+  - pure ASGI: ExceptionHandlingMiddleware, as the coordinator now uses
+
+Usage: PYTHONPATH=src python tests/benchmark/request_pipeline_benchmark.py [--iterations N] [--rounds N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from mpic_coordinator_service.main import ExceptionHandlingMiddleware
+from mpic_service_common.warm_up import send_in_process_request
+
+REQUEST_BODY = b'{"check_type":"caa","domain_or_ip_target":"example.com"}'
+
+
+def create_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/mpic")
+    async def handle_mpic(request: Request):
+        return JSONResponse(await request.json())
+
+    if middleware == "http middleware":
+
+        @app.middleware("http")
+        async def exception_handling_middleware(request: Request, call_next):
+            try:
+                return await call_next(request)
+            except Exception as e:
+                return JSONResponse(status_code=500, content={"error": str(e)})
+
+    elif middleware == "pure ASGI":
+        app.add_middleware(ExceptionHandlingMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, iterations: int) -> float:
+    """
+    :return: the mean time of a request in us
+    """
+    for _ in range(100):  # warm up
+        await send_in_process_request(app, "POST", "/mpic", REQUEST_BODY)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await send_in_process_request(app, "POST", "/mpic", REQUEST_BODY)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def run(iterations: int, rounds: int):
+    apps = {middleware: create_app(middleware) for middleware in ("none", "http middleware", "pure ASGI")}
+    results = {middleware: float("inf") for middleware in apps}
+    for _ in range(rounds):  # interleaved, keeping the best round, so that drift does not favour one app
+        for middleware, app in apps.items():
+            results[middleware] = min(results[middleware], await measure(app, iterations))
+    for middleware, request_us in results.items():
+        overhead_us = request_us - results["none"]
+        print(f"{middleware:<16} {request_us:8.1f} us per request   overhead {overhead_us:6.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000, help="requests per measurement (default: 5000)")
+    parser.add_argument("--rounds", type=int, default=5, help="measurements per app (default: 5)")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
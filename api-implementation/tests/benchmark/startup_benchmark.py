@@ -0,0 +1,136 @@
+"""
+Measures the cold start of each service, from process start to serving requests.
+
+Per service:
+  - import: python -X importtime summary of importing its main module, with the slowest direct imports
+  - first 200: time from starting Uvicorn (one worker) until GET /healthz answers 200
+  - first request: latency of the first API request served (an invalid one, so no checks run), against the median
+    of the requests after it
+
+Usage: PYTHONPATH=src python tests/benchmark/startup_benchmark.py [--runs N] [--top N] [--service NAME]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+PERSPECTIVES = {
+    code: {"caa_endpoint_info": {"url": f"http://{code}/caa"}, "dcv_endpoint_info": {"url": f"http://{code}/dcv"}}
+    for code in ("us-east-1", "us-west-1", "eu-west-2")
+}
+
+# service module -> (environment it needs to start, API request sent after startup)
+SERVICES = {
+    "mpic_coordinator_service": (
+        {
+            "perspectives": json.dumps(PERSPECTIVES),
+            "default_perspective_count": "2",
+            "absolute_max_attempts": "2",
+            "hash_secret": "benchmark_secret",
+        },
+        ("POST", "/mpic", b'{"check_type":"caa"}'),
+    ),
+    "mpic_caa_checker_service": ({"default_caa_domains": "ca.example.com"}, ("POST", "/caa", b"{}")),
+    "mpic_dcv_checker_service": ({}, ("POST", "/dcv", b"{}")),
+}
+
+
+def summarize_import_time(module: str, top: int) -> tuple[float, list[tuple[float, str]]]:
+    """
+    :return: the cumulative import time of the module in ms, and its slowest direct imports
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    total_ms = 0.0
+    direct_imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line.split(":", 1)[1].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if name.strip() == module:
+            total_ms = int(cumulative_us) / 1000
+        elif depth == 1:  # children of the top-level imports; those of the main module come last
+            direct_imports.append((int(cumulative_us) / 1000, name.strip()))
+    return total_ms, sorted(direct_imports, reverse=True)[:top]
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def send_request(port: int, method: str, path: str, body: bytes | None = None) -> tuple[int, float]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        start = time.perf_counter()
+        connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        return response.status, (time.perf_counter() - start) * 1000
+    finally:
+        connection.close()
+
+
+def measure_startup(service: str, environment: dict[str, str], api_request: tuple) -> tuple[float, float, float]:
+    """
+    :return: ms until the first 200 on /healthz, ms of the first API request, median ms of the next ones
+    """
+    port = get_free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{service}.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, **environment},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                status, _ = send_request(port, "GET", "/healthz")
+                if status == 200:
+                    break
+            except OSError:
+                if process.poll() is not None:
+                    raise RuntimeError(f"{service} exited with status {process.returncode}")
+            time.sleep(0.005)
+        first_200_ms = (time.perf_counter() - start) * 1000
+        latencies = [send_request(port, *api_request)[1] for _ in range(11)]
+        return first_200_ms, latencies[0], statistics.median(latencies[1:])
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="process starts per service (default: 5)")
+    parser.add_argument("--top", type=int, default=5, help="slowest direct imports listed (default: 5)")
+    parser.add_argument("--service", choices=list(SERVICES), help="measure only this service")
+    args = parser.parse_args()
+
+    for service, (environment, api_request) in SERVICES.items():
+        if args.service is not None and service != args.service:
+            continue
+        import_ms, slowest_imports = summarize_import_time(f"{service}.main", args.top)
+        measurements = [measure_startup(service, environment, api_request) for _ in range(args.runs)]
+        first_200_ms, first_request_ms, next_request_ms = (statistics.median(values) for values in zip(*measurements))
+
+        print(f"{service}")
+        print(f"  import {import_ms:8.1f} ms   " + "   ".join(f"{name} {ms:.1f}" for ms, name in slowest_imports))
+        print(
+            f"  first 200 on /healthz {first_200_ms:8.1f} ms   {api_request[0]} {api_request[1]}: "
+            f"first {first_request_ms:6.2f} ms, then {next_request_ms:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compares the previous coordinator <-> perspective JSON path with the pre-encoded bytes path.
+
+Coordinator side (per fan-out to N perspectives):
+  - legacy: check_request.model_dump() + stdlib json per perspective, response decoded to text before validation
+  - bytes: one TypeAdapter.dump_json() per fan-out, response bytes validated directly
+
+Perspective side (per check):
+  - legacy: FastAPI-style json.loads() + validate_python(), jsonable_encoder() + json.dumps() for the response
+  - bytes: validate_json() on the request body, dump_json() for the response
+
+Usage: python tests/benchmark/wire_format_benchmark.py [--perspectives N] [--iterations N]
+"""
+
+import argparse
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from open_mpic_core import CheckRequest, CheckResponse, DcvCheckRequest, DcvCheckResponse
+from open_mpic_core import DcvDnsCheckResponseDetails, DcvValidationMethod
+from open_mpic_core_test.test_util.valid_check_creator import ValidCheckCreator
+
+check_request_adapter = TypeAdapter(CheckRequest)
+check_response_adapter = TypeAdapter(CheckResponse)
+dcv_check_request_adapter = TypeAdapter(DcvCheckRequest)
+dcv_check_response_adapter = TypeAdapter(DcvCheckResponse)
+
+
+def create_check_response() -> DcvCheckResponse:
+    return DcvCheckResponse(
+        check_completed=True,
+        check_passed=True,
+        details=DcvDnsCheckResponseDetails(
+            validation_method=DcvValidationMethod.ACME_DNS_01,
+            records_seen=["record-value-1", "record-value-2"],
+            response_code=0,
+            ad_flag=True,
+            found_at="_acme-challenge.example.com",
+        ),
+        timestamp_ns=1234567890,
+    )
+
+
+def coordinator_legacy(check_request, response_body: bytes, perspective_count: int):
+    for _ in range(perspective_count):
+        json.dumps(check_request.model_dump()).encode("utf-8")  # what aiohttp does with json=...
+        check_response_adapter.validate_json(response_body.decode("utf-8"))  # response.text()
+
+
+def coordinator_bytes(check_request, response_body: bytes, perspective_count: int):
+    encoded_check_request = check_request_adapter.dump_json(check_request)  # once per fan-out
+    for _ in range(perspective_count):
+        len(encoded_check_request)
+        check_response_adapter.validate_json(response_body)
+
+
+def perspective_legacy(request_body: bytes, check_response):
+    dcv_check_request_adapter.validate_python(json.loads(request_body))
+    json.dumps(jsonable_encoder(check_response)).encode("utf-8")
+
+
+def perspective_bytes(request_body: bytes, check_response):
+    dcv_check_request_adapter.validate_json(request_body)
+    dcv_check_response_adapter.dump_json(check_response)
+
+
+def report(name: str, legacy_seconds: float, bytes_seconds: float, iterations: int):
+    legacy_us = legacy_seconds / iterations * 1e6
+    bytes_us = bytes_seconds / iterations * 1e6
+    print(f"{name:<40} legacy {legacy_us:9.1f} us   bytes {bytes_us:9.1f} us   speedup {legacy_us / bytes_us:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--perspectives", type=int, default=6, help="perspectives per fan-out (default: 6)")
+    parser.add_argument("--iterations", type=int, default=20000, help="iterations per measurement (default: 20000)")
+    args = parser.parse_args()
+
+    check_request = ValidCheckCreator.create_valid_dns_check_request()
+    check_response = create_check_response()
+    request_body = check_request_adapter.dump_json(check_request)
+    response_body = check_response_adapter.dump_json(check_response)
+
+    def measure(function, *function_args):
+        function(*function_args)  # warm up
+        return timeit.timeit(lambda: function(*function_args), number=args.iterations)
+
+    report(
+        f"coordinator fan-out ({args.perspectives} perspectives)",
+        measure(coordinator_legacy, check_request, response_body, args.perspectives),
+        measure(coordinator_bytes, check_request, response_body, args.perspectives),
+        args.iterations,
+    )
+    report(
+        "perspective request/response",
+        measure(perspective_legacy, request_body, check_response),
+        measure(perspective_bytes, request_body, check_response),
+        args.iterations,
+    )
+
+
+if __name__ == "__main__":
+    main()
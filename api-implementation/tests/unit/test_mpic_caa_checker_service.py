@@ -1,16 +1,22 @@
 import dns
+import json
 import time
+import httpx
+import asyncio
 import pytest
 import re
 
 from fastapi import status
 from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 from unittest.mock import AsyncMock
 from open_mpic_core import CaaCheckResponse, CaaCheckResponseDetails
 from open_mpic_core_test.test_util.mock_dns_object_creator import MockDnsObjectCreator
 from open_mpic_core_test.test_util.valid_check_creator import ValidCheckCreator
 
 import mpic_caa_checker_service.main as main_module
+from mpic_service_common.check_batch import CHECK_BATCH_MAX_SIZE
+from mpic_service_common.tracing import configure_tracing, shutdown_tracing
 
 
 # noinspection PyMethodMayBeStatic
@@ -56,6 +62,64 @@ class TestMpicCaaCheckerService:
         # it'll read in the placeholder values in the config files -- that's acceptable for this particular test
         assert service.default_caa_domain_list == ["DEFAULT_CAA_DOMAINS_LIST"]
 
+    def service__should_return_422_error_given_invalid_request_body(self):
+        check_request = ValidCheckCreator.create_valid_caa_check_request().model_dump()
+        del check_request["domain_or_ip_target"]
+
+        with TestClient(main_module.app) as client:
+            response = client.post("/caa", json=check_request)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["type"] == "missing"
+        assert response.json()["detail"][0]["loc"] == ["body", "domain_or_ip_target"]
+
+    def service__should_run_batch_of_checks_and_report_failed_checks_as_null_given_batch_request(self, mocker):
+        mock_caa_response = TestMpicCaaCheckerService.create_caa_check_response()
+
+        async def check_caa(caa_request):
+            if caa_request.domain_or_ip_target == "fail.example.com":
+                raise Exception("Something went wrong")
+            return mock_caa_response
+
+        mocker.patch("open_mpic_core.MpicCaaChecker.check_caa", side_effect=check_caa)
+        check_requests = []
+        for domain in ["example.com", "fail.example.com", "example.org"]:
+            check_request = ValidCheckCreator.create_valid_caa_check_request()
+            check_request.domain_or_ip_target = domain
+            check_requests.append(check_request.model_dump())
+
+        with TestClient(main_module.app) as client:
+            response = client.post("/caa/batch", json=check_requests)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [mock_caa_response.model_dump(), None, mock_caa_response.model_dump()]
+
+    def service__should_run_each_batched_check_in_trace_of_its_batch_item(self, set_env_variables, mocker):
+        span_exporter = InMemorySpanExporter()
+        configure_tracing("mpic-caa-checker", span_exporter)
+        mocker.patch(
+            "open_mpic_core.MpicCaaChecker.check_caa",
+            return_value=TestMpicCaaCheckerService.create_caa_check_response(),
+        )
+        item_trace_ids = ["0af7651916cd43dd8448eb211c80319c", "4bf92f3577b34da6a3ce929d0e0e4736"]
+        check_batch = [
+            {
+                "trace_context": {"traceparent": f"00-{trace_id}-b7ad6b7169203331-01"},
+                "request": ValidCheckCreator.create_valid_caa_check_request().model_dump(),
+            }
+            for trace_id in item_trace_ids
+        ]
+
+        try:
+            with TestClient(main_module.app) as client:
+                response = client.post("/caa/batch", json=check_batch)
+        finally:
+            shutdown_tracing()
+
+        assert response.status_code == status.HTTP_200_OK
+        check_spans = [span for span in span_exporter.get_finished_spans() if span.name == "caa.check"]
+        assert sorted(format(span.context.trace_id, "032x") for span in check_spans) == sorted(item_trace_ids)
+
     def service__should_return_healthy_status_given_health_check_request(self):
         with TestClient(main_module.app) as client:
             response = client.get("/healthz")
@@ -63,6 +127,174 @@ class TestMpicCaaCheckerService:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == {"status": "healthy"}
 
+    def service__should_report_request_and_dns_lookup_metrics_given_metrics_request(self, set_env_variables, mocker):
+        caa_check_request = ValidCheckCreator.create_valid_caa_check_request()
+        caa_answer = MockDnsObjectCreator.create_caa_query_answer(
+            caa_check_request.domain_or_ip_target, 0, "issue", "example.com", mocker
+        )
+        mocker.patch("dns.asyncresolver.Resolver.resolve", new=AsyncMock(return_value=caa_answer))
+
+        with TestClient(main_module.app) as client:
+            client.post("/caa", json=caa_check_request.model_dump())
+            response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'mpic_http_request_duration_seconds_count{method="POST",route="/caa",status_code="200"}' in response.text
+        assert 'mpic_dns_lookup_duration_seconds_count{outcome="success",record_type="CAA"}' in response.text
+        assert "mpic_event_loop_lag_seconds_count" in response.text
+
+    def service__should_join_caller_trace_with_check_and_dns_spans_given_traceparent_header(
+        self, set_env_variables, mocker
+    ):
+        span_exporter = InMemorySpanExporter()
+        configure_tracing("mpic-caa-checker", span_exporter)
+        caa_check_request = ValidCheckCreator.create_valid_caa_check_request()
+        caa_answer = MockDnsObjectCreator.create_caa_query_answer(
+            caa_check_request.domain_or_ip_target, 0, "issue", "example.com", mocker
+        )
+        mocker.patch("dns.asyncresolver.Resolver.resolve", new=AsyncMock(return_value=caa_answer))
+        caller_trace_id = "0af7651916cd43dd8448eb211c80319c"
+        traceparent = f"00-{caller_trace_id}-b7ad6b7169203331-01"
+
+        try:
+            with TestClient(main_module.app) as client:
+                response = client.post(
+                    "/caa", json=caa_check_request.model_dump(), headers={"traceparent": traceparent}
+                )
+        finally:
+            shutdown_tracing()
+
+        assert response.status_code == status.HTTP_200_OK
+        spans = {span.name: span for span in span_exporter.get_finished_spans()}
+        assert {"POST /caa", "caa.check", "dns.resolve"} <= spans.keys()
+        assert all(format(span.context.trace_id, "032x") == caller_trace_id for span in spans.values())
+        assert spans["dns.resolve"].parent.span_id == spans["caa.check"].context.span_id
+        assert spans["dns.resolve"].attributes["dns.question.type"] == "CAA"
+
+    async def service__should_shed_load_with_retry_after_given_admission_limits_exceeded(
+        self, set_env_variables, mocker
+    ):
+        set_env_variables.setenv("admission_max_concurrent_requests", "1")
+        set_env_variables.setenv("admission_max_queue_length", "1")
+        set_env_variables.setenv("admission_max_queue_wait_seconds", "0.05")
+        set_env_variables.setenv("admission_retry_after_seconds", "3")
+        check_released = asyncio.Event()
+
+        async def check_caa(caa_request):
+            await check_released.wait()
+            return TestMpicCaaCheckerService.create_caa_check_response()
+
+        mocker.patch("open_mpic_core.MpicCaaChecker.check_caa", side_effect=check_caa)
+        check_request = ValidCheckCreator.create_valid_caa_check_request().model_dump()
+
+        transport = httpx.ASGITransport(app=main_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            admitted = asyncio.create_task(client.post("/caa", json=check_request))
+            await asyncio.sleep(0.01)
+            queued = asyncio.create_task(client.post("/caa", json=check_request))
+            await asyncio.sleep(0.01)
+            rejected = await client.post("/caa", json=check_request)
+            timed_out = await queued
+            health = await client.get("/healthz")
+            check_released.set()
+            assert (await admitted).status_code == status.HTTP_200_OK
+
+        assert rejected.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert rejected.json() == {"error": "too-many-requests"}
+        assert timed_out.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert timed_out.headers["retry-after"] == rejected.headers["retry-after"] == "3"
+        assert health.status_code == status.HTTP_200_OK  # operational endpoints are never shed
+
+    def service__should_admit_each_check_of_batch_given_admission_limits(self, set_env_variables, mocker):
+        set_env_variables.setenv("admission_max_concurrent_requests", "2")
+        set_env_variables.setenv("admission_max_queue_length", "1")
+        mock_caa_response = TestMpicCaaCheckerService.create_caa_check_response()
+        checks_in_flight = 0
+        max_checks_in_flight = 0
+
+        async def check_caa(caa_request):
+            nonlocal checks_in_flight, max_checks_in_flight
+            checks_in_flight += 1
+            max_checks_in_flight = max(max_checks_in_flight, checks_in_flight)
+            await asyncio.sleep(0.05)
+            checks_in_flight -= 1
+            return mock_caa_response
+
+        mocker.patch("open_mpic_core.MpicCaaChecker.check_caa", side_effect=check_caa)
+        check_request = ValidCheckCreator.create_valid_caa_check_request().model_dump()
+
+        with TestClient(main_module.app) as client:
+            response = client.post("/caa/batch", json=[check_request] * 4)
+
+        # two checks run at once, a third waits for a slot and the one beyond the queue is rejected
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json().count(None) == 1
+        assert max_checks_in_flight == 2
+        assert main_module.get_service().admission_controller.get_stats()["rejected_queue_full"] == 1
+
+    def service__should_return_422_error_given_batch_larger_than_maximum_batch_size(self, mocker):
+        check_caa_mock = mocker.patch("open_mpic_core.MpicCaaChecker.check_caa")
+        check_request = ValidCheckCreator.create_valid_caa_check_request().model_dump()
+
+        with TestClient(main_module.app) as client:
+            response = client.post("/caa/batch", json=[check_request] * (CHECK_BATCH_MAX_SIZE + 1))
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["type"] == "too_long"
+        check_caa_mock.assert_not_called()
+
+    def service__should_answer_concurrent_checks_by_id_given_check_channel_requests(self, set_env_variables, mocker):
+        mock_caa_response = TestMpicCaaCheckerService.create_caa_check_response()
+        check_caa_mock = mocker.patch("open_mpic_core.MpicCaaChecker.check_caa", return_value=mock_caa_response)
+        caa_check_request = ValidCheckCreator.create_valid_caa_check_request()
+
+        with TestClient(main_module.app) as client:
+            with client.websocket_connect("/caa/ws") as websocket:
+                for frame_id in [7, 8]:
+                    websocket.send_bytes(
+                        b'{"id":%d,"request":%b}' % (frame_id, caa_check_request.model_dump_json().encode())
+                    )
+                websocket.send_bytes(b'{"id":9,"request":{"check_type":"caa"}}')
+                frames = [json.loads(websocket.receive_bytes()) for _ in range(3)]
+
+        frames_by_id = {frame["id"]: frame for frame in frames}
+        assert (
+            frames_by_id[7]["response"]
+            == frames_by_id[8]["response"]
+            == json.loads(mock_caa_response.model_dump_json())
+        )
+        assert "domain_or_ip_target" in frames_by_id[9]["error"]
+        assert check_caa_mock.call_count == 2
+
+    def service__should_admit_check_channel_checks_and_record_them_in_request_metrics(self, set_env_variables, mocker):
+        set_env_variables.setenv("admission_max_concurrent_requests", "1")
+        set_env_variables.setenv("admission_max_queue_length", "0")  # no waiting: a second concurrent check is rejected
+        mock_caa_response = TestMpicCaaCheckerService.create_caa_check_response()
+
+        async def check_caa(caa_request):
+            await asyncio.sleep(0.05)
+            return mock_caa_response
+
+        mocker.patch("open_mpic_core.MpicCaaChecker.check_caa", side_effect=check_caa)
+        caa_check_request = ValidCheckCreator.create_valid_caa_check_request()
+
+        with TestClient(main_module.app) as client:
+            with client.websocket_connect("/caa/ws") as websocket:
+                for frame_id in [1, 2]:
+                    websocket.send_bytes(
+                        b'{"id":%d,"request":%b}' % (frame_id, caa_check_request.model_dump_json().encode())
+                    )
+                frames = [json.loads(websocket.receive_bytes()) for _ in range(2)]
+            metrics_text = client.get("/metrics").text
+
+        frames_by_id = {frame["id"]: frame for frame in frames}
+        assert frames_by_id[1]["response"] == json.loads(mock_caa_response.model_dump_json())
+        assert frames_by_id[2]["error"] == "too-many-requests"
+        for status_code in ["200", "429"]:
+            labels = f'method="WEBSOCKET",route="/caa/ws",status_code="{status_code}"'
+            assert f"mpic_http_request_duration_seconds_count{{{labels}}}" in metrics_text
+
     def service__should_set_log_level_of_caa_checker(self, setup_logging, mocker):
         caa_check_request = ValidCheckCreator.create_valid_caa_check_request()
 
@@ -99,6 +331,7 @@ class TestMpicCaaCheckerService:
         assert config["uvicorn_server_timeout_keep_alive"] == 25
         assert config["dns_timeout_seconds"] == 1.0
         assert config["dns_resolution_lifetime_seconds"] == 2.0
+        assert config["admission_max_concurrent_requests"] == 0
 
     @staticmethod
     def create_caa_check_response():
@@ -1,36 +1,59 @@
 import asyncio
+import aiohttp
+import aiohttp.web
+import hashlib
 import json
 import yaml
 import pytest
 import re
+import uuid
 
 from importlib import resources
 from io import BytesIO
 from unittest.mock import patch, AsyncMock, MagicMock
 from aiohttp import ClientResponse
+from aiohttp.test_utils import TestServer
 from fastapi import status
 from fastapi.testclient import TestClient
 from multidict import CIMultiDictProxy, CIMultiDict
 from open_mpic_core.common_domain.enum.regional_internet_registry import RegionalInternetRegistry
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from prometheus_client import REGISTRY
 from pydantic import TypeAdapter
 from requests import Response
 from yarl import URL
 
 from open_mpic_core import DcvCheckRequest, DcvCheckResponse
-from open_mpic_core import CaaCheckResponse, DcvDnsCheckResponseDetails, CaaCheckResponseDetails
+from open_mpic_core import CaaCheckRequest, CaaCheckResponse, DcvDnsCheckResponseDetails, CaaCheckResponseDetails
 from open_mpic_core import CheckType
 from open_mpic_core import DcvValidationMethod
 from open_mpic_core import MpicEffectiveOrchestrationParameters
 from open_mpic_core import MpicCaaResponse
 from open_mpic_core import RemotePerspective, PerspectiveResponse
+from open_mpic_core import CohortCreator
 
 from mpic_coordinator_service.main import MpicCoordinatorService, PerspectiveEndpoints, PerspectiveEndpointInfo, app
+from mpic_coordinator_service.main import CheckResponseCache, PerspectiveLatencyTracker
+from mpic_coordinator_service.main import PerspectiveCircuitBreaker, PerspectiveCircuitOpenException
+from mpic_coordinator_service.main import ServiceMpicCoordinator, MpicJobQueue, MpicJobQueueFullException
+from mpic_coordinator_service.main import MpicJob, StoredMpicJob, MPIC_JOB_WORKER_STOPPED_ERROR
+from mpic_coordinator_service.main import PerspectiveCohortIndex, PerspectiveReplicaBalancer
+import mpic_coordinator_service.main as main_module
+from mpic_service_common.check_batch import get_check_batch_type
+from mpic_service_common.tracing import configure_tracing, get_tracer, shutdown_tracing
 from open_mpic_core_test.test_util.valid_mpic_request_creator import ValidMpicRequestCreator
 from open_mpic_core_test.test_util.valid_check_creator import ValidCheckCreator
 
 
 # noinspection PyMethodMayBeStatic
 class TestMpicCoordinatorService:
+    @staticmethod
+    @pytest.fixture(scope="function", autouse=True)
+    def clear_service():
+        # Clear the global service instance before each test to ensure a fresh state.
+        main_module._service = None
+        yield
+
     @pytest.fixture(autouse=True)
     def mock_yaml_load(self):
         with resources.files("resources").joinpath("available_test_perspectives.yaml").open("r") as file:
@@ -119,6 +142,944 @@ class TestMpicCoordinatorService:
         finally:
             await service.shutdown()
 
+    async def call_remote_perspective__should_encode_shared_check_request_once_per_fan_out(
+        self, set_env_variables, mocker
+    ):
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            posted_bodies = []
+
+            def args_based_mock(*args, **kwargs):
+                posted_bodies.append(kwargs["data"])
+                mock_response = self.create_successful_api_call_response_for_dcv_check(*args, **kwargs)
+                return AsyncMock(
+                    __aenter__=AsyncMock(return_value=mock_response), __aexit__=AsyncMock(return_value=None)
+                )
+
+            # noinspection PyProtectedMember
+            mocker.patch.object(service._async_http_client, "post", side_effect=args_based_mock)
+            dump_json_spy = mocker.spy(service.check_request_adapter, "dump_json")
+
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            for perspective_code in ["test-1", "test-2", "test-3"]:
+                perspective = RemotePerspective(code=perspective_code, rir=RegionalInternetRegistry.ARIN)
+                await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request)
+
+            assert dump_json_spy.call_count == 1
+            assert all(body is posted_bodies[0] for body in posted_bodies)
+            assert DcvCheckRequest.model_validate_json(posted_bodies[0]) == dcv_check_request
+        finally:
+            await service.shutdown()
+
+    # fmt: off
+    @pytest.mark.parametrize("check_completed, check_passed, expected_post_count", [
+        (True, True, 1),  # successful response is served from cache the second time
+        (True, False, 2),  # failed check is not cached
+        (False, False, 2),  # incomplete check is not cached
+    ])
+    # fmt: on
+    async def call_remote_perspective__should_reuse_only_successful_responses_given_cache_enabled(
+        self, set_env_variables, check_completed, check_passed, expected_post_count, mocker
+    ):
+        set_env_variables.setenv("check_response_cache_ttl_seconds", "30")
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            check_response = DcvCheckResponse(
+                check_completed=check_completed,
+                check_passed=check_passed,
+                details=DcvDnsCheckResponseDetails(validation_method=DcvValidationMethod.ACME_DNS_01),
+            )
+            # noinspection PyProtectedMember
+            post_mock = mocker.patch.object(
+                service._async_http_client, "post", side_effect=self.create_post_mock_returning(check_response)
+            )
+
+            perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            for trace_identifier in ["trace-1", "trace-2"]:  # trace identifier should not affect the cache key
+                check_request = dcv_check_request.model_copy(update={"trace_identifier": trace_identifier})
+                await service.call_remote_perspective(perspective, CheckType.DCV, check_request)
+
+            assert post_mock.call_count == expected_post_count
+        finally:
+            await service.shutdown()
+
+    async def call_remote_perspective__should_not_reuse_cached_response_across_perspectives(
+        self, set_env_variables, mocker
+    ):
+        set_env_variables.setenv("check_response_cache_ttl_seconds", "30")
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            check_response = DcvCheckResponse(
+                check_completed=True,
+                check_passed=True,
+                details=DcvDnsCheckResponseDetails(validation_method=DcvValidationMethod.ACME_DNS_01),
+            )
+            # noinspection PyProtectedMember
+            post_mock = mocker.patch.object(
+                service._async_http_client, "post", side_effect=self.create_post_mock_returning(check_response)
+            )
+
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            for perspective_code in ["test-1", "test-2"]:
+                perspective = RemotePerspective(code=perspective_code, rir=RegionalInternetRegistry.ARIN)
+                await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request)
+
+            assert post_mock.call_count == 2
+        finally:
+            await service.shutdown()
+
+    async def call_remote_perspective__should_batch_concurrent_checks_to_same_perspective_given_batching_window(
+        self, set_env_variables, mocker
+    ):
+        set_env_variables.setenv("perspective_batching_window_ms", "5")
+        configure_tracing("mpic-coordinator", InMemorySpanExporter())
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            posted_batches = []
+
+            def batch_post_mock(url, headers, data):
+                check_batch_items = TypeAdapter(get_check_batch_type(DcvCheckRequest)).validate_json(data)
+                check_requests = [item.request for item in check_batch_items]
+                posted_batches.append((url, headers, check_batch_items))
+                # the remote perspective reports the check for 'fail.example.com' as failed (null entry)
+                check_responses = [
+                    (
+                        None
+                        if check_request.domain_or_ip_target == "fail.example.com"
+                        else DcvCheckResponse(
+                            check_passed=True,
+                            details=DcvDnsCheckResponseDetails(
+                                validation_method=DcvValidationMethod.ACME_DNS_01,
+                                found_at=check_request.domain_or_ip_target,
+                            ),
+                        )
+                    )
+                    for check_request in check_requests
+                ]
+                mock_response = TestMpicCoordinatorService.create_mock_http_response(
+                    200, TypeAdapter(list[DcvCheckResponse | None]).dump_json(check_responses).decode()
+                )
+                return AsyncMock(
+                    __aenter__=AsyncMock(return_value=mock_response), __aexit__=AsyncMock(return_value=None)
+                )
+
+            # noinspection PyProtectedMember
+            mocker.patch.object(service._async_http_client, "post", side_effect=batch_post_mock)
+
+            perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+            check_requests = []
+            for domain in ["a.example.com", "b.example.com", "fail.example.com"]:
+                check_request = ValidCheckCreator.create_valid_dns_check_request()
+                check_request.domain_or_ip_target = domain
+                check_requests.append(check_request)
+
+            mpic_trace_ids = []
+
+            async def call_in_own_trace(check_request):
+                with get_tracer().start_as_current_span("mpic") as mpic_span:
+                    mpic_trace_ids.append(format(mpic_span.get_span_context().trace_id, "032x"))
+                    return await service.call_remote_perspective(perspective, CheckType.DCV, check_request)
+
+            results = await asyncio.gather(
+                *[call_in_own_trace(request) for request in check_requests], return_exceptions=True
+            )
+
+            assert len(posted_batches) == 1
+            batch_url, batch_headers, check_batch_items = posted_batches[0]
+            assert batch_url == "http://dcv1.example.com/dcv/batch"
+            assert [response.details.found_at for response in results[:2]] == ["a.example.com", "b.example.com"]
+            assert isinstance(results[2], RuntimeError)
+            # each check continues the trace of its own MPIC request; the batch call continues none of them
+            assert [item.trace_context["traceparent"].split("-")[1] for item in check_batch_items] == mpic_trace_ids
+            assert "traceparent" not in batch_headers
+        finally:
+            await service.shutdown()
+            shutdown_tracing()
+
+    # fmt: off
+    @pytest.mark.parametrize("hedge_budget_percent, expected_post_count, expected_hedges_won", [
+        ("100", 2, 1),  # slow primary call gets hedged, and the hedge answers first
+        ("5", 1, 0),  # not enough budget accumulated for a hedge
+    ])
+    # fmt: on
+    async def call_remote_perspective__should_hedge_slow_call_within_budget_given_hedging_enabled(
+        self, set_env_variables, hedge_budget_percent, expected_post_count, expected_hedges_won, mocker
+    ):
+        set_env_variables.setenv("hedge_after_percentile", "95")
+        set_env_variables.setenv("hedge_budget_percent", hedge_budget_percent)
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            for _ in range(20):
+                service.perspective_latency_tracker.record("test-1", CheckType.DCV, 0.01)
+
+            post_delays = iter([0.5, 0])  # the first (primary) call is slow, the second (hedge) call is fast
+
+            def delayed_post_mock(*args, **kwargs):
+                mock_response = self.create_successful_api_call_response_for_dcv_check(*args, **kwargs)
+                delay = next(post_delays)
+
+                async def delayed_response():
+                    await asyncio.sleep(delay)
+                    return mock_response
+
+                return AsyncMock(__aenter__=AsyncMock(side_effect=delayed_response), __aexit__=AsyncMock())
+
+            # noinspection PyProtectedMember
+            post_mock = mocker.patch.object(service._async_http_client, "post", side_effect=delayed_post_mock)
+
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+            check_response = await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request)
+
+            assert check_response.check_passed is True
+            assert post_mock.call_count == expected_post_count
+            assert service.hedging_policy.hedges_won == expected_hedges_won
+        finally:
+            await service.shutdown()
+
+    # fmt: off
+    @pytest.mark.parametrize("latency_seconds, expected_timeout_seconds", [
+        (0.04, 1),  # nearby perspective, clamped up to the minimum
+        (0.5, 1.5),
+        (5, 10),  # slow perspective, clamped down to the maximum
+    ])
+    # fmt: on
+    def get_adaptive_timeout_seconds__should_scale_latency_percentile_within_bounds(
+        self, set_env_variables, latency_seconds, expected_timeout_seconds
+    ):
+        set_env_variables.setenv("adaptive_timeout_factor", "3")
+        set_env_variables.setenv("adaptive_timeout_min_seconds", "1")
+        set_env_variables.setenv("adaptive_timeout_max_seconds", "10")
+        service = MpicCoordinatorService()
+        assert service.get_adaptive_timeout_seconds("test-1", CheckType.DCV) is None  # no samples yet
+        for _ in range(20):
+            service.perspective_latency_tracker.record("test-1", CheckType.DCV, latency_seconds)
+        assert service.get_adaptive_timeout_seconds("test-1", CheckType.DCV) == pytest.approx(expected_timeout_seconds)
+        assert service.get_adaptive_timeout_seconds("test-1", CheckType.CAA) is None
+
+    async def call_remote_perspective__should_pass_adaptive_timeout_to_post_given_enough_latency_samples(
+        self, set_env_variables, mocker
+    ):
+        set_env_variables.setenv("adaptive_timeout_factor", "4")
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            for _ in range(20):
+                service.perspective_latency_tracker.record("test-1", CheckType.DCV, 0.5)
+            posted_timeouts = []
+
+            def post_mock(url, headers, data, timeout=None):
+                posted_timeouts.append(timeout)
+                return self.create_successful_api_call_response_for_dcv_check(url, headers, data)
+
+            # noinspection PyProtectedMember
+            mocker.patch.object(service._async_http_client, "post", side_effect=post_mock)
+
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+            await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request)
+
+            assert posted_timeouts[0].sock_connect == pytest.approx(2)
+            assert posted_timeouts[0].sock_read == pytest.approx(2)
+        finally:
+            await service.shutdown()
+
+    # fmt: off
+    @pytest.mark.parametrize("post_side_effect, expected_outcome", [
+        (None, "success"),
+        (asyncio.TimeoutError(), "timeout"),
+        (aiohttp.ClientConnectionError("Connection refused"), "error"),
+    ])
+    # fmt: on
+    async def call_remote_perspective__should_record_call_duration_metric_by_outcome(
+        self, set_env_variables, post_side_effect, expected_outcome, mocker
+    ):
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            # noinspection PyProtectedMember
+            mocker.patch.object(
+                service._async_http_client,
+                "post",
+                side_effect=post_side_effect or self.create_successful_api_call_response_for_dcv_check,
+            )
+            metric_labels = {"perspective": "test-1", "check_type": "dcv", "outcome": expected_outcome}
+            count_before = REGISTRY.get_sample_value("mpic_perspective_call_duration_seconds_count", metric_labels)
+
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+            try:
+                await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request)
+            except (asyncio.TimeoutError, aiohttp.ClientError):
+                pass
+
+            count_after = REGISTRY.get_sample_value("mpic_perspective_call_duration_seconds_count", metric_labels)
+            assert count_after == (count_before or 0) + 1
+        finally:
+            await service.shutdown()
+
+    # fmt: off
+    @pytest.mark.parametrize("fast_checks_pass, expected_is_valid", [
+        (True, True),  # the first 4 passing responses reach the quorum of 4
+        (False, False),  # after 3 failing responses the quorum of 4 out of 6 can no longer be reached
+    ])
+    # fmt: on
+    async def perform_mpic__should_return_once_outcome_decided_and_cancel_outstanding_calls_given_early_quorum_return(
+        self, set_env_variables, fast_checks_pass, expected_is_valid, mocker
+    ):
+        set_env_variables.setenv("early_quorum_return", "True")
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            post_delays = iter([0, 0, 0, 0, 10, 10])  # the last two perspectives would take far too long
+            cancelled_calls = []
+
+            def delayed_post_mock(url, headers, data):
+                check_response = DcvCheckResponse(
+                    check_completed=True,
+                    check_passed=fast_checks_pass,
+                    details=DcvDnsCheckResponseDetails(validation_method=DcvValidationMethod.DNS_CHANGE),
+                )
+                mock_response = self.create_mock_http_response(200, check_response.model_dump_json())
+                delay = next(post_delays)
+
+                async def delayed_response():
+                    try:
+                        await asyncio.sleep(delay)
+                    except asyncio.CancelledError:
+                        cancelled_calls.append(url)
+                        raise
+                    return mock_response
+
+                return AsyncMock(__aenter__=AsyncMock(side_effect=delayed_response), __aexit__=AsyncMock())
+
+            # noinspection PyProtectedMember
+            mocker.patch.object(service._async_http_client, "post", side_effect=delayed_post_mock)
+
+            mpic_request = ValidMpicRequestCreator.create_valid_mpic_request(CheckType.DCV)
+            mpic_response = await asyncio.wait_for(service.perform_mpic(mpic_request), timeout=5)
+
+            assert mpic_response.is_valid is expected_is_valid
+            assert len(mpic_response.perspectives) == 6
+            assert len(cancelled_calls) == 2
+            not_completed = [p for p in mpic_response.perspectives if not p.check_response.check_completed]
+            assert len(not_completed) == 2  # a cancelled check is reported as not completed
+            assert service.mpic_coordinator.get_early_quorum_stats() == {
+                "early_decisions": 1,
+                "cancelled_perspective_calls": 2,
+            }
+        finally:
+            await service.shutdown()
+
+    # fmt: off
+    @pytest.mark.parametrize("passed_rirs, outstanding_rirs, quorum_count, expected_decided", [
+        (["ARIN", "RIPE NCC"], ["APNIC"], 2, True),  # quorum reached with two RIRs
+        (["ARIN", "ARIN"], ["ARIN", "RIPE NCC"], 2, False),  # quorum count reached but only one RIR so far
+        (["ARIN"], ["ARIN", "RIPE NCC"], 3, False),  # quorum still reachable
+        (["ARIN"], ["RIPE NCC"], 3, True),  # too few perspectives left to reach quorum
+        (["ARIN"], ["ARIN", "ARIN"], 2, True),  # quorum count reachable, but never with two RIRs
+    ])
+    # fmt: on
+    def is_outcome_decided__should_mirror_quorum_and_rir_diversity_rules(
+        self, passed_rirs, outstanding_rirs, quorum_count, expected_decided
+    ):
+        def to_perspectives(rirs):
+            return [
+                RemotePerspective(code=f"test-{i}", rir=RegionalInternetRegistry(rir)) for i, rir in enumerate(rirs)
+            ]
+
+        cohort_size = len(passed_rirs) + len(outstanding_rirs) + 1  # plus one failed perspective
+        decided = ServiceMpicCoordinator.is_outcome_decided(
+            to_perspectives(passed_rirs), to_perspectives(outstanding_rirs), cohort_size, quorum_count
+        )
+        assert decided is expected_decided
+
+    # fmt: off
+    @pytest.mark.parametrize("perspective_count, cohort_size", [
+        (6, 2), (6, 3), (6, 6), (12, 2), (12, 3), (12, 5), (30, 4), (30, 6),
+    ])
+    # fmt: on
+    def perspective_cohort_index__should_group_perspectives_exactly_like_cohort_creator(
+        self, perspective_count, cohort_size
+    ):
+        rirs = list(RegionalInternetRegistry)
+        perspectives = [
+            RemotePerspective(
+                code=f"region-{i:02d}",
+                rir=rirs[i % 3],
+                too_close_codes=[
+                    f"region-{j:02d}" for j in (i - 1, i + 1) if i % 4 == 0 and 0 <= j < perspective_count
+                ],
+            )
+            for i in range(perspective_count)
+        ]
+        cohort_index = PerspectiveCohortIndex(list(reversed(perspectives)), "test_secret")
+        for domain_number in range(50):
+            domain = f"Domain-{domain_number}.example.com"
+            random_seed = hashlib.sha256(("test_secret" + domain.lower()).encode("utf-8")).digest()
+            perspectives_per_rir = CohortCreator.shuffle_available_perspectives_per_rir(list(perspectives), random_seed)
+            expected_cohorts = CohortCreator.create_perspective_cohorts(perspectives_per_rir, cohort_size)
+            assert cohort_index.create_cohorts(cohort_size, domain) == expected_cohorts
+            assert cohort_index.create_cohorts(cohort_size, domain.lower()) == expected_cohorts  # memoized
+
+    async def mpic_job_queue__should_reject_jobs_beyond_max_depth_and_expire_completed_jobs_after_ttl(self):
+        release_coordination = asyncio.Event()
+        mock_response = TestMpicCoordinatorService.create_caa_mpic_response()
+
+        async def perform_mpic(mpic_request):
+            await release_coordination.wait()
+            return mock_response
+
+        job_queue = MpicJobQueue(max_depth=2, worker_count=1, result_ttl_seconds=0.05, perform_mpic=perform_mpic)
+        job_queue.start()
+        try:
+            mpic_request = ValidMpicRequestCreator.create_valid_caa_mpic_request()
+            running_job = job_queue.submit(mpic_request)
+            await asyncio.sleep(0)  # let the worker pick up the first job
+            queued_jobs = [job_queue.submit(mpic_request) for _ in range(2)]
+            with pytest.raises(MpicJobQueueFullException):
+                job_queue.submit(mpic_request)
+            assert job_queue.get(running_job.job_id).status == MpicJobQueue.RUNNING
+            assert job_queue.get(queued_jobs[0].job_id).status == MpicJobQueue.QUEUED
+
+            release_coordination.set()
+            await asyncio.sleep(0.01)
+            completed_job = job_queue.get(running_job.job_id)
+            assert completed_job.status == MpicJobQueue.COMPLETED
+            assert completed_job.status_code == 200
+            assert completed_job.response == mock_response
+
+            await asyncio.sleep(0.1)
+            assert job_queue.get(running_job.job_id) is None
+            assert job_queue.get_stats()["expired"] == 3
+            assert job_queue.get_stats()["rejected"] == 1
+        finally:
+            await job_queue.close()
+
+    async def mpic_job_queue__should_report_jobs_of_other_worker_given_shared_state_dir(self, tmp_path):
+        release_coordination = asyncio.Event()
+        mock_response = TestMpicCoordinatorService.create_caa_mpic_response()
+
+        async def perform_mpic(mpic_request):
+            await release_coordination.wait()
+            return mock_response
+
+        # two workers' queues sharing the directory; only the first one runs jobs
+        accepting_queue = MpicJobQueue(2, 1, 0.05, perform_mpic, state_dir=str(tmp_path))
+        other_queue = MpicJobQueue(2, 0, 0.05, perform_mpic, state_dir=str(tmp_path))
+        accepting_queue.start()
+        try:
+            job = accepting_queue.submit(ValidMpicRequestCreator.create_valid_caa_mpic_request())
+            assert other_queue.get(job.job_id).status == MpicJobQueue.QUEUED
+            await asyncio.sleep(0)  # let the worker pick up the job
+            assert other_queue.get(job.job_id).status == MpicJobQueue.RUNNING
+
+            release_coordination.set()
+            await asyncio.sleep(0.01)
+            completed_job = other_queue.get(job.job_id)
+            assert completed_job.status == MpicJobQueue.COMPLETED
+            assert completed_job.response == mock_response
+            assert other_queue.get("../" + job.job_id) is None
+
+            await asyncio.sleep(0.1)
+            assert other_queue.get(job.job_id) is None  # expired, although the accepting worker has not removed it
+            assert accepting_queue.get(job.job_id) is None
+            assert list(tmp_path.iterdir()) == []
+        finally:
+            await accepting_queue.close()
+
+    async def mpic_job_queue__should_report_unfinished_job_as_failed_given_its_worker_is_gone(self, tmp_path):
+        stopped_worker = await asyncio.create_subprocess_exec("true")
+        await stopped_worker.wait()
+        # a job left running by a worker that crashed, so its queue never cleaned up
+        running_job = MpicJob(job_id=uuid.uuid4().hex, status=MpicJobQueue.RUNNING)
+        stored_job = StoredMpicJob(owner_pid=stopped_worker.pid, job=running_job)
+        (tmp_path / f"{running_job.job_id}.json").write_bytes(stored_job.model_dump_json(exclude_none=True).encode())
+
+        other_queue = MpicJobQueue(2, 0, 0.05, AsyncMock(), state_dir=str(tmp_path))
+        failed_job = other_queue.get(running_job.job_id)
+        assert failed_job.status == MpicJobQueue.COMPLETED
+        assert failed_job.status_code == 500
+        assert failed_job.error == MPIC_JOB_WORKER_STOPPED_ERROR
+
+        await asyncio.sleep(0.1)
+        assert other_queue.get(running_job.job_id) is None
+        assert list(tmp_path.iterdir()) == []
+
+    # fmt: off
+    @pytest.mark.parametrize("url, expected_health_url", [
+        ("http://checker.example.com/caa", "http://checker.example.com/healthz"),
+        ("http://checker.example.com/caa/", "http://checker.example.com/healthz"),
+        ("https://example.com/checkers/us-east/dcv", "https://example.com/checkers/us-east/healthz"),
+        ("http://checker:8080", "http://checker:8080/healthz"),  # no path
+        ("http://checker:8080/", "http://checker:8080/healthz"),
+    ])
+    # fmt: on
+    def get_health_url__should_replace_last_path_segment_with_healthz(self, url, expected_health_url):
+        assert MpicCoordinatorService.get_health_url(url) == expected_health_url
+
+    async def call_remote_perspective__should_fail_fast_while_circuit_open_and_close_after_healthy_probe(
+        self, set_env_variables, mocker
+    ):
+        set_env_variables.setenv("circuit_breaker_failure_threshold", "2")
+        set_env_variables.setenv("circuit_breaker_open_seconds", "0.01")
+        service = MpicCoordinatorService()
+        await service.initialize()
+
+        try:
+            # noinspection PyProtectedMember
+            post_mock = mocker.patch.object(
+                service._async_http_client, "post", side_effect=aiohttp.ClientConnectionError("Connection refused")
+            )
+            health_probed = asyncio.Event()
+
+            # noinspection PyUnusedLocal
+            def get_mock(url, headers):
+                assert url == "http://dcv1.example.com/healthz"
+                health_probed.set()
+                return AsyncMock(__aenter__=AsyncMock(return_value=MagicMock(status=200)), __aexit__=AsyncMock())
+
+            # noinspection PyProtectedMember
+            mocker.patch.object(service._async_http_client, "get", side_effect=get_mock)
+
+            perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            for _ in range(2):
+                with pytest.raises(aiohttp.ClientConnectionError):
+                    await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request)
+            with pytest.raises(PerspectiveCircuitOpenException):
+                await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request)
+            assert post_mock.call_count == 2
+
+            await asyncio.wait_for(health_probed.wait(), timeout=1)
+            await asyncio.sleep(0)  # let the probe record its result
+            circuit_breaker_stats = service.get_circuit_breaker_stats()["test-1"][CheckType.DCV]
+            assert circuit_breaker_stats["state"] == PerspectiveCircuitBreaker.CLOSED
+            assert (circuit_breaker_stats["failures"], circuit_breaker_stats["rejections"]) == (2, 1)
+        finally:
+            await service.shutdown()
+
+    async def initialize__should_open_configured_connections_to_every_checker_and_keep_them_warm(
+        self, set_env_variables, mocker
+    ):
+        set_env_variables.setenv("http_client_warm_connections_per_endpoint", "2")
+        set_env_variables.setenv("http_client_keepalive_timeout_seconds", "0.02")
+        warming_urls = []
+        concurrent_requests, max_concurrent_requests = 0, 0
+
+        async def enter_warming_request():
+            nonlocal concurrent_requests, max_concurrent_requests
+            concurrent_requests += 1
+            max_concurrent_requests = max(max_concurrent_requests, concurrent_requests)
+            await asyncio.sleep(0)  # overlapping requests are what keeps several connections open
+            concurrent_requests -= 1
+            return AsyncMock(status=200)
+
+        # noinspection PyUnusedLocal
+        def get_mock(url, headers):
+            warming_urls.append(url)
+            return AsyncMock(__aenter__=AsyncMock(side_effect=enter_warming_request), __aexit__=AsyncMock())
+
+        mocker.patch("aiohttp.ClientSession.get", side_effect=get_mock)
+        service = MpicCoordinatorService()
+        await service.initialize()
+        try:
+            expected_urls = {f"http://{check}{i}.example.com/healthz" for check in ["caa", "dcv"] for i in range(1, 7)}
+            assert set(warming_urls) == expected_urls and len(warming_urls) == 2 * len(expected_urls)
+            assert max_concurrent_requests == len(warming_urls)
+
+            async def wait_for_refresh():
+                while service.get_connection_warming_stats()["warmups"] < 2:
+                    await asyncio.sleep(0.01)
+
+            await asyncio.wait_for(wait_for_refresh(), timeout=2)  # refreshed within the keep-alive timeout
+        finally:
+            await service.shutdown()
+
+    # fmt: off
+    @pytest.mark.parametrize("pool_mode, expected_pools", [
+        ("shared", ["shared", "shared", "shared"]),
+        ("check_type", ["caa", "dcv", "caa"]),
+        ("perspective", ["test-1", "test-1", "test-2"]),
+    ])
+    # fmt: on
+    def get_http_client_pool__should_separate_calls_per_configured_pool_mode(
+        self, set_env_variables, pool_mode, expected_pools
+    ):
+        set_env_variables.setenv("http_client_pool_mode", pool_mode)
+        service = MpicCoordinatorService()
+        calls = [("test-1", CheckType.CAA), ("test-1", CheckType.DCV), ("test-2", CheckType.CAA)]
+        assert [service.get_http_client_pool(code, check_type) for code, check_type in calls] == expected_pools
+
+    async def get_http_client__should_give_each_pool_its_own_connector_limits_and_timeouts(self, set_env_variables):
+        set_env_variables.setenv("http_client_pool_mode", "check_type")
+        set_env_variables.setenv("http_client_limit_per_host", "8")
+        set_env_variables.setenv("http_client_pool_settings", '{"dcv": {"limit_per_host": 2, "timeout_seconds": 3}}')
+        service = MpicCoordinatorService()
+        await service.initialize()
+        try:
+            caa_http_client = service.get_http_client("caa")
+            dcv_http_client = service.get_http_client("dcv")
+            assert service.get_http_client("dcv") is dcv_http_client is not caa_http_client
+            assert (caa_http_client.connector.limit_per_host, dcv_http_client.connector.limit_per_host) == (8, 2)
+            assert (caa_http_client.timeout.sock_read, dcv_http_client.timeout.sock_read) == (15, 3)
+        finally:
+            await service.shutdown()
+        assert caa_http_client.closed and dcv_http_client.closed
+
+    async def call_remote_perspective__should_run_checks_in_process_given_local_endpoints(
+        self, set_env_variables, mocker
+    ):
+        perspectives = TestMpicCoordinatorService.create_perspectives_config_dict()
+        perspectives["test-1"] = PerspectiveEndpoints(
+            caa_endpoint_info=PerspectiveEndpointInfo(url="local://caa"),
+            dcv_endpoint_info=PerspectiveEndpointInfo(url="local://dcv"),
+        )
+        set_env_variables.setenv("perspectives", json.dumps({k: v.model_dump() for k, v in perspectives.items()}))
+        set_env_variables.setenv("local_checker_default_caa_domains", "ca.example.com|ca.example.org")
+        caa_check_response = CaaCheckResponse(
+            check_passed=True, details=CaaCheckResponseDetails(caa_record_present=False)
+        )
+        dcv_check_response = DcvCheckResponse(
+            check_passed=True, details=DcvDnsCheckResponseDetails(validation_method=DcvValidationMethod.ACME_DNS_01)
+        )
+        check_caa_mock = mocker.patch("open_mpic_core.MpicCaaChecker.check_caa", return_value=caa_check_response)
+        check_dcv_mock = mocker.patch("open_mpic_core.MpicDcvChecker.check_dcv", return_value=dcv_check_response)
+        service = MpicCoordinatorService()
+        await service.initialize()
+        try:
+            # noinspection PyProtectedMember
+            post_mock = mocker.patch.object(service._async_http_client, "post")
+            perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+            caa_check_request = ValidCheckCreator.create_valid_caa_check_request()
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            assert await service.call_remote_perspective(perspective, CheckType.CAA, caa_check_request) is (
+                caa_check_response
+            )
+            assert await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request) is (
+                dcv_check_response
+            )
+            check_caa_mock.assert_awaited_once_with(caa_check_request)  # an equal copy, not a serialized form
+            check_dcv_mock.assert_awaited_once_with(dcv_check_request)
+            assert post_mock.call_count == 0
+            # noinspection PyProtectedMember
+            assert service._local_caa_checker.default_caa_domain_list == ["ca.example.com", "ca.example.org"]
+        finally:
+            await service.shutdown()
+
+    async def call_remote_perspective__should_send_original_target_to_remote_perspective_after_local_wildcard_check(
+        self, set_env_variables, mocker
+    ):
+        perspectives = TestMpicCoordinatorService.create_perspectives_config_dict()
+        perspectives["test-1"] = PerspectiveEndpoints(
+            caa_endpoint_info=PerspectiveEndpointInfo(url="local://caa"),
+            dcv_endpoint_info=PerspectiveEndpointInfo(url="local://dcv"),
+        )
+        set_env_variables.setenv("perspectives", json.dumps({k: v.model_dump() for k, v in perspectives.items()}))
+        set_env_variables.setenv("local_checker_default_caa_domains", "ca.example.com")
+        # the real check_caa, which prepares the target of the request for the lookup; only the lookup is mocked
+        mocker.patch("open_mpic_core.MpicCaaChecker.find_caa_records_and_domain", return_value=(None, None))
+        service = MpicCoordinatorService()
+        await service.initialize()
+        try:
+            posted_bodies = []
+
+            def post_mock(url, headers, data):
+                posted_bodies.append(data)
+                caa_check_response = CaaCheckResponse(
+                    check_passed=True, details=CaaCheckResponseDetails(caa_record_present=False)
+                )
+                mock_response = self.create_mock_http_response(200, caa_check_response.model_dump_json())
+                return AsyncMock(
+                    __aenter__=AsyncMock(return_value=mock_response), __aexit__=AsyncMock(return_value=None)
+                )
+
+            # noinspection PyProtectedMember
+            mocker.patch.object(service._async_http_client, "post", side_effect=post_mock)
+            caa_check_request = ValidCheckCreator.create_valid_caa_check_request()
+            caa_check_request.domain_or_ip_target = "*.example.com"
+            for perspective_code in ["test-1", "test-2"]:  # local first, then remote
+                perspective = RemotePerspective(code=perspective_code, rir=RegionalInternetRegistry.ARIN)
+                await service.call_remote_perspective(perspective, CheckType.CAA, caa_check_request)
+
+            assert caa_check_request.domain_or_ip_target == "*.example.com"
+            assert CaaCheckRequest.model_validate_json(posted_bodies[0]).domain_or_ip_target == "*.example.com"
+        finally:
+            await service.shutdown()
+
+    def constructor__should_raise_error_given_local_caa_endpoint_without_default_caa_domains(self, set_env_variables):
+        perspectives = TestMpicCoordinatorService.create_perspectives_config_dict()
+        perspectives["test-1"].caa_endpoint_info = PerspectiveEndpointInfo(url="local://caa")
+        set_env_variables.setenv("perspectives", json.dumps({k: v.model_dump() for k, v in perspectives.items()}))
+        with pytest.raises(ValueError, match="local_checker_default_caa_domains"):
+            MpicCoordinatorService()
+
+    async def call_remote_perspective__should_multiplex_checks_over_one_check_channel_given_websocket_transport(
+        self, set_env_variables
+    ):
+        async def handle_check_channel(request):
+            websocket = aiohttp.web.WebSocketResponse()
+            await websocket.prepare(request)
+            frames = [json.loads(await websocket.receive_bytes()) for _ in range(2)]
+            for frame in reversed(frames):  # answer out of order
+                check_response = CaaCheckResponse(
+                    check_passed=True,
+                    details=CaaCheckResponseDetails(
+                        caa_record_present=True, found_at=frame["request"]["domain_or_ip_target"]
+                    ),
+                )
+                await websocket.send_bytes(
+                    b'{"id":%d,"response":%b}' % (frame["id"], check_response.model_dump_json().encode())
+                )
+            await websocket.close()
+            return websocket
+
+        checker_app = aiohttp.web.Application()
+        checker_app.router.add_get("/caa/ws", handle_check_channel)
+        async with TestServer(checker_app) as checker_server:
+            perspectives = TestMpicCoordinatorService.create_perspectives_config_dict()
+            perspectives["test-1"].caa_endpoint_info = PerspectiveEndpointInfo(url=str(checker_server.make_url("/caa")))
+            set_env_variables.setenv("perspectives", json.dumps({k: v.model_dump() for k, v in perspectives.items()}))
+            set_env_variables.setenv("perspective_transport", "websocket")
+            service = MpicCoordinatorService()
+            await service.initialize()
+            try:
+                perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+                check_requests = [ValidCheckCreator.create_valid_caa_check_request() for _ in range(2)]
+                check_requests[1].domain_or_ip_target = "other.example.com"
+                check_responses = await asyncio.gather(
+                    *[
+                        service.call_remote_perspective(perspective, CheckType.CAA, request)
+                        for request in check_requests
+                    ]
+                )
+                assert [response.details.found_at for response in check_responses] == [
+                    request.domain_or_ip_target for request in check_requests
+                ]
+                channel_stats = service.get_check_channel_stats()[str(checker_server.make_url("/caa/ws"))]
+                assert channel_stats["connections"] == 1
+            finally:
+                await service.shutdown()
+
+    async def call_remote_perspective__should_balance_calls_across_replicas_and_eject_failing_replica(
+        self, set_env_variables, mocker
+    ):
+        perspectives = TestMpicCoordinatorService.create_perspectives_config_dict()
+        perspectives["test-1"].dcv_endpoint_info = PerspectiveEndpointInfo(
+            url="http://dcv1a.example.com/dcv",
+            replica_urls=["http://dcv1b.example.com/dcv", "http://dcv1c.example.com/dcv"],
+        )
+        set_env_variables.setenv("perspectives", json.dumps({k: v.model_dump() for k, v in perspectives.items()}))
+        set_env_variables.setenv("replica_ejection_failure_threshold", "2")
+        service = MpicCoordinatorService()
+        await service.initialize()
+        try:
+            called_urls = []
+
+            # noinspection PyUnusedLocal
+            def post_mock(url, headers, data):
+                called_urls.append(url)
+                if url == "http://dcv1b.example.com/dcv":
+                    raise aiohttp.ClientConnectionError("Connection refused")
+                return self.create_successful_api_call_response_for_dcv_check(url, headers, data)
+
+            # noinspection PyProtectedMember
+            mocker.patch.object(service._async_http_client, "post", side_effect=post_mock)
+            perspective = RemotePerspective(code="test-1", rir=RegionalInternetRegistry.ARIN)
+            dcv_check_request = ValidCheckCreator.create_valid_dns_check_request()
+            failed_calls = 0
+            for _ in range(60):
+                try:
+                    await service.call_remote_perspective(perspective, CheckType.DCV, dcv_check_request)
+                except aiohttp.ClientConnectionError:
+                    failed_calls += 1
+
+            assert set(called_urls) == set(perspectives["test-1"].dcv_endpoint_info.get_urls())
+            assert failed_calls == 2  # then the failing replica is ejected
+            replica_stats = service.get_replica_balancer_stats()["http://dcv1a.example.com/dcv"]
+            assert replica_stats["http://dcv1b.example.com/dcv"]["ejected"] is True
+            assert replica_stats["http://dcv1b.example.com/dcv"]["ejections"] == 1
+            assert replica_stats["http://dcv1a.example.com/dcv"]["latency_seconds"] is not None
+            assert replica_stats["http://dcv1a.example.com/dcv"]["outstanding_calls"] == 0
+        finally:
+            await service.shutdown()
+
+    # fmt: off
+    @pytest.mark.parametrize("strategy", ["power_of_two_choices", "least_outstanding"])
+    # fmt: on
+    def perspective_replica_balancer__should_prefer_less_loaded_replicas_and_use_all_once_all_ejected(self, strategy):
+        balancer = PerspectiveReplicaBalancer(["a", "b"], strategy, ejection_failure_threshold=1, ejection_seconds=30)
+        with balancer.track_call() as first_url:
+            with balancer.track_call() as second_url:
+                assert {first_url, second_url} == {"a", "b"}  # the second call avoids the busy replica
+        with pytest.raises(RuntimeError):
+            with balancer.track_call() as failed_url:
+                raise RuntimeError("Check failed")
+        with balancer.track_call() as url:
+            assert url != failed_url
+        with pytest.raises(RuntimeError):
+            with balancer.track_call():
+                raise RuntimeError("Check failed")
+        with balancer.track_call() as url:  # every replica is ejected, so the balancer still picks one
+            assert url in ("a", "b")
+        assert sum(replica_stats["ejections"] for replica_stats in balancer.get_stats().values()) == 2
+
+    def perspective_circuit_breaker__should_open_only_after_consecutive_failures_reach_threshold(self):
+        circuit_breaker = PerspectiveCircuitBreaker(failure_threshold=3, open_seconds=30)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure(is_timeout=True)
+        circuit_breaker.record_success()  # resets the consecutive failure count
+        assert circuit_breaker.record_failure() is False
+        assert circuit_breaker.record_failure() is False
+        assert circuit_breaker.record_failure() is True
+        assert circuit_breaker.allow_call() is False
+        assert circuit_breaker.get_stats()["timeouts"] == 1
+        assert 0 < circuit_breaker.health_score < 1
+
+    def perspective_latency_tracker__should_return_percentile_only_given_enough_samples(self):
+        tracker = PerspectiveLatencyTracker(window_size=100, min_samples=10)
+        for latency in range(1, 10):
+            tracker.record("test-1", CheckType.CAA, latency / 100)
+        assert tracker.get_percentile("test-1", CheckType.CAA, 95) is None
+        for latency in range(10, 201):  # only the last 100 samples (1.01 to 2.00 seconds) are kept
+            tracker.record("test-1", CheckType.CAA, latency / 100)
+        assert tracker.get_percentile("test-1", CheckType.CAA, 95) == 1.96
+        assert tracker.get_percentile("test-1", CheckType.DCV, 95) is None
+
+    def check_response_cache__should_evict_least_recently_used_entries_and_expire_stale_ones(self, mocker):
+        check_response = CaaCheckResponse(
+            check_completed=True, check_passed=True, details=CaaCheckResponseDetails(caa_record_present=False)
+        )
+        monotonic_mock = mocker.patch("mpic_coordinator_service.main.time.monotonic", return_value=100.0)
+        cache = CheckResponseCache(ttl_seconds=10, max_entries=2)
+        cache.put(("test-1", CheckType.CAA, "a"), check_response)
+        cache.put(("test-1", CheckType.CAA, "b"), check_response)
+        assert cache.get(("test-1", CheckType.CAA, "a")) is check_response  # 'a' is now most recently used
+        cache.put(("test-1", CheckType.CAA, "c"), check_response)  # evicts 'b'
+        assert cache.get(("test-1", CheckType.CAA, "b")) is None
+        monotonic_mock.return_value = 111.0
+        assert cache.get(("test-1", CheckType.CAA, "a")) is None
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (1, 2, 1, 1)
+        assert stats["size"] == 1
+
+    async def reload_perspective_configuration__should_swap_in_new_perspectives_while_in_flight_requests_keep_old(
+        self, set_env_variables, mocker, tmp_path
+    ):
+        perspectives = TestMpicCoordinatorService.create_perspectives_config_dict()
+        config_file = tmp_path / "app.conf"
+        config_file.write_text(
+            f"perspectives={json.dumps({k: v.model_dump() for k, v in perspectives.items()})}\n"
+            "default_perspective_count=2\n"
+        )
+        mocker.patch.object(main_module, "config_path", config_file)
+        set_env_variables.delenv("perspectives")  # read from app.conf, so that reloads pick up changes to it
+        set_env_variables.delenv("default_perspective_count")
+        service = MpicCoordinatorService()
+
+        release_coordination = asyncio.Event()
+
+        async def coordinate_mpic(mpic_request):
+            await release_coordination.wait()
+            return service.get_endpoint_info(CheckType.CAA, "test-1").url
+
+        mocker.patch.object(service.mpic_coordinator, "coordinate_mpic", side_effect=coordinate_mpic)
+        in_flight = asyncio.create_task(
+            service.coordinate_mpic(ValidMpicRequestCreator.create_valid_caa_mpic_request())
+        )
+        await asyncio.sleep(0)
+
+        reloaded_perspectives = {code: perspectives[code] for code in ["test-1", "test-2", "test-3"]}
+        reloaded_perspectives["test-1"].caa_endpoint_info.url = "http://caa1-moved.example.com/caa"
+        config_file.write_text(
+            f"perspectives={json.dumps({k: v.model_dump() for k, v in reloaded_perspectives.items()})}\n"
+            "default_perspective_count=3\n"
+        )
+        assert service.reload_perspective_configuration() is True
+
+        assert service.all_target_perspective_codes == ["test-1", "test-2", "test-3"]
+        assert service.default_perspective_count == service.mpic_coordinator.default_perspective_count == 3
+        assert service.get_endpoint_info(CheckType.CAA, "test-1").url == "http://caa1-moved.example.com/caa"
+        release_coordination.set()
+        assert await in_flight == "http://caa1.example.com/caa"  # finished on the configuration it started with
+
+        config_file.write_text("perspectives={not json\ndefault_perspective_count=3\n")
+        assert service.reload_perspective_configuration() is False
+        assert service.get_perspective_configuration_stats() == {
+            "target_perspective_codes": ["test-1", "test-2", "test-3"],
+            "default_perspective_count": 3,
+            "reloads": 1,
+            "failed_reloads": 1,
+        }
+
+    def service__should_return_check_response_cache_stats_given_stats_request(self, set_env_variables):
+        set_env_variables.setenv("check_response_cache_ttl_seconds", "30")
+        with TestClient(app) as client:
+            response = client.get("/statsz")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["check_response_cache"]["hits"] == 0
+
+    async def perform_mpic__should_coalesce_identical_in_flight_requests_keeping_own_trace_identifiers(
+        self, set_env_variables, mocker
+    ):
+        set_env_variables.setenv("coalesce_identical_mpic_requests", "True")
+        service = MpicCoordinatorService()
+        release_coordination = asyncio.Event()
+
+        async def coordinate_mpic(mpic_request):
+            await release_coordination.wait()
+            return TestMpicCoordinatorService.create_caa_mpic_response().model_copy(
+                update={"trace_identifier": mpic_request.trace_identifier}
+            )
+
+        coordinate_mpic_mock = mocker.patch.object(
+            service.mpic_coordinator, "coordinate_mpic", side_effect=coordinate_mpic
+        )
+
+        requests = []
+        for trace_identifier in ["trace-1", "trace-2", "trace-3"]:
+            request = ValidMpicRequestCreator.create_valid_caa_mpic_request()
+            request.trace_identifier = trace_identifier
+            requests.append(request)
+        different_request = ValidMpicRequestCreator.create_valid_caa_mpic_request()
+        different_request.domain_or_ip_target = "other.example.com"
+
+        pending_responses = asyncio.gather(
+            *[service.perform_mpic(request) for request in requests + [different_request]]
+        )
+        await asyncio.sleep(0)  # let all requests reach the coordinator
+        release_coordination.set()
+        responses = await pending_responses
+
+        assert coordinate_mpic_mock.call_count == 2
+        assert [response.trace_identifier for response in responses[:3]] == ["trace-1", "trace-2", "trace-3"]
+        assert service.get_mpic_request_coalescing_stats() == {"in_flight": 0, "coalesced": 2}
+
+    async def perform_mpic__should_not_coalesce_requests_given_coalescing_disabled(self, set_env_variables, mocker):
+        service = MpicCoordinatorService()
+        coordinate_mpic_mock = mocker.patch.object(
+            service.mpic_coordinator,
+            "coordinate_mpic",
+            new=AsyncMock(return_value=TestMpicCoordinatorService.create_caa_mpic_response()),
+        )
+        request = ValidMpicRequestCreator.create_valid_caa_mpic_request()
+        await asyncio.gather(service.perform_mpic(request), service.perform_mpic(request))
+        assert coordinate_mpic_mock.call_count == 2
+
     def service__should_read_in_environment_configuration_through_config_file(self, set_some_env_variables):
         mpic_coordinator_service = MpicCoordinatorService()
         # it'll read in the placeholder values in the config files -- that's acceptable for this particular test
@@ -162,6 +1123,7 @@ class TestMpicCoordinatorService:
         with TestClient(app) as client:
             response = client.post("/mpic", json=request.model_dump())
         assert response.status_code == 500
+        assert response.json() == {"error": "Something went wrong"}
 
     def service__should_coordinate_mpic_using_configured_mpic_coordinator(self, set_env_variables, mocker):
         request = ValidMpicRequestCreator.create_valid_mpic_request(CheckType.CAA)
@@ -176,13 +1138,213 @@ class TestMpicCoordinatorService:
         result_body = json.loads(response.text)
         assert result_body["is_valid"] is True
 
-    def service__should_return_healthy_status_given_health_check_request(self):
+    def service__should_report_stage_timings_of_mpic_request_in_server_timing_header(self, set_env_variables, mocker):
+        request = ValidMpicRequestCreator.create_valid_mpic_request(CheckType.CAA)
+        awaitable_mock_response = AsyncMock(return_value=TestMpicCoordinatorService.create_caa_mpic_response())
+        mocker.patch("open_mpic_core.MpicCoordinator.coordinate_mpic", new=awaitable_mock_response)
+
+        with TestClient(app) as client:
+            response = client.post("/mpic", json=request.model_dump())
+            metrics_text = client.get("/metrics").text
+        assert response.status_code == status.HTTP_200_OK
+        stages = [timing.split(";dur=")[0] for timing in response.headers["server-timing"].split(", ")]
+        assert stages == ["body_read", "validation", "coordination", "serialization"]
+        assert 'mpic_http_request_stage_duration_seconds_count{route="/mpic",stage="coordination"}' in metrics_text
+
+    def service__should_document_mpic_request_body_in_openapi_schema(self, set_env_variables):
+        with TestClient(app) as client:
+            openapi_schema = client.get("/openapi.json").json()
+
+        request_body = openapi_schema["paths"]["/mpic"]["post"]["requestBody"]
+        assert request_body["required"] is True
+        assert request_body["content"]["application/json"]["schema"]["anyOf"] == [
+            {"$ref": "#/components/schemas/MpicCaaRequest"},
+            {"$ref": "#/components/schemas/MpicDcvRequest"},
+        ]
+        assert {"MpicCaaRequest", "MpicDcvRequest"} <= openapi_schema["components"]["schemas"].keys()
+
+    def service__should_return_batch_results_in_order_with_per_item_errors_given_batch_request(
+        self, set_env_variables, mocker
+    ):
+        async def coordinate_mpic(mpic_request):
+            if mpic_request.domain_or_ip_target == "failure.example.com":
+                raise Exception("Something went wrong")
+            return TestMpicCoordinatorService.create_caa_mpic_response()
+
+        mocker.patch("open_mpic_core.MpicCoordinator.coordinate_mpic", side_effect=coordinate_mpic)
+
+        valid_request = ValidMpicRequestCreator.create_valid_caa_mpic_request()
+        invalid_request = ValidMpicRequestCreator.create_valid_dcv_mpic_request()
+        invalid_request.check_type = "invalid_check_type"
+        failing_request = ValidMpicRequestCreator.create_valid_caa_mpic_request()
+        failing_request.domain_or_ip_target = "failure.example.com"
+        batch = [request.model_dump() for request in [valid_request, invalid_request, failing_request]]
+
+        with TestClient(app) as client:
+            response = client.post("/mpic/batch", json=batch)
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()
+        assert [result["index"] for result in results] == [0, 1, 2]
+        assert [result["status_code"] for result in results] == [200, 400, 500]
+        assert results[0]["response"]["is_valid"] is True
+        assert results[1]["validation_issues"][0]["type"] == "literal_error"
+        assert results[2]["error"] == "Something went wrong"
+
+    def service__should_stream_batch_results_as_ndjson_given_ndjson_accept_header(self, set_env_variables, mocker):
+        mock_response = TestMpicCoordinatorService.create_caa_mpic_response()
+        mocker.patch("open_mpic_core.MpicCoordinator.coordinate_mpic", new=AsyncMock(return_value=mock_response))
+        batch = [ValidMpicRequestCreator.create_valid_caa_mpic_request().model_dump() for _ in range(3)]
+
+        with TestClient(app) as client:
+            response = client.post("/mpic/batch", json=batch, headers={"Accept": "application/x-ndjson"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(result["index"] for result in results) == [0, 1, 2]
+        assert all(result["status_code"] == 200 for result in results)
+
+    @pytest.mark.parametrize("accept_header", ["text/event-stream", "application/x-ndjson"])
+    def service__should_stream_perspective_responses_then_mpic_response_given_stream_request(
+        self, set_env_variables, accept_header, mocker
+    ):
+        request = ValidMpicRequestCreator.create_valid_dcv_mpic_request()
+
+        with TestClient(app) as client:
+            # noinspection PyProtectedMember
+            mocker.patch.object(
+                main_module.get_service()._async_http_client,
+                "post",
+                side_effect=self.create_successful_api_call_response_for_dcv_check,
+            )
+            response = client.post("/mpic/stream", json=request.model_dump(), headers={"Accept": accept_header})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith(accept_header)
+        if accept_header == "application/x-ndjson":
+            events = [json.loads(line) for line in response.text.splitlines()]
+        else:
+            events = [
+                {"event": lines[0].removeprefix("event: "), "data": json.loads(lines[1].removeprefix("data: "))}
+                for lines in (block.splitlines() for block in response.text.strip().split("\n\n"))
+            ]
+        assert [event["event"] for event in events] == ["perspective"] * 6 + ["result"]
+        perspective_codes = {event["data"]["perspective_code"] for event in events[:-1]}
+        assert perspective_codes == {f"test-{i}" for i in range(1, 7)}
+        assert events[-1]["data"]["is_valid"] is True
+        assert len(events[-1]["data"]["perspectives"]) == 6
+
+    def service__should_return_400_error_before_streaming_given_logically_invalid_stream_request(
+        self, set_env_variables
+    ):
+        request = ValidMpicRequestCreator.create_valid_dcv_mpic_request()
+        request.orchestration_parameters.perspective_count = 1
+        with TestClient(app) as client:
+            response = client.post("/mpic/stream", json=request.model_dump())
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["validation_issues"][0]["issue_type"] == "invalid-perspective-count"
+
+    def service__should_accept_mpic_job_and_report_its_result_given_job_requests(self, set_env_variables, mocker):
+        mock_response = TestMpicCoordinatorService.create_caa_mpic_response()
+        mocker.patch("open_mpic_core.MpicCoordinator.coordinate_mpic", new=AsyncMock(return_value=mock_response))
+        request = ValidMpicRequestCreator.create_valid_caa_mpic_request()
+
+        with TestClient(app) as client:
+            submission = client.post("/mpic/jobs", json=request.model_dump())
+            assert submission.status_code == status.HTTP_202_ACCEPTED
+            job_id = submission.json()["job_id"]
+            assert submission.headers["location"] == f"/mpic/jobs/{job_id}"
+
+            job = submission.json()
+            for _ in range(100):
+                job = client.get(f"/mpic/jobs/{job_id}").json()
+                if job["status"] == "completed":
+                    break
+            unknown_job = client.get("/mpic/jobs/unknown")
+
+        assert job["status"] == "completed"
+        assert job["status_code"] == 200
+        assert job["response"]["is_valid"] == mock_response.is_valid
+        assert unknown_job.status_code == status.HTTP_404_NOT_FOUND
+
+    def service__should_return_503_given_full_mpic_job_queue(self, set_env_variables, mocker):
+        set_env_variables.setenv("mpic_job_queue_depth", "1")
+        set_env_variables.setenv("mpic_job_workers", "0")  # nothing drains the queue
+        request = ValidMpicRequestCreator.create_valid_caa_mpic_request()
+
+        with TestClient(app) as client:
+            first_submission = client.post("/mpic/jobs", json=request.model_dump())
+            second_submission = client.post("/mpic/jobs", json=request.model_dump())
+
+        assert first_submission.status_code == status.HTTP_202_ACCEPTED
+        assert second_submission.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert second_submission.json() == {"error": "job-queue-full"}
+        assert second_submission.headers["retry-after"] == "1"
+
+    def service__should_return_400_error_given_batch_exceeding_max_size(self, set_env_variables):
+        set_env_variables.setenv("mpic_batch_max_size", "2")
+        batch = [ValidMpicRequestCreator.create_valid_caa_mpic_request().model_dump() for _ in range(3)]
+
+        with TestClient(app) as client:
+            response = client.post("/mpic/batch", json=batch)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["validation_issues"][0]["type"] == "too_long"
+
+    def service__should_return_healthy_status_given_health_check_request(self, set_env_variables):
         with TestClient(app) as client:
             response = client.get("/healthz")
 
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == {"status": "healthy"}
 
+    def service__should_expose_prometheus_metrics_given_metrics_request(self, set_env_variables):
+        with TestClient(app) as client:
+            client.get("/healthz")
+            response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (
+            'mpic_http_request_duration_seconds_count{method="GET",route="/healthz",status_code="200"}' in response.text
+        )
+        assert "mpic_event_loop_lag_seconds_count" in response.text
+
+    def service__should_trace_mpic_and_propagate_trace_context_to_perspectives_given_tracing_enabled(
+        self, set_env_variables, mocker
+    ):
+        span_exporter = InMemorySpanExporter()
+        configure_tracing("mpic-coordinator", span_exporter)
+        request = ValidMpicRequestCreator.create_valid_mpic_request(CheckType.DCV)
+        request.trace_identifier = "test-trace-identifier"
+        posted_headers = []
+
+        def post_mock(url, headers, data):
+            posted_headers.append(headers)
+            return self.create_successful_api_call_response_for_dcv_check(url, headers, data)
+
+        try:
+            with TestClient(app) as client:
+                # noinspection PyProtectedMember
+                mocker.patch.object(main_module.get_service()._async_http_client, "post", side_effect=post_mock)
+                response = client.post("/mpic", json=request.model_dump())
+        finally:
+            shutdown_tracing()
+
+        assert response.status_code == status.HTTP_200_OK
+        spans = span_exporter.get_finished_spans()
+        mpic_span = next(span for span in spans if span.name == "mpic")
+        assert mpic_span.attributes["mpic.trace_identifier"] == request.trace_identifier
+        assert any(span.name == "POST /mpic" for span in spans)
+        assert any(span.name == "mpic.fan_out" for span in spans)
+        perspective_call_spans = [span for span in spans if span.name == "mpic.perspective_call"]
+        assert len(perspective_call_spans) == len(posted_headers) > 0
+        # each perspective call carries its own span as the parent of the checker's spans
+        trace_id = format(mpic_span.context.trace_id, "032x")
+        assert {headers["traceparent"] for headers in posted_headers} == {
+            f"00-{trace_id}-{format(span.context.span_id, '016x')}-01" for span in perspective_call_spans
+        }
+
     def service__should_set_log_level_of_mpic_coordinator(self, set_env_variables, setup_logging, mocker):
         perspectives_codes = TestMpicCoordinatorService.create_perspectives_config_dict().keys()
         request = ValidMpicRequestCreator.create_valid_mpic_request(CheckType.CAA)
@@ -243,10 +1405,10 @@ class TestMpicCoordinatorService:
         }
         return perspectives_as_dict
 
-    # noinspection PyUnusedLocal,PyShadowingNames
-    def create_successful_api_call_response_for_dcv_check(self, url, headers, json):
-        # json arg in requests.post() is a "json serializable object" (dict) rather than an actual json string
-        check_request = DcvCheckRequest.model_validate(json)
+    # noinspection PyUnusedLocal
+    def create_successful_api_call_response_for_dcv_check(self, url, headers, data):
+        # data arg in post() is the pre-encoded json body (bytes)
+        check_request = DcvCheckRequest.model_validate_json(data)
         # hijacking the value of 'perspective_code' to verify that the right arguments got passed to the call
         expected_response_body = DcvCheckResponse(
             check_passed=True,
@@ -260,6 +1422,15 @@ class TestMpicCoordinatorService:
         )
         return expected_response
 
+    @staticmethod
+    def create_post_mock_returning(check_response):
+        # noinspection PyUnusedLocal
+        def post_mock(*args, **kwargs):
+            mock_response = TestMpicCoordinatorService.create_mock_http_response(200, check_response.model_dump_json())
+            return AsyncMock(__aenter__=AsyncMock(return_value=mock_response), __aexit__=AsyncMock(return_value=None))
+
+        return post_mock
+
     @staticmethod
     def create_old_mock_http_response(status_code: int, content: str, kwargs: dict = None):
         response = Response()
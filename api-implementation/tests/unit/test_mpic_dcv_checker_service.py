@@ -1,3 +1,4 @@
+import json
 import time
 import re
 import pytest
@@ -80,6 +81,55 @@ class TestMpicDcvCheckerService:
         assert response.status_code == expected_status_code
         assert response.json() == mock_dcv_response.model_dump()
 
+    def service__should_record_status_code_of_http_endpoint_given_check_channel_check_with_errors(self, mocker):
+        mock_dcv_response = TestMpicDcvCheckerService.create_dcv_check_response()
+        mock_dcv_response.check_passed = False
+        mock_dcv_response.errors = [MpicValidationError(error_type="404", error_message="Not Found")]
+        mocker.patch("open_mpic_core.MpicDcvChecker.check_dcv", new=AsyncMock(return_value=mock_dcv_response))
+        dcv_check_request = ValidCheckCreator.create_valid_http_check_request()
+
+        with TestClient(main_module.app) as client:
+            with client.websocket_connect("/dcv/ws") as websocket:
+                websocket.send_bytes(b'{"id":1,"request":%b}' % dcv_check_request.model_dump_json().encode())
+                frame = json.loads(websocket.receive_bytes())
+            metrics_text = client.get("/metrics").text
+
+        assert frame["response"] == json.loads(mock_dcv_response.model_dump_json())
+        labels = 'method="WEBSOCKET",route="/dcv/ws",status_code="404"'
+        assert f"mpic_http_request_duration_seconds_count{{{labels}}}" in metrics_text
+
+    def service__should_return_422_error_given_invalid_request_body(self):
+        check_request = ValidCheckCreator.create_valid_http_check_request().model_dump()
+        del check_request["domain_or_ip_target"]
+
+        with TestClient(main_module.app) as client:
+            response = client.post("/dcv", json=check_request)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["type"] == "missing"
+        assert response.json()["detail"][0]["loc"] == ["body", "domain_or_ip_target"]
+
+    def service__should_run_batch_of_checks_and_report_failed_checks_as_null_given_batch_request(self, mocker):
+        mock_dcv_response = TestMpicDcvCheckerService.create_dcv_check_response()
+
+        async def check_dcv(dcv_request):
+            if dcv_request.domain_or_ip_target == "fail.example.com":
+                raise Exception("Something went wrong")
+            return mock_dcv_response
+
+        mocker.patch("open_mpic_core.MpicDcvChecker.check_dcv", side_effect=check_dcv)
+        check_requests = []
+        for domain in ["example.com", "fail.example.com", "example.org"]:
+            check_request = ValidCheckCreator.create_valid_http_check_request()
+            check_request.domain_or_ip_target = domain
+            check_requests.append(check_request.model_dump())
+
+        with TestClient(main_module.app) as client:
+            response = client.post("/dcv/batch", json=check_requests)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [mock_dcv_response.model_dump(), None, mock_dcv_response.model_dump()]
+
     def service__should_return_healthy_status_given_health_check_request(self):
         with TestClient(main_module.app) as client:
             response = client.get("/healthz")
@@ -87,6 +137,17 @@ class TestMpicDcvCheckerService:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == {"status": "healthy"}
 
+    def service__should_report_request_metrics_given_metrics_request(self, mocker):
+        dcv_check_request = ValidCheckCreator.create_valid_http_check_request()
+        check_response = TestMpicDcvCheckerService.create_dcv_check_response()
+        mocker.patch("open_mpic_core.MpicDcvChecker.perform_http_based_validation", return_value=check_response)
+        with TestClient(main_module.app) as client:
+            client.post("/dcv", json=dcv_check_request.model_dump())
+            response = client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert 'mpic_http_request_duration_seconds_count{method="POST",route="/dcv",status_code="200"}' in response.text
+        assert 'mpic_http_requests_in_flight{method="GET"} 1.0' in response.text  # the metrics request itself
+
     def service__should_set_log_level_of_dcv_checker(self, mocker, setup_logging):
         dcv_check_request = ValidCheckCreator.create_valid_http_check_request()
         check_response = TestMpicDcvCheckerService.create_dcv_check_response()
@@ -0,0 +1,117 @@
+import json
+import asyncio
+import pytest
+
+from fastapi import FastAPI, Request
+from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from pydantic import TypeAdapter
+
+from open_mpic_core import CaaCheckRequest
+
+from mpic_service_common.admission import AdmissionController, AdmissionRejectedException, get_admission_settings
+from mpic_service_common.request_body import document_request_bodies, validate_request_body
+from mpic_service_common.tracing import configure_tracing, create_span_exporter, get_tracer, shutdown_tracing
+from mpic_service_common.tracing import inject_trace_context
+
+
+# noinspection PyMethodMayBeStatic
+class TestMpicServiceCommon:
+    # fmt: off
+    @pytest.mark.parametrize("exporter_name, expected_exporter_type", [
+        ("memory", InMemorySpanExporter),
+        ("console", ConsoleSpanExporter),
+        ("opentelemetry.sdk.trace.export.in_memory_span_exporter:InMemorySpanExporter", InMemorySpanExporter),
+    ])
+    # fmt: on
+    def create_span_exporter__should_create_configured_exporter(self, exporter_name, expected_exporter_type):
+        assert isinstance(create_span_exporter(exporter_name), expected_exporter_type)
+
+    @pytest.mark.parametrize("exporter_name", [None, "", "none"])
+    def create_span_exporter__should_return_none_given_tracing_disabled(self, exporter_name):
+        assert create_span_exporter(exporter_name) is None
+
+    def create_span_exporter__should_write_spans_as_json_lines_given_file_exporter(self, tmp_path):
+        trace_file = tmp_path / "traces.jsonl"
+        configure_tracing("test-service", create_span_exporter("file", str(trace_file)))
+        try:
+            with get_tracer().start_as_current_span("outer"):
+                with get_tracer().start_as_current_span("inner"):
+                    pass
+        finally:
+            shutdown_tracing()
+
+        spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        assert [span["name"] for span in spans] == ["inner", "outer"]
+        assert spans[0]["resource"]["attributes"]["service.name"] == "test-service"
+
+    def inject_trace_context__should_leave_headers_untouched_given_tracing_disabled(self):
+        headers = {"Content-Type": "application/json"}
+        with get_tracer().start_as_current_span("not-recorded"):
+            assert inject_trace_context(headers) is headers
+
+    async def admission_controller__should_reject_with_429_given_queue_full(self):
+        admission_controller = AdmissionController(1, 1, 10, 1)
+        await admission_controller.acquire()
+        queued = asyncio.create_task(admission_controller.acquire())
+        await asyncio.sleep(0)  # let the second request join the queue
+        with pytest.raises(AdmissionRejectedException) as exc_info:
+            await admission_controller.acquire()
+        assert exc_info.value.status_code == 429
+        admission_controller.release()
+        await queued
+        assert admission_controller.get_stats()["rejected_queue_full"] == 1
+
+    async def admission_controller__should_reject_with_503_given_no_slot_frees_up_within_max_queue_wait(self):
+        admission_controller = AdmissionController(1, 10, 0.01, 1)
+        await admission_controller.acquire()
+        with pytest.raises(AdmissionRejectedException) as exc_info:
+            await admission_controller.acquire()
+        assert exc_info.value.status_code == 503
+        stats = admission_controller.get_stats()
+        assert (stats["in_flight"], stats["queued"], stats["rejected_queue_timeout"]) == (1, 0, 1)
+
+    async def admission_controller__should_hand_released_slots_to_queued_requests_in_order(self):
+        admission_controller = AdmissionController(1, 10, 10, 1)
+        await admission_controller.acquire()
+        admitted = []
+
+        async def acquire(name):
+            await admission_controller.acquire()
+            admitted.append(name)
+
+        waiters = [asyncio.create_task(acquire(name)) for name in ["first", "second"]]
+        await asyncio.sleep(0)
+        admission_controller.release()
+        await waiters[0]
+        assert admitted == ["first"] and admission_controller.in_flight == 1
+        admission_controller.release()
+        await waiters[1]
+        admission_controller.release()
+        assert admitted == ["first", "second"] and admission_controller.in_flight == 0
+
+    def admission_controller__should_be_built_from_environment_only_given_concurrency_limit(self, monkeypatch):
+        for name in get_admission_settings():
+            monkeypatch.delenv(name, raising=False)
+        assert AdmissionController.from_environment() is None  # off by default
+
+        monkeypatch.setenv("admission_max_concurrent_requests", "8")
+        monkeypatch.setenv("admission_max_queue_wait_seconds", "0.5")
+        admission_controller = AdmissionController.from_environment()
+        stats = admission_controller.get_stats()
+        assert (stats["max_concurrency"], stats["max_queue_length"], stats["max_queue_wait_seconds"]) == (8, 100, 0.5)
+        assert admission_controller.retry_after_seconds == 1
+
+    def document_request_bodies__should_add_body_schema_and_its_models_to_openapi_schema(self):
+        app = FastAPI()
+
+        @app.post("/check")
+        async def handle_check(request: Request):
+            return validate_request_body(TypeAdapter(CaaCheckRequest), await request.body())
+
+        document_request_bodies(app, {"/check": list[CaaCheckRequest]})
+        openapi_schema = app.openapi()
+
+        body_schema = openapi_schema["paths"]["/check"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+        assert body_schema == {"type": "array", "items": {"$ref": "#/components/schemas/CaaCheckRequest"}}
+        assert {"CaaCheckRequest", "CaaCheckParameters"} <= openapi_schema["components"]["schemas"].keys()
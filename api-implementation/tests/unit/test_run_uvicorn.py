@@ -0,0 +1,196 @@
+import io
+import os
+import sys
+import json
+import time
+import httpx
+import signal
+import socket
+import pytest
+import subprocess
+
+from contextlib import suppress
+from pathlib import Path
+
+import run_uvicorn
+
+# a minimal app for run_prefork to import as 'main'; each worker leaves a file named after its pid in pids/ on startup
+STUB_APP_MODULE = """
+import os
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                open(os.path.join("pids", str(os.getpid())), "w").close()
+                await send({"type": "lifespan.startup.complete"})
+            else:
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+"""
+
+
+# noinspection PyMethodMayBeStatic
+class TestRunUvicorn:
+    @staticmethod
+    @pytest.fixture(scope="function")
+    def cgroup_files(mocker):
+        """
+        Replaces the files run_uvicorn reads with the contents put in the returned dict (path -> content); files not
+        in it do not exist.
+        """
+        files = {}
+
+        # noinspection PyUnusedLocal
+        def open_file(path, mode="r"):
+            if path not in files:
+                raise FileNotFoundError(path)
+            return io.StringIO(files[path])
+
+        mocker.patch.object(run_uvicorn, "open", side_effect=open_file, create=True)
+        return files
+
+    # fmt: off
+    @pytest.mark.parametrize("files, expected_cpu_quota", [
+        ({"/sys/fs/cgroup/cpu.max": "max 100000\n"}, None),  # cgroup v2 without limit
+        ({"/sys/fs/cgroup/cpu.max": "150000 100000\n"}, 1.5),
+        ({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "-1\n", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000\n"}, None),
+        ({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "50000\n", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000\n"}, 0.5),
+        ({}, None),  # no cgroup CPU controller
+    ])
+    # fmt: on
+    def get_cgroup_cpu_quota__should_read_quota_of_cgroup_v2_or_v1(self, cgroup_files, files, expected_cpu_quota):
+        cgroup_files.update(files)
+        assert run_uvicorn.get_cgroup_cpu_quota() == expected_cpu_quota
+
+    # fmt: off
+    @pytest.mark.parametrize("cpus, cpu_quota, expected_cpu_count", [
+        (8, None, 8),
+        (8, 1.5, 2),  # quota rounded up
+        (8, 0.5, 1),
+        (2, 4.0, 2),  # capped by the CPU affinity
+    ])
+    # fmt: on
+    def get_available_cpu_count__should_cap_cpus_of_affinity_by_cgroup_quota(
+        self, cpus, cpu_quota, expected_cpu_count, mocker
+    ):
+        mocker.patch("os.sched_getaffinity", return_value=set(range(cpus)), create=True)
+        mocker.patch.object(run_uvicorn, "get_cgroup_cpu_quota", return_value=cpu_quota)
+        assert run_uvicorn.get_available_cpu_count() == expected_cpu_count
+
+    def get_worker_count__should_run_one_worker_per_available_cpu_given_auto(self, mocker):
+        mocker.patch.object(run_uvicorn, "get_available_cpu_count", return_value=3)
+        assert run_uvicorn.get_worker_count("auto") == 3
+        assert run_uvicorn.get_worker_count(5) == 5
+
+    def main__should_run_one_worker_per_available_cpu_given_workers_not_set(self, tmp_path, mocker):
+        config_path = tmp_path / "uvicorn_config.yaml"
+        config_path.write_text("port: 8080\n")
+        mocker.patch.dict("os.environ", {"UVICORN_CONFIG_PATH": str(config_path)})
+        mocker.patch.object(run_uvicorn, "get_available_cpu_count", return_value=1)
+        uvicorn_run = mocker.patch("uvicorn.run")
+
+        run_uvicorn.main()
+
+        assert uvicorn_run.call_args.kwargs["workers"] == 1
+
+    # fmt: off
+    @pytest.mark.parametrize("requested, installed, expected_implementation", [
+        ("uvloop", True, "uvloop"),
+        ("uvloop", False, "asyncio"),  # e.g. on PyPy
+        ("asyncio", False, "asyncio"),  # not the module's implementation, so taken as is
+    ])
+    # fmt: on
+    def select_implementation__should_fall_back_given_module_not_installed(
+        self, requested, installed, expected_implementation, mocker
+    ):
+        import_module = mocker.patch("importlib.import_module")
+        if not installed:
+            import_module.side_effect = ImportError("No module named 'uvloop'")
+        selected = run_uvicorn.select_implementation("loop", requested, "uvloop", "asyncio")
+        assert selected == expected_implementation
+
+    def bind_reuse_port_socket__should_let_several_sockets_bind_same_address(self):
+        first_sock = run_uvicorn.bind_reuse_port_socket("127.0.0.1", 0)
+        try:
+            port = first_sock.getsockname()[1]
+            second_sock = run_uvicorn.bind_reuse_port_socket("127.0.0.1", port)
+            second_sock.close()
+        finally:
+            first_sock.close()
+
+    @pytest.mark.parametrize("reuse_port", [False, True])
+    def run_prefork__should_replace_dead_worker_and_stop_workers_given_sigterm(self, tmp_path, reuse_port):
+        (tmp_path / "main.py").write_text(STUB_APP_MODULE)
+        (tmp_path / "pids").mkdir()
+        with socket.socket() as sock:  # a free port
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        config = {
+            "host": "127.0.0.1",
+            "port": port,
+            "proxy_headers": False,
+            "log_config": None,
+            "timeout_keep_alive": 5,
+            "loop": "asyncio",
+            "http": "h11",
+            "workers": 2,
+            "reuse_port": reuse_port,
+        }
+        master = subprocess.Popen(
+            [sys.executable, "-c", "import json, sys, run_uvicorn; run_uvicorn.run_prefork(json.loads(sys.argv[1]))"]
+            + [json.dumps(config)],
+            cwd=tmp_path,
+            env={**os.environ, "PYTHONPATH": str(Path(run_uvicorn.__file__).parent)},
+        )
+
+        def get_started_worker_pids() -> set[int]:
+            return {int(path.name) for path in (tmp_path / "pids").iterdir()}
+
+        try:
+            TestRunUvicorn.wait_until(lambda: len(get_started_worker_pids()) == 2)
+            worker_pids = get_started_worker_pids()
+            response = TestRunUvicorn.get_when_listening(f"http://127.0.0.1:{port}/")
+            assert int(response.text) in worker_pids
+
+            dead_worker_pid = worker_pids.pop()
+            os.kill(dead_worker_pid, signal.SIGKILL)
+            TestRunUvicorn.wait_until(lambda: len(get_started_worker_pids()) == 3)
+            worker_pids = get_started_worker_pids() - {dead_worker_pid}
+
+            master.send_signal(signal.SIGTERM)
+            assert master.wait(timeout=10) == 0
+            for worker_pid in worker_pids:  # reaped by the master
+                with pytest.raises(ProcessLookupError):
+                    os.kill(worker_pid, 0)
+        finally:
+            if master.poll() is None:  # the test failed; leave no processes behind
+                master.kill()
+                master.wait()
+                for worker_pid in get_started_worker_pids():
+                    with suppress(ProcessLookupError):
+                        os.kill(worker_pid, signal.SIGKILL)
+
+    @staticmethod
+    def wait_until(condition, timeout_seconds: float = 10):
+        deadline = time.monotonic() + timeout_seconds
+        while not condition():
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.05)
+
+    @staticmethod
+    def get_when_listening(url: str, timeout_seconds: float = 10) -> httpx.Response:
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            try:
+                return httpx.get(url)
+            except httpx.ConnectError:
+                assert time.monotonic() < deadline, "timed out"
+                time.sleep(0.05)
+
+
+if __name__ == "__main__":
+    pytest.main()